@@ -0,0 +1,49 @@
+import gc
+
+class AllocationChecker:
+    # Measures how much memory is allocated while the level is being updated, using gc.mem_alloc()
+    # The results are reported at the end of each attempt at a level (and at the end of a run of tools/run-headless.py --check-allocations)
+    # Only the results measured on the PicoSystem are exact, since CPython allocates memory in different places (see tools/host/picosystem.py)
+    #
+    # Level.update() only avoids allocating memory when FIXED_POINT is True. Otherwise, every float which is calculated is allocated on the heap
+    # in MicroPython, so most frames will allocate some memory.
+
+    def __init__(self):
+        # Bytes allocated during the current frame (the level may be updated more than once per frame)
+        self.frame_bytes = 0
+
+        # Bytes allocated during the most recent frame, and during the worst frame so far
+        self.last_frame_bytes = 0
+        self.worst_frame_bytes = 0
+
+        # Number of frames measured, and how many of them allocated memory
+        self.frames = 0
+        self.allocating_frames = 0
+
+        self.before = 0
+
+    def start(self):
+        self.before = gc.mem_alloc()
+
+    def stop(self):
+        allocated = gc.mem_alloc() - self.before
+
+        # If the garbage collector ran during the update, this will be negative, so we ignore it
+        if allocated > 0:
+            self.frame_bytes += allocated
+
+    def end_frame(self):
+        # Record the total for this frame, and get ready for the next frame
+        self.last_frame_bytes = self.frame_bytes
+
+        if self.frame_bytes > self.worst_frame_bytes:
+            self.worst_frame_bytes = self.frame_bytes
+
+        if self.frame_bytes > 0:
+            self.allocating_frames += 1
+
+        self.frames += 1
+        self.frame_bytes = 0
+
+    def report(self):
+        print("Allocations:", self.allocating_frames, "of", self.frames, "frames allocated memory (worst frame:", self.worst_frame_bytes, "bytes)")
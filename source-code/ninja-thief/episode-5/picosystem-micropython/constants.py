@@ -13,6 +13,14 @@ SPRITE_SIZE = 8
 SPRITESHEET_WIDTH = SPRITE_SIZE * 8
 SPRITESHEET_HEIGHT = SPRITE_SIZE * 6
 
+# Image files (only needed for PicoSystem)
+# Any format produced by tools/convert-assets.py can be used, since image_loader.py works out the format from the suffix
+# For example, the background is fully opaque, so converting it with --format rgb332 (and using "assets/background.rgb332") halves its size
+# The background is mostly flat colour, so storing it using the rle compression (--compress rle) makes it over 25 times smaller
+# (to try this, change BACKGROUND_FILE to "assets/background.16bpp.rle")
+SPRITESHEET_FILE = "assets/spritesheet.16bpp"
+BACKGROUND_FILE = "assets/background.16bpp"
+
 # Offset of game area from top left corner
 GAME_OFFSET_X = (SCREEN_WIDTH - GAME_WIDTH) // 2
 GAME_OFFSET_Y = (SCREEN_HEIGHT - GAME_HEIGHT) // 2
@@ -21,6 +29,106 @@ GAME_OFFSET_Y = (SCREEN_HEIGHT - GAME_HEIGHT) // 2
 GAME_WIDTH_TILES = GAME_WIDTH // SPRITE_SIZE
 GAME_HEIGHT_TILES = GAME_HEIGHT // SPRITE_SIZE
 
+# The options below change how the game is run, rather than how it plays
+# They are all turned off by default, so that the game works in the same way as described in the episode 5 tutorial
+
+# Fixed-point physics
+# If FIXED_POINT is True, the physics only uses integers, since every float is allocated on the heap in MicroPython:
+#  - ninja positions are whole pixels, plus a remainder measured in 1/FIXED_POINT_ONE of a pixel
+#  - speeds are measured in 1/FIXED_POINT_ONE pixels per second (and accelerations in 1/FIXED_POINT_ONE pixels per second squared)
+#  - times (including dt) are measured in whole milliseconds, rather than in seconds
+# Level.update() only runs without allocating any memory when this is True (with the default float physics, each frame allocates some floats)
+FIXED_POINT = False
+FIXED_POINT_SHIFT = 8
+FIXED_POINT_ONE = 1 << FIXED_POINT_SHIFT
+
+# All speeds and accelerations are multiplied by this
+SPEED_SCALE = FIXED_POINT_ONE if FIXED_POINT else 1
+
+# Number of time units (used for dt) in one second
+TIME_SCALE = 1000 if FIXED_POINT else 1
+
+# Simulation timing
+# If FIXED_TIMESTEP is True, the level is always updated in steps of exactly TIMESTEP, no matter how long each frame takes
+# This makes the physics behave the same at any frame rate, and the ninjas are drawn between their last two positions to keep movement smooth
+FIXED_TIMESTEP = False
+TIMESTEP = TIME_SCALE // 50 if FIXED_POINT else 1 / 50
+
+# The most updates which can be run in a single frame, so that one slow frame doesn't cause more and more updates to pile up
+MAX_STEPS_PER_FRAME = 4
+
+# If SWEPT_COLLISIONS is True, the tiles a ninja passes through during each update are checked in order, and the ninja stops at the first platform it hits
+# Otherwise, only the tiles around the ninja's new position are checked, so a ninja which moves far enough in one update can pass straight through a platform
+SWEPT_COLLISIONS = False
+
+# The largest dt allowed when FIXED_TIMESTEP is False
+# This can be bigger when using swept collisions, since ninjas can no longer pass through platforms when dt is large
+if SWEPT_COLLISIONS:
+    MAX_DT = TIME_SCALE // 10 if FIXED_POINT else 0.1
+else:
+    MAX_DT = TIME_SCALE // 20 if FIXED_POINT else 0.05
+
+# The interpolation value which means "draw the ninjas at their current positions"
+# When FIXED_POINT is True, interpolation is measured in 1/FIXED_POINT_ONE, rather than being a float from 0 to 1
+NO_INTERPOLATION = FIXED_POINT_ONE if FIXED_POINT else 1
+
+# If USE_SPATIAL_INDEX is True, enemies are sorted into a SpatialIndex each frame, and the player is only checked against the enemies near them
+# This is faster when there are lots of enemies
+USE_SPATIAL_INDEX = False
+
+# Random chances are compared against whole numbers below RANDOM_RANGE (from a RandomStream), so that no floats are needed
+RANDOM_BITS = 16
+RANDOM_RANGE = 1 << RANDOM_BITS
+
+# If CHECK_ALLOCATIONS is True, the amount of memory allocated by Level.update() is measured each frame by an AllocationChecker
+# The results are printed at the end of each attempt at a level. They are only exact on the PicoSystem, since they use MicroPython's gc.mem_alloc()
+# (tools/run-headless.py --check-allocations provides a rough stand-in for running on a computer)
+# Level.update() only avoids allocating memory when FIXED_POINT is True, since every float is allocated on the heap in MicroPython
+CHECK_ALLOCATIONS = False
+
+# Profiling
+# If PROFILING is True, the time spent in each part of Level.update() and Level.render() is recorded for the last PROFILER_SAMPLES frames
+PROFILING = False
+PROFILER_SAMPLES = 128
+
+# If PROFILER_OVERLAY is also True, the minimum, mean and 99th percentile times (in microseconds) are drawn on top of the game
+PROFILER_OVERLAY = True
+
+# Number of frames between each update of the overlay text (working out the statistics takes a while)
+PROFILER_OVERLAY_INTERVAL = 20
+
+# Rendering options
+# If PREBAKE_STATIC_TILES is True, the platforms are drawn into an off-screen buffer once when each level is created,
+# so that only a single blit is needed each frame (instead of drawing every platform tile individually)
+PREBAKE_STATIC_TILES = False
+# If PREBAKE_BACKGROUND is also True, the background image is drawn into the same buffer, underneath the platforms
+PREBAKE_BACKGROUND = True
+
+# If DIRTY_RECTANGLES is also True (and the background has been prebaked), the coins, gems and ladders are drawn into the same buffer too
+# Each frame, only the parts of the screen which were drawn over in the previous frame (ninjas and text) are copied back from the buffer,
+# instead of copying the whole buffer. This relies on the screen keeping its contents from one frame to the next
+DIRTY_RECTANGLES = False
+
+# If CACHE_HUD_TEXT is True, the level number and score are drawn into buffers when they change, which are then copied onto the screen each frame
+CACHE_HUD_TEXT = False
+# The score buffer is big enough for this many digits
+HUD_SCORE_DIGITS = 5
+
+# Input recording
+# With InputMode.RECORD, the buttons pressed each frame (along with dt and the random seed) are saved to INPUT_LOG_FILE
+# With InputMode.REPLAY, that file is played back instead of reading the buttons, so the same session can be run again
+# (for example, to compare the profiler's timings before and after a change)
+class InputMode:
+    LIVE = 0
+    RECORD = 1
+    REPLAY = 2
+
+INPUT_MODE = InputMode.LIVE
+INPUT_LOG_FILE = "input.log"
+
+# Number of runs of identical frames which are stored before they are written to the file
+INPUT_LOG_BUFFER_RUNS = 64
+
 # The number of pixels by which a ninja can intersect a one-way platform,
 # while still being moved back to the top of the platform during collision resolution
 ONE_WAY_PLATFORM_TOLERANCE = 2
@@ -50,6 +158,21 @@ class Sprites:
     # A blank tile is represented by 0xff in the level arrays
     BLANK_TILE = 0xff
     
+# Bit flags describing what a tile in the level contains, so that collision detection only needs to check one value per tile
+class TileFlags:
+    # A platform which can't be passed through
+    SOLID = 0x01
+    # A platform with a ladder in front of it, which can only be landed on from above
+    ONE_WAY = 0x02
+
+    LADDER = 0x04
+
+    # A coin or gem
+    COLLECTABLE = 0x08
+
+    # Either type of platform
+    PLATFORM = SOLID | ONE_WAY
+
 # Generic ninja data such as size
 class Ninja:
     # The visible width of the ninja sprite
@@ -60,29 +183,53 @@ class Ninja:
 
 # Player data such as speeds
 class Player:
-    # Speeds are measured in pixels per second
-    MAX_SPEED = 50
+    # Speeds are measured in pixels per second (multiplied by SPEED_SCALE)
+    MAX_SPEED = 50 * SPEED_SCALE
 
-    JUMP_SPEED = 125
-    DEATH_JUMP_SPEED = 100
-    CELEBRATION_JUMP_SPEED = 75
+    JUMP_SPEED = 125 * SPEED_SCALE
+    DEATH_JUMP_SPEED = 100 * SPEED_SCALE
+    CELEBRATION_JUMP_SPEED = 75 * SPEED_SCALE
     
     CELEBRATION_JUMP_COUNT = 3
 
-    CLIMBING_SPEED = 40
+    CLIMBING_SPEED = 40 * SPEED_SCALE
 
 # Enemy data
 class Enemy:
-    MAX_SPEED = 20
-    MIN_SPEED = 10
+    MAX_SPEED = 20 * SPEED_SCALE
+    MIN_SPEED = 10 * SPEED_SCALE
 
-    CLIMBING_SPEED = 20
+    CLIMBING_SPEED = 20 * SPEED_SCALE
 
     # Hitbox width for detecting the edge of a platform
     PLATFORM_DETECTION_WIDTH = 6
 
+    # If USE_POOL is True, enemies are stored in an EnemyPool (a set of arrays) instead of as separate EnemyNinja objects
+    # This is faster when there are lots of enemies
+    USE_POOL = False
+
+    # If USE_NAV_MAP is True, each level builds a NavMap, so that enemies can check for platforms and ladders with a single table lookup
+    # This isn't done for paged levels, which would need a table as big as the whole map
+    USE_NAV_MAP = False
+
     # Chance of climbing next ladder
     CLIMB_NEXT_LADDER_CHANCE = 0.2
+    # The same chance, as a whole number out of RANDOM_RANGE
+    CLIMB_NEXT_LADDER_THRESHOLD = int(CLIMB_NEXT_LADDER_CHANCE * RANDOM_RANGE)
+
+    # Levels in which the enemies chase the player instead of patrolling, for example {2} to make the third level harder
+    # The routes are found by a RouteFinder (see route_finder.py), which isn't used for paged levels
+    CHASE_LEVELS = set()
+
+    # Chasing enemies will walk off the edge of a platform if it's the quickest way to the player, but only if the drop is at most this many tiles
+    # Ninjas falling further than this are moving fast enough that they can pass through the platform they should land on
+    ROUTE_MAX_DROP = 4
+
+    # Number of flow fields (one for each tile the player has recently been in) which the RouteFinder keeps
+    ROUTE_CACHE_SIZE = 8
+
+    # How close (in pixels) a chasing enemy needs to be to the middle of a ladder before climbing it, or to the top of a tile before getting off a ladder
+    ROUTE_TOLERANCE = 1
 
 # Data for "Collectables" (gems and coins), such as value of each
 class Collectable:
@@ -97,11 +244,19 @@ class Collectable:
 
 # Environment data such as gravity strength
 class Environment:
-    GRAVITY_ACCELERATION = 375
+    GRAVITY_ACCELERATION = 375 * SPEED_SCALE
 
 # Level data
 class LevelData:
-    def __init__(self, platforms, extras, entity_spawns, pipes):
+    def __init__(self, platforms, extras, entity_spawns, pipes, width_tiles=GAME_WIDTH_TILES, height_tiles=GAME_HEIGHT_TILES):
+        # Size of the level, in tiles and in pixels
+        # Levels in the level pack are always the same size as the game area, but paged maps (see paged_level.py) can be bigger
+        self.width_tiles = width_tiles
+        self.height_tiles = height_tiles
+
+        self.width = width_tiles * SPRITE_SIZE
+        self.height = height_tiles * SPRITE_SIZE
+
         # Platform data
         self.platforms = platforms
 
@@ -114,247 +269,142 @@ class LevelData:
         # Background pipe data
         self.pipes = pipes
 
-    def copy(self):
-        return LevelData(self.platforms.copy(), self.extras.copy(), self.entity_spawns.copy(), self.pipes.copy())
+        # Keep a count of the coins, so that we don't need to search through the extras every frame
+        self.coins_remaining = self.count_coins()
+        self.starting_coins = self.coins_remaining
 
-# Number of levels
-LEVEL_COUNT = 3
+        # Positions and tile IDs of the coins and gems which have been collected, so that reset() can put them back
+        # Only the extras change during a level, so this is all that is needed to restart it
+        self.collected_positions = []
+        self.collected_tiles = []
 
-LEVELS = [
-    # Level 1
-    LevelData(
-        # Platform data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0x03, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x03, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x01, 0x01, 0x01, 0x02, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00, 0x01, 0x01, 0x01,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x01, 0x01, 0x01, 0x02, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00, 0x01, 0x01, 0x01,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
-        
-        # Coin, gem and ladder data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0x12, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x12, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x13, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0x13, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x13, 0xff,
-            0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff,
-            0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff,
-            0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff,
-            0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff,
-            0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0x13, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
+        # Combined tile flags, created by build_tile_flags() when a Level is created
+        self.tile_flags = None
 
-        # Entity spawn data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x20, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
+        # Lookup table for the enemy AI (only if Constants.Enemy.USE_NAV_MAP is True), also created when a Level is created
+        self.nav_map = None
 
-        # Background pipe data
-        [
-            0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0x1c, 0x16, 0x17, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0x0d, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x05, 0x16, 0x16, 0x16, 0x17, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x17, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0f, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x14, 0x05, 0x16, 0x16, 0x16, 0x16, 0x16,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x11, 0x05, 0x06, 0x16, 0x17, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x19, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x06, 0x07, 0xff, 0xff, 0xff, 0x19, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0x0c, 0xff, 0xff, 0xff, 0x19, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ]
-    ),
-
-    # Level 2
-    LevelData(
-        # Platform data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x01, 0x02, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00, 0x01,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x01, 0x01, 0x02, 0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff, 0x00, 0x01, 0x01
-        ],
-
-        # Coin, gem and ladder data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x13, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x12, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x12,
-            0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b,
-            0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b,
-            0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b,
-            0x0b, 0xff, 0xff, 0xff, 0x13, 0xff, 0xff, 0x0b, 0xff, 0xff, 0x13, 0xff, 0xff, 0xff, 0x0b,
-            0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0x13, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0x13, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
+    @staticmethod
+    def load(level_number, path=None):
+        # Read a single level from the level pack (see tools/pack-levels.py for the format)
+        # Each list of tiles is read into its own bytearray, so only the level being played is held in memory
+        if path is None:
+            path = LEVELS_FILE
 
-        # Entity spawn data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0x20, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
+        with open(path, "rb") as f:
+            if level_number >= LevelData.read_header(f, path):
+                raise IndexError("No such level")
 
-        # Background pipe data
-        [
-            0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0x14, 0x16, 0x1d, 0xff, 0xff, 0x0c, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0x0c, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0x14, 0x06, 0x16, 0x1d, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0x0f, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff,
-            0x16, 0x16, 0x16, 0x05, 0x17, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0f, 0xff,
-            0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x14, 0x16,
-            0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0x0d, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x04, 0x16, 0x16, 0x15, 0x10, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x0c, 0xff, 0xff, 0xff, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x0c, 0xff, 0xff, 0xff, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x11, 0x06, 0x07, 0xff,
-            0x1c, 0x16, 0x06, 0x07, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x19, 0xff, 0x1c, 0x16,
-            0x0c, 0xff, 0xff, 0x0c, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x19, 0xff, 0x0c, 0xff
-        ]
-    ),
-    
-    # Level 3
-    LevelData(
-        # Platform data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x02, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x00,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x00, 0x01, 0x01, 0x01, 0x02, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x01, 0x01, 0x02, 0xff, 0xff, 0xff, 0x00, 0x01, 0x02, 0xff, 0xff, 0xff, 0x00, 0x01, 0x01,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
-
-        # Coin, gem and ladder data
-        [
-            0xff, 0xff, 0xff, 0xff, 0x13, 0xff, 0xff, 0xff, 0xff, 0xff, 0x13, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0x13, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x12, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0x12,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0x0b, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0b, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0x13, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x13, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
+            size = GAME_WIDTH_TILES * GAME_HEIGHT_TILES
 
-        # Entity spawn data
-        [
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0x24, 0xff, 0xff, 0xff, 0xff, 0xff, 0x20, 0xff, 0xff, 0xff, 0xff, 0xff, 0x24, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff
-        ],
+            # Every level is the same size, so we can skip straight to the one we want
+            f.seek(LEVEL_PACK_HEADER_SIZE + level_number * size * 4)
 
-        # Background pipe data
-        [
-            0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0x0c, 0xff,
-            0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0x0f, 0xff, 0xff, 0xff, 0xff, 0x14, 0x06, 0x1d, 0xff,
-            0xff, 0x14, 0x07, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x14, 0x16,
-            0xff, 0xff, 0x1c, 0x16, 0x16, 0x16, 0x17, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x05, 0x16, 0x0e, 0x06, 0x10, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff,
-            0x0c, 0xff, 0x0c, 0xff, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x04, 0x16, 0x16,
-            0x14, 0x16, 0x1d, 0xff, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0f, 0xff, 0xff,
-            0xff, 0xff, 0x0c, 0xff, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0x04, 0x16, 0x15, 0x16, 0x16,
-            0xff, 0xff, 0x0c, 0xff, 0x18, 0xff, 0xff, 0xff, 0xff, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0x0c, 0xff, 0x18, 0xff, 0xff, 0xff, 0x11, 0x06, 0x1d, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0x0f, 0xff, 0x18, 0xff, 0xff, 0xff, 0x19, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff,
-            0x16, 0x16, 0x15, 0x07, 0x18, 0xff, 0xff, 0xff, 0x19, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff,
-            0xff, 0xff, 0xff, 0x0c, 0x18, 0xff, 0xff, 0xff, 0x19, 0xff, 0x0c, 0xff, 0xff, 0xff, 0xff
-        ]
-    )
-]
\ No newline at end of file
+            layers = [bytearray(size) for i in range(4)]
+
+            for layer in layers:
+                f.readinto(layer)
+
+        return LevelData(layers[0], layers[1], layers[2], layers[3])
+
+    @staticmethod
+    def level_count(path=None):
+        # Read the number of levels in the level pack
+        if path is None:
+            path = LEVELS_FILE
+
+        with open(path, "rb") as f:
+            return LevelData.read_header(f, path)
+
+    @staticmethod
+    def read_header(f, path):
+        # Check the level pack's header, and return the number of levels in it
+        header = f.read(LEVEL_PACK_HEADER_SIZE)
+
+        if header[0:2] != b"LV" or header[2] != LEVEL_PACK_VERSION:
+            raise ValueError("Not a level pack: " + path)
+
+        if header[4] != GAME_WIDTH_TILES or header[5] != GAME_HEIGHT_TILES:
+            raise ValueError("Levels in the level pack are the wrong size")
+
+        return header[3]
+
+    def reset(self):
+        # Put back every coin and gem which has been collected, so that the level can be played again without loading it again
+        for i in range(len(self.collected_positions)):
+            index = self.collected_positions[i]
+            tile_id = self.collected_tiles[i]
+
+            self.extras[index] = tile_id
+
+            if self.tile_flags is not None:
+                self.tile_flags[index] = LevelData.flags_for(self.platforms[index], tile_id)
+
+        self.collected_positions.clear()
+        self.collected_tiles.clear()
+
+        self.coins_remaining = self.starting_coins
+
+    def close(self):
+        # Nothing to do, since the whole level is loaded into memory (PagedLevelData closes its map file here)
+        pass
+
+    def count_coins(self):
+        total = 0
+
+        for tile_id in self.extras:
+            if tile_id == Sprites.COIN:
+                total += 1
+
+        return total
+
+    def build_tile_flags(self):
+        # Work out the TileFlags for every tile in the level, so that ninjas don't need to look at the platforms and extras separately
+        self.tile_flags = bytearray(len(self.platforms))
+
+        for i in range(len(self.platforms)):
+            self.tile_flags[i] = LevelData.flags_for(self.platforms[i], self.extras[i])
+
+    @staticmethod
+    def flags_for(platform, extra):
+        # Work out the TileFlags for a tile with the given platform and extra
+        flags = 0
+
+        if platform != Sprites.BLANK_TILE:
+            # Platforms with a ladder in front of them can be jumped through from below
+            flags |= TileFlags.ONE_WAY if extra == Sprites.LADDER else TileFlags.SOLID
+
+        if extra == Sprites.LADDER:
+            flags |= TileFlags.LADDER
+
+        elif extra == Sprites.COIN or extra == Sprites.GEM:
+            flags |= TileFlags.COLLECTABLE
+
+        return flags
+
+    def remove_extra(self, index):
+        # Remove a coin or gem from the level, keeping the coin count and tile flags up to date
+        if self.extras[index] == Sprites.COIN:
+            self.coins_remaining -= 1
+
+        self.collected_positions.append(index)
+        self.collected_tiles.append(self.extras[index])
+
+        self.extras[index] = Sprites.BLANK_TILE
+
+        if self.tile_flags is not None:
+            self.tile_flags[index] &= ~TileFlags.COLLECTABLE
+
+# The levels are stored in a binary file, created from assets/levels.py by tools/pack-levels.py
+# The number of levels is stored in its header (see LevelData.level_count())
+LEVELS_FILE = "assets/levels.bin"
+LEVEL_PACK_HEADER_SIZE = 6
+LEVEL_PACK_VERSION = 1
+
+# Levels which are loaded from paged maps (created by tools/pack-levels.py --map) instead of the level pack, for example {0: "assets/level1.map"}
+# Paged maps can be bigger than the game area, in which case the camera follows the player
+PAGED_LEVELS = {}
+
+# Number of chunks of a paged map which are kept in memory (when another chunk is needed, the least recently used one is replaced)
+# This needs to be enough for the chunks on screen, plus the chunks around every ninja
+MAP_CACHE_CHUNKS = 16
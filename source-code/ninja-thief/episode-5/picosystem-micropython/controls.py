@@ -0,0 +1,203 @@
+from picosystem import *
+
+from random import getrandbits, seed
+
+import constants as Constants
+
+class Controls:
+    # The state of the buttons for the current frame, read once at the start of each frame by poll()
+    # The player reads the buttons from here rather than calling button() and pressed() directly,
+    # so that the same code can be driven by recorded input instead of the real buttons
+
+    # Each button is stored as one bit of a bitmask, in this order
+    BUTTONS = (UP, DOWN, LEFT, RIGHT, A, B, X, Y)
+
+    # The bit used for each button
+    BITS = {b: 1 << i for i, b in enumerate(BUTTONS)}
+
+    def __init__(self):
+        # Buttons which are held down, and buttons which have just been pressed (since the last frame)
+        self.held = 0
+        self.just_pressed = 0
+
+    def poll(self, dt):
+        # Read the buttons for this frame, and return the dt (in milliseconds) which the game should use
+        self.held = 0
+        self.just_pressed = 0
+
+        for i in range(len(Controls.BUTTONS)):
+            if button(Controls.BUTTONS[i]):
+                self.held |= 1 << i
+
+            if pressed(Controls.BUTTONS[i]):
+                self.just_pressed |= 1 << i
+
+        return dt
+
+    def button(self, b):
+        # Return True if the button is held down (the same as picosystem's button())
+        return self.held & Controls.BITS[b] != 0
+
+    def pressed(self, b):
+        # Return True if the button has just been pressed (the same as picosystem's pressed())
+        return self.just_pressed & Controls.BITS[b] != 0
+
+    def flush(self):
+        # Nothing needs to be saved for live input
+        pass
+
+    def close(self):
+        # Nothing needs to be closed for live input
+        pass
+
+class InputLog:
+    # The format of the files written by InputRecorder and read by InputPlayer
+    #
+    # The file contains a 7 byte header:
+    #   "IL", format version, random seed (a 32-bit big-endian number)
+    # followed by a list of "runs" of frames which all had the same input and dt, 4 bytes each:
+    #   number of frames (1 to 255), held buttons, just pressed buttons, dt (in milliseconds, up to 255)
+    # The buttons are bitmasks, using the bits in Controls.BITS
+    #
+    # While a button is held, every frame is usually the same, so a ten minute session only takes a few kilobytes
+
+    MAGIC = b"IL"
+    VERSION = 1
+
+    HEADER_SIZE = 7
+    RUN_SIZE = 4
+
+    # The most frames which can be stored in one run, and the longest dt which can be stored
+    MAX_RUN = 255
+    MAX_DT = 255
+
+class InputRecorder(Controls):
+    # Reads the real buttons, and records them (along with each frame's dt) to a file as the game is played
+    # The random number generator is seeded with a new seed, which is stored in the file, so that the enemies make the same choices when the file is played back
+
+    def __init__(self, path):
+        super().__init__()
+
+        self.random_seed = getrandbits(32)
+        seed(self.random_seed)
+
+        self.file = open(path, "wb")
+
+        header = bytearray(InputLog.MAGIC)
+        header.append(InputLog.VERSION)
+        header.extend(self.random_seed.to_bytes(4, "big"))
+        self.file.write(header)
+
+        # Finished runs are collected here, and written to the file when it's full (or when flush() is called)
+        self.runs = bytearray(InputLog.RUN_SIZE * Constants.INPUT_LOG_BUFFER_RUNS)
+        self.run_count = 0
+
+        # The run which is currently being recorded
+        self.run_length = 0
+        self.run_dt = 0
+
+    def poll(self, dt):
+        # Long frames are shortened so that dt fits into a byte
+        # This doesn't change how the game plays, since dt is limited to much less than this anyway (by MAX_DT or MAX_STEPS_PER_FRAME)
+        if dt > InputLog.MAX_DT:
+            dt = InputLog.MAX_DT
+
+        held = self.held
+        just_pressed = self.just_pressed
+
+        super().poll(dt)
+
+        # Start a new run if anything has changed
+        if self.run_length == InputLog.MAX_RUN or dt != self.run_dt or self.held != held or self.just_pressed != just_pressed:
+            self.end_run(held, just_pressed)
+
+            self.run_dt = dt
+
+        self.run_length += 1
+
+        return dt
+
+    def end_run(self, held, just_pressed):
+        # Store the current run in the buffer (held and just_pressed are the buttons it was recorded with)
+        if self.run_length == 0:
+            return
+
+        if self.run_count * InputLog.RUN_SIZE == len(self.runs):
+            self.flush_buffer()
+
+        i = self.run_count * InputLog.RUN_SIZE
+
+        self.runs[i] = self.run_length
+        self.runs[i + 1] = held
+        self.runs[i + 2] = just_pressed
+        self.runs[i + 3] = self.run_dt
+
+        self.run_count += 1
+        self.run_length = 0
+
+    def flush_buffer(self):
+        self.file.write(memoryview(self.runs)[0:self.run_count * InputLog.RUN_SIZE])
+        self.run_count = 0
+
+    def flush(self):
+        # Make sure everything recorded so far is in the file (for example, in case the PicoSystem is turned off)
+        # This is called at the end of each attempt at a level, rather than every frame, since writing to the flash is slow
+        self.end_run(self.held, self.just_pressed)
+        self.flush_buffer()
+
+        self.file.flush()
+
+    def close(self):
+        # Save the rest of the recording, and close the file (called when the game ends)
+        self.flush()
+        self.file.close()
+
+class InputPlayer(Controls):
+    # Plays back input recorded by InputRecorder, instead of reading the real buttons
+    # Since the random seed and every frame's dt are also played back, the game runs exactly the same way as when it was recorded
+    # Once the recording runs out, the real buttons are used again
+
+    def __init__(self, path):
+        super().__init__()
+
+        with open(path, "rb") as f:
+            self.data = f.read()
+
+        if self.data[0:2] != InputLog.MAGIC or self.data[2] != InputLog.VERSION:
+            raise ValueError("Not an input log: " + path)
+
+        self.random_seed = int.from_bytes(self.data[3:InputLog.HEADER_SIZE], "big")
+        seed(self.random_seed)
+
+        # Position of the next run in the data, and the number of frames left in the current run
+        self.position = InputLog.HEADER_SIZE
+        self.run_remaining = 0
+        self.run_dt = 0
+
+        # Number of frames which have been played back, and whether the recording has run out
+        # (so that whatever is running the game can report how much of the recording was used)
+        self.frames = 0
+        self.finished = False
+
+    def poll(self, dt):
+        if self.finished:
+            return super().poll(dt)
+
+        if self.run_remaining == 0:
+            if self.position + InputLog.RUN_SIZE > len(self.data):
+                # The recording has run out
+                self.finished = True
+                return super().poll(dt)
+
+            self.run_remaining = self.data[self.position]
+            self.held = self.data[self.position + 1]
+            self.just_pressed = self.data[self.position + 2]
+            self.run_dt = self.data[self.position + 3]
+
+            self.position += InputLog.RUN_SIZE
+
+        self.run_remaining -= 1
+        self.frames += 1
+
+        # The measured dt is ignored, and the recorded dt is used instead
+        return self.run_dt
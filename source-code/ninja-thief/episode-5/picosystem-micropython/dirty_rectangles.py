@@ -0,0 +1,54 @@
+from picosystem import *
+
+from array import array
+
+import constants as Constants
+
+class DirtyRectangles:
+    # A list of the parts of the game area which have been drawn over this frame, so that only those parts need to be restored next frame
+    # Rectangles are measured from the top left of the game area, and are stored in a preallocated array so that no memory is allocated each frame
+
+    def __init__(self, capacity):
+        # Each rectangle is stored as x, y, width, height
+        self.rectangles = array("h", [0] * (capacity * 4))
+        self.capacity = capacity
+        self.count = 0
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, x, y, w, h):
+        # Only the part of the rectangle which is inside the game area is stored
+        if x < 0:
+            w += x
+            x = 0
+
+        if y < 0:
+            h += y
+            y = 0
+
+        if x + w > Constants.GAME_WIDTH:
+            w = Constants.GAME_WIDTH - x
+
+        if y + h > Constants.GAME_HEIGHT:
+            h = Constants.GAME_HEIGHT - y
+
+        if w <= 0 or h <= 0 or self.count == self.capacity:
+            return
+
+        i = self.count * 4
+
+        self.rectangles[i] = x
+        self.rectangles[i + 1] = y
+        self.rectangles[i + 2] = w
+        self.rectangles[i + 3] = h
+
+        self.count += 1
+
+    def restore(self, layer):
+        # Copy each rectangle from the layer (which covers the whole game area) onto the screen
+        for i in range(0, self.count * 4, 4):
+            x = self.rectangles[i]
+            y = self.rectangles[i + 1]
+
+            blit(layer, x, y, self.rectangles[i + 2], self.rectangles[i + 3], x + Constants.GAME_OFFSET_X, y + Constants.GAME_OFFSET_Y)
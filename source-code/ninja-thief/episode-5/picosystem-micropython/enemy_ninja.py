@@ -1,6 +1,6 @@
-from random import random, choice
-
 from ninja import Ninja
+from nav_map import NavMap
+from route_finder import RouteFinder
 import constants as Constants
 
 class EnemyNinja(Ninja):
@@ -8,18 +8,39 @@ class EnemyNinja(Ninja):
     class AIState:
         PATROLLING = 0
         CLIMBING = 1
+        CHASING = 2
+
+    # Only the extra attributes are listed, since the rest are already in Ninja.__slots__
+    __slots__ = ("current_direction", "climb_next_ladder", "ai_state", "speed")
+
+    # Options for RandomStream.choice() are stored as tuples here, rather than creating a new list each time we need to pick one
+    DIRECTIONS = (-1, 1)
+    CLIMBING_DIRECTIONS = (Ninja.ClimbingState.UP, Ninja.ClimbingState.DOWN)
 
-    def __init__(self, x, y):
+    def __init__(self, x, y, random):
         super().__init__(Ninja.Colour.RED, x, y)
 
-        self.current_direction = choice([-1, 1])
+        # The starting direction and speed are picked using the level's RandomStream
+        self.current_direction = random.choice(EnemyNinja.DIRECTIONS)
         self.climb_next_ladder = False
 
         self.ai_state = EnemyNinja.AIState.PATROLLING
 
-        self.speed = Constants.Enemy.MIN_SPEED + (Constants.Enemy.MAX_SPEED - Constants.Enemy.MIN_SPEED) * random()
+        if Constants.FIXED_POINT:
+            # Speeds must be whole numbers when using fixed-point physics
+            self.speed = random.integer(Constants.Enemy.MIN_SPEED, Constants.Enemy.MAX_SPEED)
+
+        else:
+            self.speed = random.uniform(Constants.Enemy.MIN_SPEED, Constants.Enemy.MAX_SPEED)
+
+    def update(self, dt, level_data, roll, route_finder=None, field=None):
+        # roll is a random number from 1 to 65535, which the level picks for every enemy at once (see Level.update_enemies())
+        # At most one random decision is made each update, so the same number can be used for whichever decision it is
+
+        # If the enemies in this level chase the player, field is the RouteFinder's flow field towards the player
+        if field is not None:
+            self.chase(route_finder, field)
 
-    def update(self, dt, level_data):
         if self.ai_state == EnemyNinja.AIState.PATROLLING:
             if not self.platform_ahead(level_data):
                 # No platform ahead, so turn around
@@ -30,12 +51,20 @@ class EnemyNinja(Ninja):
             if self.can_climb:
                 if self.climb_next_ladder:
                     # We're allowed to climb - check both directions for a ladder tile
-                    can_go_up = self.ladder_above_or_below(level_data, Ninja.VerticalDirection.UP)
-                    can_go_down = self.ladder_above_or_below(level_data, Ninja.VerticalDirection.DOWN)
+                    if level_data.nav_map is not None:
+                        # Both directions can be checked with a single lookup
+                        flags = level_data.nav_map.flags_at(self.position_x, self.position_y)
+
+                        can_go_up = flags & NavMap.Flags.LADDER_UP
+                        can_go_down = flags & NavMap.Flags.LADDER_DOWN
+
+                    else:
+                        can_go_up = self.ladder_above_or_below(level_data, Ninja.VerticalDirection.UP)
+                        can_go_down = self.ladder_above_or_below(level_data, Ninja.VerticalDirection.DOWN)
 
                     if can_go_up and can_go_down:
                         # If we can go either way, pick one at random
-                        self.climbing_state = choice([Ninja.ClimbingState.UP, Ninja.ClimbingState.DOWN])
+                        self.climbing_state = EnemyNinja.CLIMBING_DIRECTIONS[roll & 1]
                     
                     elif can_go_up:
                         # Only way is up
@@ -57,41 +86,87 @@ class EnemyNinja(Ninja):
                 # Keep "re-rolling" while we can't climb
 
                 # Decide if we should climb the next ladder we find
-                self.climb_next_ladder = self.random_bool(Constants.Enemy.CLIMB_NEXT_LADDER_CHANCE)
+                self.climb_next_ladder = roll < Constants.Enemy.CLIMB_NEXT_LADDER_THRESHOLD
 
 
         super().update(dt, level_data)
 
         # If we're no longer in a climbing state, switch back to patrolling
         # This will happen when the enemy reaches the bottom of a ladder, or if they fall off the ladder
-        if self.climbing_state == Ninja.ClimbingState.NONE:
+        if self.climbing_state == Ninja.ClimbingState.NONE and self.ai_state == EnemyNinja.AIState.CLIMBING:
             self.ai_state = EnemyNinja.AIState.PATROLLING
 
+    def chase(self, route_finder, field):
+        move = route_finder.chase_move(field, self.position_x, self.position_y, self.climbing_state != Ninja.ClimbingState.NONE)
+
+        if move == RouteFinder.Move.NONE:
+            # There's no route to the player (or we've already reached their tile), so patrol instead
+            if self.ai_state == EnemyNinja.AIState.CHASING:
+                self.ai_state = EnemyNinja.AIState.PATROLLING
+
+        elif move == RouteFinder.Move.CONTINUE:
+            # We're between tiles (for example, falling), so keep going the same way without turning around at the edge of a platform
+            if self.ai_state == EnemyNinja.AIState.CHASING:
+                self.velocity_x = self.speed * self.current_direction
+
+        else:
+            self.ai_state = EnemyNinja.AIState.CHASING
+
+            self.current_direction, self.velocity_x, self.climbing_state = EnemyNinja.chase_state(move, self.speed, self.current_direction)
+
+    @staticmethod
+    def chase_state(move, speed, current_direction):
+        # Return the new direction, horizontal velocity and climbing state for a chasing enemy making the given move
+        # This is a static method so that the EnemyPool can use it too
+        if move == RouteFinder.Move.LEFT:
+            return -1, -speed, Ninja.ClimbingState.NONE
+
+        if move == RouteFinder.Move.RIGHT:
+            return 1, speed, Ninja.ClimbingState.NONE
+
+        return current_direction, 0, Ninja.ClimbingState.UP if move == RouteFinder.Move.UP else Ninja.ClimbingState.DOWN
+
     def platform_ahead(self, level_data):
+        if level_data.nav_map is not None:
+            return level_data.nav_map.platform_ahead(self.position_x, self.position_y, self.current_direction)
+
+        return EnemyNinja.platform_ahead_of(level_data, self.position_x, self.position_y, self.current_direction)
+
+    def ladder_above_or_below(self, level_data, direction):
+        return EnemyNinja.ladder_above_or_below_of(level_data, self.position_x, self.position_y, direction)
+
+    # The checks below are static methods, so that the EnemyPool can use them for enemies which aren't stored as EnemyNinja objects
+
+    @staticmethod
+    def platform_ahead_of(level_data, position_x, position_y, current_direction):
         # Get a position which would be just in front of the ninja (and one tile below them)
-        point_x = self.position_x + Constants.SPRITE_SIZE / 2 + self.current_direction * Constants.Enemy.PLATFORM_DETECTION_WIDTH / 2
-        point_y = self.position_y + Constants.SPRITE_SIZE
+        # Integer division is used so that no floats are created when using fixed-point physics
+        point_x = position_x + Constants.SPRITE_SIZE // 2 + current_direction * (Constants.Enemy.PLATFORM_DETECTION_WIDTH // 2)
+        point_y = position_y + Constants.SPRITE_SIZE
 
         # Get tile at that position
-        tile_id = self.tile_at_position(level_data.platforms, point_x, point_y)
+        tile_id = EnemyNinja.tile_at_position(level_data, level_data.platforms, point_x, point_y)
 
         # Return true if the tile is a platform (i.e. isn't an empty tile)
         return tile_id != Constants.Sprites.BLANK_TILE
 
-    def ladder_above_or_below(self, level_data, direction):
+    @staticmethod
+    def ladder_above_or_below_of(level_data, position_x, position_y, direction):
         # Get a position which would be one tile above/below the ninja
-        point_x = self.position_x
-        point_y = self.position_y + Constants.SPRITE_SIZE * direction
+        point_x = position_x
+        point_y = position_y + Constants.SPRITE_SIZE * direction
 
         # Get tile at that position
-        tile_id = self.tile_at_position(level_data.extras, point_x, point_y)
+        tile_id = EnemyNinja.tile_at_position(level_data, level_data.extras, point_x, point_y)
 
         # Return true if the tile is a ladder
         return tile_id == Constants.Sprites.LADDER
 
-    def tile_at_position(self, tile_array, x, y):
-        # Check that the position is within the game bounds (if it isn't, return an empty tile)
-        if x < 0 or x > Constants.GAME_WIDTH or y < 0 or y > Constants.GAME_HEIGHT:
+    @staticmethod
+    def tile_at_position(level_data, tile_array, x, y):
+        # Check that the position is within the level (if it isn't, return an empty tile)
+        # A position exactly on the right or bottom edge is just outside the level
+        if x < 0 or x >= level_data.width or y < 0 or y >= level_data.height:
             return Constants.Sprites.BLANK_TILE
 
         # Get grid position of tile
@@ -99,7 +174,4 @@ class EnemyNinja(Ninja):
         grid_y = int(y // Constants.SPRITE_SIZE)
 
         # If we've not returned yet, then it's safe to get the tile from the level data
-        return tile_array[grid_y * Constants.GAME_WIDTH_TILES + grid_x]
-
-    def random_bool(self, probability):
-        return random() < probability
\ No newline at end of file
+        return tile_array[grid_y * level_data.width_tiles + grid_x]
\ No newline at end of file
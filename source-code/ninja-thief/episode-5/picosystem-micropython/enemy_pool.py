@@ -0,0 +1,262 @@
+from array import array
+
+from ninja import Ninja
+from enemy_ninja import EnemyNinja
+from nav_map import NavMap
+from route_finder import RouteFinder
+import constants as Constants
+
+class EnemyPool:
+    # Instead of one EnemyNinja object per enemy, the pool stores each property of every enemy in its own array (a "structure of arrays")
+    # Most of the update is then done for all of the enemies in one loop, without a method call and attribute lookups for every enemy
+    # Collision handling is the exception: each enemy is still copied into a Ninja object and back again, and its methods are called (see self.ninja below)
+    # The enemies behave in exactly the same way as EnemyNinja objects
+
+    def __init__(self, spawn_positions, random):
+        self.count = len(spawn_positions)
+
+        # Positions, velocities and speeds are floats, unless we're using fixed-point physics
+        # The floats are stored as doubles ("d"), which is the same precision as a Python float on a computer, so the pool moves the enemies
+        # in exactly the same way as EnemyNinja does. On the PicoSystem, floats are only single precision, so this uses more memory than it needs to
+        number_type = "i" if Constants.FIXED_POINT else "d"
+
+        self.position_x = array(number_type, [position[0] for position in spawn_positions])
+        self.position_y = array(number_type, [position[1] for position in spawn_positions])
+
+        self.remainder_x = array("i", [0] * self.count)
+        self.remainder_y = array("i", [0] * self.count)
+
+        self.previous_x = array(number_type, self.position_x)
+        self.previous_y = array(number_type, self.position_y)
+
+        self.velocity_x = array(number_type, [0] * self.count)
+        self.velocity_y = array(number_type, [0] * self.count)
+
+        self.speed = array(number_type, [0] * self.count)
+
+        self.current_direction = array("b", [0] * self.count)
+        self.facing_direction = array("b", [Ninja.HorizontalDirection.RIGHT] * self.count)
+
+        self.climbing_state = array("b", [Ninja.ClimbingState.NONE] * self.count)
+        self.ai_state = array("b", [EnemyNinja.AIState.PATROLLING] * self.count)
+
+        self.can_climb = array("b", [False] * self.count)
+        self.climb_next_ladder = array("b", [False] * self.count)
+
+        # Pick a random direction and speed for each enemy, in the same order as EnemyNinja does
+        for i in range(self.count):
+            self.current_direction[i] = random.choice(EnemyNinja.DIRECTIONS)
+
+            if Constants.FIXED_POINT:
+                # Speeds must be whole numbers when using fixed-point physics
+                self.speed[i] = random.integer(Constants.Enemy.MIN_SPEED, Constants.Enemy.MAX_SPEED)
+
+            else:
+                self.speed[i] = random.uniform(Constants.Enemy.MIN_SPEED, Constants.Enemy.MAX_SPEED)
+
+        # Collision handling and rendering are complicated, so rather than copying that code here,
+        # we load each enemy into this single Ninja object in turn and use its methods
+        self.ninja = Ninja(Ninja.Colour.RED, 0, 0)
+
+    def update(self, dt, level_data, rolls, route_finder=None, field=None):
+        # rolls contains a random number for each enemy, and field is the flow field used by chasing enemies (see EnemyNinja.update())
+        if field is not None:
+            self.chase(route_finder, field)
+
+        self.update_ai(level_data, rolls)
+
+        # Remember where each enemy was before this update
+        for i in range(self.count):
+            self.previous_x[i] = self.position_x[i]
+            self.previous_y[i] = self.position_y[i]
+
+        self.apply_gravity(dt)
+
+        self.move(dt)
+
+        self.clamp_to_borders(level_data)
+
+        # Detect and resolve any collisions with platforms and ladders
+        # Enemies never die, so unlike Ninja.update() we don't need to check that first
+        for i in range(self.count):
+            self.load_ninja(i)
+
+            if Constants.SWEPT_COLLISIONS:
+                self.ninja.sweep_collisions(level_data)
+
+            self.ninja.handle_collisions(level_data)
+
+            self.store_ninja(i)
+
+        for i in range(self.count):
+            # Update direction the enemy is facing (only if the enemy is moving)
+            if self.velocity_x[i] < 0:
+                self.facing_direction[i] = Ninja.HorizontalDirection.LEFT
+
+            elif self.velocity_x[i] > 0:
+                self.facing_direction[i] = Ninja.HorizontalDirection.RIGHT
+
+            # If we're no longer in a climbing state, switch back to patrolling
+            if self.climbing_state[i] == Ninja.ClimbingState.NONE and self.ai_state[i] == EnemyNinja.AIState.CLIMBING:
+                self.ai_state[i] = EnemyNinja.AIState.PATROLLING
+
+    def chase(self, route_finder, field):
+        # This is the same as EnemyNinja.chase()
+        for i in range(self.count):
+            move = route_finder.chase_move(field, self.position_x[i], self.position_y[i], self.climbing_state[i] != Ninja.ClimbingState.NONE)
+
+            if move == RouteFinder.Move.NONE:
+                # There's no route to the player (or we've already reached their tile), so patrol instead
+                if self.ai_state[i] == EnemyNinja.AIState.CHASING:
+                    self.ai_state[i] = EnemyNinja.AIState.PATROLLING
+
+            elif move == RouteFinder.Move.CONTINUE:
+                # We're between tiles, so keep going the same way
+                if self.ai_state[i] == EnemyNinja.AIState.CHASING:
+                    self.velocity_x[i] = self.speed[i] * self.current_direction[i]
+
+            else:
+                self.ai_state[i] = EnemyNinja.AIState.CHASING
+
+                self.current_direction[i], self.velocity_x[i], self.climbing_state[i] = EnemyNinja.chase_state(move, self.speed[i], self.current_direction[i])
+
+    def update_ai(self, level_data, rolls):
+        # This is the same as the first part of EnemyNinja.update()
+        nav_map = level_data.nav_map
+
+        for i in range(self.count):
+            if self.ai_state[i] == EnemyNinja.AIState.PATROLLING:
+                if nav_map is not None:
+                    platform_ahead = nav_map.platform_ahead(self.position_x[i], self.position_y[i], self.current_direction[i])
+
+                else:
+                    platform_ahead = EnemyNinja.platform_ahead_of(level_data, self.position_x[i], self.position_y[i], self.current_direction[i])
+
+                if not platform_ahead:
+                    # No platform ahead, so turn around
+                    self.current_direction[i] = -self.current_direction[i]
+
+                self.velocity_x[i] = self.speed[i] * self.current_direction[i]
+
+                if self.can_climb[i]:
+                    if self.climb_next_ladder[i]:
+                        # We're allowed to climb - check both directions for a ladder tile
+                        if nav_map is not None:
+                            flags = nav_map.flags_at(self.position_x[i], self.position_y[i])
+
+                            can_go_up = flags & NavMap.Flags.LADDER_UP
+                            can_go_down = flags & NavMap.Flags.LADDER_DOWN
+
+                        else:
+                            can_go_up = EnemyNinja.ladder_above_or_below_of(level_data, self.position_x[i], self.position_y[i], Ninja.VerticalDirection.UP)
+                            can_go_down = EnemyNinja.ladder_above_or_below_of(level_data, self.position_x[i], self.position_y[i], Ninja.VerticalDirection.DOWN)
+
+                        if can_go_up and can_go_down:
+                            # If we can go either way, pick one at random
+                            self.climbing_state[i] = EnemyNinja.CLIMBING_DIRECTIONS[rolls[i] & 1]
+
+                        elif can_go_up:
+                            # Only way is up
+                            self.climbing_state[i] = Ninja.ClimbingState.UP
+
+                        elif can_go_down:
+                            # Only way is down
+                            self.climbing_state[i] = Ninja.ClimbingState.DOWN
+
+                        if self.climbing_state[i] != Ninja.ClimbingState.NONE:
+                            # We've now decided to climb
+                            self.ai_state[i] = EnemyNinja.AIState.CLIMBING
+
+                            self.climb_next_ladder[i] = False
+
+                else:
+                    # Keep "re-rolling" while we can't climb
+                    self.climb_next_ladder[i] = rolls[i] < Constants.Enemy.CLIMB_NEXT_LADDER_THRESHOLD
+
+    def apply_gravity(self, dt):
+        # Apply gravity, only to enemies which aren't climbing a ladder
+        if Constants.FIXED_POINT:
+            change = Constants.Environment.GRAVITY_ACCELERATION * dt // Constants.TIME_SCALE
+        else:
+            change = Constants.Environment.GRAVITY_ACCELERATION * dt
+
+        for i in range(self.count):
+            if self.climbing_state[i] == Ninja.ClimbingState.NONE:
+                self.velocity_y[i] += change
+
+    def move(self, dt):
+        if Constants.FIXED_POINT:
+            # The same as Ninja.update_position_fixed_point()
+            for i in range(self.count):
+                distance = self.velocity_x[i] * dt
+                self.remainder_x[i] += distance // Constants.TIME_SCALE if distance >= 0 else -(-distance // Constants.TIME_SCALE)
+
+                distance = self.velocity_y[i] * dt
+                self.remainder_y[i] += distance // Constants.TIME_SCALE if distance >= 0 else -(-distance // Constants.TIME_SCALE)
+
+                self.position_x[i] += self.remainder_x[i] >> Constants.FIXED_POINT_SHIFT
+                self.position_y[i] += self.remainder_y[i] >> Constants.FIXED_POINT_SHIFT
+
+                self.remainder_x[i] &= Constants.FIXED_POINT_ONE - 1
+                self.remainder_y[i] &= Constants.FIXED_POINT_ONE - 1
+
+        else:
+            for i in range(self.count):
+                self.position_x[i] += self.velocity_x[i] * dt
+                self.position_y[i] += self.velocity_y[i] * dt
+
+    def clamp_to_borders(self, level_data):
+        # Don't allow enemies to go off the sides
+        min_x = -Constants.Ninja.BORDER
+        max_x = level_data.width - Constants.Ninja.BORDER - Constants.Ninja.WIDTH
+
+        for i in range(self.count):
+            if self.position_x[i] < min_x:
+                self.position_x[i] = min_x
+                self.remainder_x[i] = 0
+
+            elif self.position_x[i] > max_x:
+                self.position_x[i] = max_x
+                self.remainder_x[i] = 0
+
+    def load_ninja(self, i):
+        # Copy the state of enemy i into the shared Ninja object
+        ninja = self.ninja
+
+        ninja.position_x = self.position_x[i]
+        ninja.position_y = self.position_y[i]
+        ninja.remainder_x = self.remainder_x[i]
+        ninja.remainder_y = self.remainder_y[i]
+        ninja.previous_x = self.previous_x[i]
+        ninja.previous_y = self.previous_y[i]
+        ninja.velocity_x = self.velocity_x[i]
+        ninja.velocity_y = self.velocity_y[i]
+        ninja.facing_direction = self.facing_direction[i]
+        ninja.climbing_state = self.climbing_state[i]
+
+    def store_ninja(self, i):
+        # Copy the state of the shared Ninja object back into enemy i
+        ninja = self.ninja
+
+        self.position_x[i] = ninja.position_x
+        self.position_y[i] = ninja.position_y
+        self.remainder_x[i] = ninja.remainder_x
+        self.remainder_y[i] = ninja.remainder_y
+        self.velocity_x[i] = ninja.velocity_x
+        self.velocity_y[i] = ninja.velocity_y
+        self.climbing_state[i] = ninja.climbing_state
+        self.can_climb[i] = ninja.can_climb
+
+    def render(self, interpolation=Constants.NO_INTERPOLATION, camera_x=0, camera_y=0):
+        for i in range(self.count):
+            self.load_ninja(i)
+
+            self.ninja.render(interpolation, camera_x, camera_y)
+
+    def check_colliding(self, ninja):
+        # Return true if the ninja (i.e. the player) is touching any of the enemies
+        for i in range(self.count):
+            if ninja.check_ninja_position_colliding(self.position_x[i], self.position_y[i]):
+                return True
+
+        return False
@@ -0,0 +1,70 @@
+from picosystem import *
+
+import constants as Constants
+
+class CachedText:
+    # A piece of text which is drawn into its own buffer, so that it only needs to be drawn again when it changes
+    # The rest of the buffer is transparent, so copying it onto the screen looks exactly the same as drawing the text there
+
+    def __init__(self, max_width, height):
+        self.buffer = Buffer(max_width, height)
+
+        # Size of the text currently in the buffer
+        self.width = 0
+        self.height = height
+
+    def set(self, message):
+        # Draw new text into the buffer
+        target(self.buffer)
+
+        # Clear the buffer to fully transparent pixels
+        blend(COPY)
+        pen(0, 0, 0, 0)
+        clear()
+        blend(MASK)
+
+        # Set the text colour to white
+        pen(15, 15, 15)
+        text(message, 0, 0)
+
+        target()
+
+        w, h = measure(message)
+        self.width = min(w, self.buffer.w)
+
+    def render(self, x, y):
+        blit(self.buffer, 0, 0, self.width, self.height, x, y)
+
+class Hud:
+    # Draws the level number and score in the top corners of the screen
+    # These only change a few times per level, so the text is only built and drawn again when the score changes
+
+    # Distance between the text and the edges of the screen
+    MARGIN = 2
+
+    def __init__(self, level_number):
+        # Make the buffers big enough for the longest text we expect
+        score_width, height = measure("Score: " + "0" * Constants.HUD_SCORE_DIGITS)
+        level_width, height = measure("Level: 000")
+
+        self.level_text = CachedText(level_width, height)
+        self.score_text = CachedText(score_width, height)
+
+        self.level_text.set("Level: " + str(level_number + 1))
+
+        # The score which is currently drawn in the buffer (-1 means nothing has been drawn yet)
+        self.score = -1
+
+    def render(self, score):
+        if score != self.score:
+            self.score = score
+            self.score_text.set("Score: " + str(score))
+
+        # Render level number in top left corner
+        self.level_text.render(Hud.MARGIN, Hud.MARGIN)
+
+        # Render score in top right corner
+        self.score_text.render(self.score_x(), Hud.MARGIN)
+
+    def score_x(self):
+        return Constants.SCREEN_WIDTH - Hud.MARGIN - self.score_text.width
@@ -0,0 +1,206 @@
+from picosystem import *
+
+class ImageFormat:
+    # The formats which tools/convert-assets.py can produce (see FORMATS in that file for the layout of each one)
+    # We're using classes as enums
+    ARGB4444 = 0
+    RGB332 = 1
+    INDEXED4 = 2
+    INDEXED8 = 3
+
+    # Compressed ARGB4444 images
+    RLE = 4
+    TILES = 5
+
+# The file suffix used for each format by convert-assets.py
+SUFFIXES = {
+    ".16bpp": ImageFormat.ARGB4444,
+    ".rgb332": ImageFormat.RGB332,
+    ".i4": ImageFormat.INDEXED4,
+    ".i8": ImageFormat.INDEXED8,
+    ".rle": ImageFormat.RLE,
+    ".tiles": ImageFormat.TILES
+}
+
+# Size of each tile in an image using the tiles compression
+TILE_SIZE = 8
+
+# Number of colours in the palette at the start of an indexed image
+PALETTE_SIZES = {
+    ImageFormat.INDEXED4: 16,
+    ImageFormat.INDEXED8: 256
+}
+
+def load_image(path, width, height, image_format=None):
+    # Load an image into a new Buffer, expanding it to the PicoSystem's ARGB4444 format if needed
+    # If no format is given, it is worked out from the file's suffix
+    if image_format is None:
+        image_format = format_of(path)
+
+    if image_format == ImageFormat.ARGB4444:
+        # Buffer() can load this format directly
+        return Buffer(width, height, path)
+
+    buffer = Buffer(width, height)
+    load_image_into(buffer, path, width, height, image_format)
+
+    return buffer
+
+def load_image_into(buffer, path, width, height, image_format=None):
+    # Expand an image into an existing Buffer (which must be width x height pixels)
+    # The Buffer's pixels are written directly using a memoryview, two bytes per pixel: AAAARRRR then GGGGBBBB
+    # This means a level change can reload an image without allocating a new Buffer
+    if image_format is None:
+        image_format = format_of(path)
+
+    pixels = memoryview(buffer)
+
+    if image_format == ImageFormat.RLE or image_format == ImageFormat.TILES:
+        # Compressed files are small, so the whole file is read at once
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if (data[2] << 8 | data[3]) != width or (data[4] << 8 | data[5]) != height:
+            raise ValueError("Image is the wrong size: " + path)
+
+        if image_format == ImageFormat.RLE:
+            expand_rle(pixels, memoryview(data))
+        else:
+            expand_tiles(pixels, memoryview(data), width, height)
+
+        return
+
+    if image_format == ImageFormat.ARGB4444:
+        # The file is already in the right format, so it can be read straight into the Buffer
+        with open(path, "rb") as f:
+            f.readinto(pixels)
+
+        return
+
+    # Only one row of the file is held in memory at a time
+    # Each pixel is expanded separately in Python, which is far slower than reading an ARGB4444 file straight into the Buffer
+    # (a full screen image is 14400 pixels), so these formats are best loaded once, when the game starts, rather than during play
+    with open(path, "rb") as f:
+        # Each of these formats is converted using a table with the two ARGB4444 bytes for each possible pixel value
+        if image_format == ImageFormat.RGB332:
+            colors = rgb332_table()
+
+        elif image_format in PALETTE_SIZES:
+            colors = f.read(PALETTE_SIZES[image_format] * 2)
+
+        else:
+            raise ValueError("Unknown image format")
+
+        if image_format == ImageFormat.INDEXED4:
+            # Two pixels per byte, with each row padded to a whole number of bytes
+            row = bytearray((width + 1) // 2)
+
+            for y in range(height):
+                f.readinto(row)
+
+                out = y * width * 2
+
+                for x in range(width):
+                    if x & 1:
+                        index = (row[x >> 1] & 0x0f) << 1
+                    else:
+                        index = (row[x >> 1] >> 4) << 1
+
+                    pixels[out] = colors[index]
+                    pixels[out + 1] = colors[index + 1]
+
+                    out += 2
+
+        else:
+            row = bytearray(width)
+
+            for y in range(height):
+                f.readinto(row)
+
+                out = y * width * 2
+
+                for value in row:
+                    pixels[out] = colors[value << 1]
+                    pixels[out + 1] = colors[(value << 1) + 1]
+
+                    out += 2
+
+def expand_rle(pixels, data):
+    # See COMPRESSIONS in convert-assets.py for the layout of the data
+    position = 6
+    out = 0
+
+    while out < len(pixels):
+        chunk = data[position]
+        count = ((chunk & 0x7f) + 1) * 2
+
+        if chunk & 0x80:
+            # Write the pixel once, then keep doubling the part which has been filled, by copying it
+            pixels[out] = data[position + 1]
+            pixels[out + 1] = data[position + 2]
+
+            filled = 2
+            while filled < count:
+                length = min(filled, count - filled)
+                pixels[out + filled:out + filled + length] = pixels[out:out + length]
+                filled += length
+
+            position += 3
+
+        else:
+            # Copy the pixels straight across
+            pixels[out:out + count] = data[position + 1:position + 1 + count]
+            position += 1 + count
+
+        out += count
+
+def expand_tiles(pixels, data, width, height):
+    # See COMPRESSIONS in convert-assets.py for the layout of the data
+    tile_count = data[6] << 8 | data[7]
+
+    tile_bytes = TILE_SIZE * TILE_SIZE * 2
+    stride = width * 2
+
+    map_position = 8 + tile_count * tile_bytes
+
+    # Tiles on the right and bottom edges may be padded, in which case only the part inside the image is copied
+    for tile_y in range((height + TILE_SIZE - 1) // TILE_SIZE):
+        rows = min(TILE_SIZE, height - tile_y * TILE_SIZE)
+
+        for tile_x in range((width + TILE_SIZE - 1) // TILE_SIZE):
+            tile = data[map_position] << 8 | data[map_position + 1]
+            map_position += 2
+
+            row_bytes = min(TILE_SIZE, width - tile_x * TILE_SIZE) * 2
+
+            # Copy the tile one row at a time
+            source = 8 + tile * tile_bytes
+            out = (tile_y * TILE_SIZE * width + tile_x * TILE_SIZE) * 2
+
+            for row in range(rows):
+                pixels[out:out + row_bytes] = data[source:source + row_bytes]
+
+                source += TILE_SIZE * 2
+                out += stride
+
+def format_of(path):
+    for suffix in SUFFIXES:
+        if path.endswith(suffix):
+            return SUFFIXES[suffix]
+
+    raise ValueError("Unknown image suffix: " + path)
+
+def rgb332_table():
+    # Work out the ARGB4444 bytes for each of the 256 RGB332 colours
+    # Each channel is scaled up to 4 bits by repeating its top bits, so that the brightest value stays fully bright
+    table = bytearray(512)
+
+    for value in range(256):
+        r = value >> 5
+        g = (value >> 2) & 0x07
+        b = value & 0x03
+
+        table[value << 1] = 0xf0 | (r << 1) | (r >> 2)
+        table[(value << 1) + 1] = ((g << 1) | (g >> 2)) << 4 | (b << 2) | b
+
+    return table
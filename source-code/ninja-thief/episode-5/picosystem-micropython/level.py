@@ -1,7 +1,19 @@
 from picosystem import *
 
+from array import array
+from random import getrandbits
+
 from player_ninja import PlayerNinja
 from enemy_ninja import EnemyNinja
+from enemy_pool import EnemyPool
+from spatial_index import SpatialIndex
+from profiler import Profiler
+from paged_level import PagedLevelData
+from dirty_rectangles import DirtyRectangles
+from hud import Hud
+from random_stream import RandomStream
+from nav_map import NavMap
+from route_finder import RouteFinder
 import constants as Constants
 
 class Level:
@@ -12,65 +24,184 @@ class Level:
         FAILED = 3
         COMPLETE = 4
 
-    def __init__(self, level_number):
+    # The spawn positions for each level number, filled in by find_spawns()
+    spawn_tables = {}
+
+    def __init__(self, level_number, background, controls):
         self.level_number = level_number
-        self.level_data = Constants.LEVELS[level_number].copy()
+
+        # Passed on to the player, which reads the buttons from it
+        self.controls = controls
+
+        if level_number in Constants.PAGED_LEVELS:
+            # Large levels are read from their own file a chunk at a time, while the level is being played
+            self.level_data = PagedLevelData(Constants.PAGED_LEVELS[level_number])
+
+        else:
+            # Only this level is loaded from the level pack
+            self.level_data = Constants.LevelData.load(level_number)
+
+        # Combine the platforms and extras into a single grid of flags, which is used by the ninjas' collision detection
+        self.level_data.build_tile_flags()
+
+        if Constants.Enemy.USE_NAV_MAP and level_number not in Constants.PAGED_LEVELS:
+            # Work out where the enemies can walk and climb, so they don't need to look at the tiles every frame
+            self.level_data.nav_map = NavMap(self.level_data)
+
+        # Only used if the enemies in this level chase the player
+        self.route_finder = None
+
+        if level_number in Constants.Enemy.CHASE_LEVELS and level_number not in Constants.PAGED_LEVELS:
+            self.route_finder = RouteFinder(self.level_data)
+
+        self.level_state = Level.LevelState.PLAYING
+
+        # All of the enemies' random decisions come from this stream
+        # Its seed is taken from the random module, which is seeded with a known value when input is being recorded or played back
+        self.random = RandomStream(getrandbits(16))
+
+        self.create_ninjas()
+
+        enemy_count = self.enemy_pool.count if self.enemy_pool is not None else len(self.enemies)
+
+        # A random number for each enemy, which are all picked at once before the enemies are updated
+        self.enemy_rolls = array("H", [0] * enemy_count)
+
+        # Only used if Constants.USE_SPATIAL_INDEX is True
+        self.spatial_index = None
+
+        if Constants.USE_SPATIAL_INDEX:
+            self.spatial_index = SpatialIndex(enemy_count)
+
+            # Somewhere to store the results of each query, so that a new list isn't needed every frame
+            self.nearby_enemies = array("h", [0] * enemy_count)
+
+        # Only used if Constants.CACHE_HUD_TEXT is True
+        self.hud = Hud(level_number) if Constants.CACHE_HUD_TEXT else None
+
+        # Position of the top left corner of the game area within the level
+        # This is always (0, 0) unless the level is bigger than the game area
+        self.camera_x = 0
+        self.camera_y = 0
+
+        self.scrolling = self.level_data.width > Constants.GAME_WIDTH or self.level_data.height > Constants.GAME_HEIGHT
+
+        # The platforms never change during a level, so we can draw them once now rather than every frame
+        # This isn't possible if the level scrolls, since the layer would need to be as big as the whole level
+        self.static_layer = None
+        self.static_background = False
+
+        # Only used if Constants.DIRTY_RECTANGLES is True (see render_level_dirty())
+        self.dirty = None
+
+        if Constants.PREBAKE_STATIC_TILES and not self.scrolling:
+            # The background can only replace the full-screen blit in draw() if the game area covers the whole screen
+            self.static_background = (Constants.PREBAKE_BACKGROUND and background is not None and
+                                      Constants.GAME_WIDTH == Constants.SCREEN_WIDTH and Constants.GAME_HEIGHT == Constants.SCREEN_HEIGHT)
+
+            if Constants.DIRTY_RECTANGLES and self.static_background:
+                # One rectangle for each ninja, plus the two pieces of text, plus one for anything else drawn over the game (see add_dirty_rectangle())
+                self.dirty = DirtyRectangles(enemy_count + 4)
+
+                # The background is needed to redraw tiles whose coin or gem has been collected
+                self.background = background
+
+                # The whole static layer is copied onto the screen in the first frame
+                self.full_redraw = True
+
+                # Number of collected coins and gems which have been removed from the static layer
+                self.collected_drawn = 0
+
+            self.static_layer = self.create_static_layer(background if self.static_background else None)
+
+    def restart(self):
+        # Start the level again (for example, after the player has died)
+        # The level data is reset rather than loaded again, and the static layer and spatial index are kept as they are
+        self.level_data.reset()
 
         self.level_state = Level.LevelState.PLAYING
 
+        self.create_ninjas()
+
+        self.camera_x = 0
+        self.camera_y = 0
+
+        if self.dirty is not None:
+            # Put the coins and gems back into the static layer, and draw all of it again
+            self.create_static_layer(self.background, self.static_layer)
+
+            self.redraw_all()
+            self.collected_drawn = 0
+
+    def create_ninjas(self):
+        # Create the player and the enemies at their spawn positions
+        player_x, player_y, enemy_spawns = self.find_spawns()
+
+        self.player = PlayerNinja(player_x, player_y, self.controls)
+
         self.enemies = []
 
-        # Search for player spawn position and create PlayerNinja object
-        # Search for enemy spawn positions and create EnemyNinja objects and add them to a vector
+        # Only used if Constants.Enemy.USE_POOL is True
+        self.enemy_pool = None
+
+        if Constants.Enemy.USE_POOL:
+            self.enemy_pool = EnemyPool(enemy_spawns, self.random)
+
+        else:
+            for position_x, position_y in enemy_spawns:
+                self.enemies.append(EnemyNinja(position_x, position_y, self.random))
 
-        for y in range(Constants.GAME_HEIGHT_TILES):
-            for x in range(Constants.GAME_WIDTH_TILES):
+    def find_spawns(self):
+        # Return the player's spawn position, and a tuple of the enemies' spawn positions
+        # The spawn data never changes, so it is only searched the first time each level is created, and remembered after that
+        spawns = Level.spawn_tables.get(self.level_number)
+
+        if spawns is not None:
+            return spawns
+
+        player_x = 0
+        player_y = 0
+        enemy_spawns = []
+
+        # Search for player spawn position
+        # Search for enemy spawn positions and add them to a list
+
+        for y in range(self.level_data.height_tiles):
+            for x in range(self.level_data.width_tiles):
 
                 # Get spritesheet index at point (x,y)
-                spawn_id = self.level_data.entity_spawns[y * Constants.GAME_WIDTH_TILES + x]
+                spawn_id = self.level_data.entity_spawns[y * self.level_data.width_tiles + x]
 
                 # Calculate actual position from grid position
                 position_x = x * Constants.SPRITE_SIZE
                 position_y = y * Constants.SPRITE_SIZE
 
-                # Create the correct instance
+                # Remember the position, depending on what spawns there
                 if spawn_id == Constants.Sprites.PLAYER_IDLE:
-                    self.player = PlayerNinja(position_x, position_y)
+                    player_x = position_x
+                    player_y = position_y
 
                 elif spawn_id == Constants.Sprites.PLAYER_IDLE + Constants.Sprites.RED_OFFSET:
-                    self.enemies.append(EnemyNinja(position_x, position_y))
-
-    def update(self, dt):
-        if self.level_state == Level.LevelState.PLAYING:
-            # Update player
-            self.player.update(dt, self.level_data)
+                    enemy_spawns.append((position_x, position_y))
 
-            if self.coins_left() == 0:
-                # No more coins left, so the player has won!
-                self.level_state = Level.LevelState.PLAYER_WON
+        spawns = (player_x, player_y, tuple(enemy_spawns))
+        Level.spawn_tables[self.level_number] = spawns
 
-                self.player.set_won()
+        return spawns
 
-            # Update enemies
-            for enemy in self.enemies:
-                enemy.update(dt, self.level_data)
-
-                if self.player.check_ninja_colliding(enemy):
-                    # Player touched an enemy, so they're dead
-                    self.level_state = Level.LevelState.PLAYER_DEAD
+    def update(self, dt):
+        if self.level_state == Level.LevelState.PLAYING:
+            self.update_player(dt)
 
-                    # Trigger "jump and fall" animation before restarting level
-                    self.player.set_dead()
+            self.update_enemies(dt)
 
-            if self.player.get_y() > Constants.GAME_HEIGHT:
-                # Player has gone off the bottom of the screen, so they're dead
-                self.level_state = Level.LevelState.FAILED
+            self.update_collisions()
 
         elif self.level_state == Level.LevelState.PLAYER_DEAD:
             # Update player
             self.player.update(dt, self.level_data)
 
-            if self.player.get_y() > Constants.GAME_HEIGHT:
+            if self.player.get_y() > self.level_data.height:
                 # Player has gone off the bottom of the screen, so we can reset the level
                 self.level_state = Level.LevelState.FAILED
 
@@ -78,31 +209,212 @@ class Level:
             # Update player
             self.player.update(dt, self.level_data)
 
-            if self.player.finished_celebrating() or self.player.get_y() > Constants.GAME_HEIGHT:
+            if self.player.finished_celebrating() or self.player.get_y() > self.level_data.height:
                 # Player has finished doing victory jumps, or has fallen off the screen
                 self.level_state = Level.LevelState.COMPLETE
 
-    def render(self):
+    def update_profiled(self, dt, profiler):
+        # The same as update(), but the time taken by each part is recorded by the profiler
+        profiler.start()
+
+        if self.level_state == Level.LevelState.PLAYING:
+            self.update_player(dt)
+            profiler.stop(Profiler.Section.UPDATE_PLAYER)
+
+            self.update_enemies(dt)
+            profiler.stop(Profiler.Section.UPDATE_ENEMIES)
+
+            self.update_collisions()
+            profiler.stop(Profiler.Section.UPDATE_COLLISIONS)
+
+        else:
+            # Only the player is updated in the other states
+            self.update(dt)
+            profiler.stop(Profiler.Section.UPDATE_PLAYER)
+
+    def update_player(self, dt):
+        # Update player
+        self.player.update(dt, self.level_data)
+
+        if self.coins_left() == 0:
+            # No more coins left, so the player has won!
+            self.level_state = Level.LevelState.PLAYER_WON
+
+            self.player.set_won()
+
+    def update_enemies(self, dt):
+        # Pick a random number for every enemy in one go
+        self.random.fill(self.enemy_rolls)
+
+        # If the enemies are chasing the player, get the directions towards the player's tile
+        # This only needs a new search if the player has moved to a tile they haven't been in recently
+        field = None
+
+        if self.route_finder is not None:
+            field = self.route_finder.field_towards(self.player.get_x(), self.player.get_y())
+
+        # Update enemies
+        if self.enemy_pool is not None:
+            # Update all the enemies at once
+            self.enemy_pool.update(dt, self.level_data, self.enemy_rolls, self.route_finder, field)
+
+        else:
+            for i in range(len(self.enemies)):
+                self.enemies[i].update(dt, self.level_data, self.enemy_rolls[i], self.route_finder, field)
+
+    def update_collisions(self):
+        if self.check_enemy_collisions():
+            self.kill_player()
+
+        if self.player.get_y() > self.level_data.height:
+            # Player has gone off the bottom of the screen, so they're dead
+            self.level_state = Level.LevelState.FAILED
+
+    def render(self, interpolation=Constants.NO_INTERPOLATION):
+        if self.scrolling:
+            self.update_camera()
+
+        self.render_level()
+
+        self.render_ninjas(interpolation)
+
+        self.render_ui()
+
+    def render_profiled(self, interpolation, profiler):
+        # The same as render(), but the time taken by each part is recorded by the profiler
+        if self.scrolling:
+            self.update_camera()
+
+        profiler.start()
+
+        self.render_level()
+        profiler.stop(Profiler.Section.RENDER_TILES)
+
+        self.render_ninjas(interpolation)
+        profiler.stop(Profiler.Section.RENDER_NINJAS)
+
+        self.render_ui()
+        profiler.stop(Profiler.Section.RENDER_UI)
+
+    def render_level(self):
+        if self.dirty is not None:
+            self.render_level_dirty()
+            return
+
         # Render background pipes
         # self.render_tiles(self.level_data.pipes)
         
         # self.render_water()
 
         # Render platforms
-        self.render_tiles(self.level_data.platforms)
+        if self.static_layer is not None:
+            # The platforms have already been drawn into the static layer, so we just need to copy it onto the screen
+            blit(self.static_layer, 0, 0, Constants.GAME_WIDTH, Constants.GAME_HEIGHT, Constants.GAME_OFFSET_X, Constants.GAME_OFFSET_Y)
+        
+        else:
+            self.render_tiles(self.level_data.platforms)
 
         # Render extras (coins, gems and ladders)
         self.render_tiles(self.level_data.extras)
 
+    def render_level_dirty(self):
+        # The static layer contains everything except the ninjas and the text,
+        # so we only need to copy back the parts of it which they were drawn over last frame
+        if self.full_redraw:
+            blit(self.static_layer, 0, 0, Constants.GAME_WIDTH, Constants.GAME_HEIGHT, Constants.GAME_OFFSET_X, Constants.GAME_OFFSET_Y)
+
+            self.full_redraw = False
+
+        else:
+            self.dirty.restore(self.static_layer)
+
+        self.dirty.clear()
+
+        # Remove any coins and gems which have been collected since the last frame from the static layer
+        collected_positions = self.level_data.collected_positions
+
+        while self.collected_drawn < len(collected_positions):
+            self.redraw_static_tile(collected_positions[self.collected_drawn])
+
+            self.collected_drawn += 1
+
+    def redraw_static_tile(self, index):
+        # Draw a single tile of the static layer again, and copy it onto the screen
+        tile_x = (index % self.level_data.width_tiles) * Constants.SPRITE_SIZE
+        tile_y = (index // self.level_data.width_tiles) * Constants.SPRITE_SIZE
+
+        target(self.static_layer)
+
+        blend(COPY)
+        blit(self.background, tile_x + Constants.GAME_OFFSET_X, tile_y + Constants.GAME_OFFSET_Y, Constants.SPRITE_SIZE, Constants.SPRITE_SIZE, tile_x, tile_y)
+        blend(MASK)
+
+        if self.level_data.platforms[index] != Constants.Sprites.BLANK_TILE:
+            sprite(self.level_data.platforms[index], tile_x, tile_y)
+
+        if self.level_data.extras[index] != Constants.Sprites.BLANK_TILE:
+            sprite(self.level_data.extras[index], tile_x, tile_y)
+
+        target()
+
+        blit(self.static_layer, tile_x, tile_y, Constants.SPRITE_SIZE, Constants.SPRITE_SIZE, tile_x + Constants.GAME_OFFSET_X, tile_y + Constants.GAME_OFFSET_Y)
+
+    def redraw_all(self):
+        # Copy the whole static layer onto the screen next frame (for example, if something else has been drawn over the game)
+        if self.dirty is not None:
+            self.full_redraw = True
+
+    def add_dirty_rectangle(self, x, y, w, h):
+        # Something other than the level (such as the profiler overlay) has been drawn over this part of the screen,
+        # so copy it back from the static layer next frame. The position is measured from the top left of the screen
+        if self.dirty is not None:
+            self.dirty.add(x - Constants.GAME_OFFSET_X, y - Constants.GAME_OFFSET_Y, w, h)
+
+    def add_ninja_rectangle(self, previous_x, previous_y, x, y):
+        # The ninja is drawn somewhere between its previous and current positions, so the rectangle needs to cover both
+        left = int(min(previous_x, x))
+        top = int(min(previous_y, y))
+
+        self.dirty.add(left, top, int(max(previous_x, x)) + 1 + Constants.SPRITE_SIZE - left, int(max(previous_y, y)) + 1 + Constants.SPRITE_SIZE - top)
+
+    def render_ninjas(self, interpolation):
+        if self.dirty is not None:
+            # Remember where the ninjas are about to be drawn
+            if self.enemy_pool is not None:
+                pool = self.enemy_pool
+
+                for i in range(pool.count):
+                    self.add_ninja_rectangle(pool.previous_x[i], pool.previous_y[i], pool.position_x[i], pool.position_y[i])
+
+            else:
+                for enemy in self.enemies:
+                    self.add_ninja_rectangle(enemy.previous_x, enemy.previous_y, enemy.position_x, enemy.position_y)
+
+            self.add_ninja_rectangle(self.player.previous_x, self.player.previous_y, self.player.position_x, self.player.position_y)
+
         # Render enemies
-        for enemy in self.enemies:
-            enemy.render()
+        if self.enemy_pool is not None:
+            self.enemy_pool.render(interpolation, self.camera_x, self.camera_y)
+
+        else:
+            for enemy in self.enemies:
+                enemy.render(interpolation, self.camera_x, self.camera_y)
         
         # Render player
-        self.player.render()
+        self.player.render(interpolation, self.camera_x, self.camera_y)
 
+    def render_ui(self):
         # Render UI text
-    
+        if self.hud is not None:
+            # The text is only drawn again if the score has changed
+            self.hud.render(self.player.get_score())
+
+            if self.dirty is not None:
+                self.dirty.add(Hud.MARGIN - Constants.GAME_OFFSET_X, Hud.MARGIN - Constants.GAME_OFFSET_Y, self.hud.level_text.width, self.hud.level_text.height)
+                self.dirty.add(self.hud.score_x() - Constants.GAME_OFFSET_X, Hud.MARGIN - Constants.GAME_OFFSET_Y, self.hud.score_text.width, self.hud.score_text.height)
+
+            return
+
         # Set the text colour to white
         pen(15, 15, 15)
 
@@ -110,6 +422,10 @@ class Level:
         level_string = "Level: " + str(self.level_number + 1)
         text(level_string, 2, 2)
 
+        if self.dirty is not None:
+            w, h = measure(level_string)
+            self.dirty.add(2 - Constants.GAME_OFFSET_X, 2 - Constants.GAME_OFFSET_Y, w, h)
+
         # Render score
         score_string = "Score: " + str(self.player.get_score())
 
@@ -119,17 +435,145 @@ class Level:
         # Render score in top right corner
         text(score_string, Constants.SCREEN_WIDTH - 2 - w, 2)
 
-    def render_tiles(self, tile_ids):
+        if self.dirty is not None:
+            self.dirty.add(Constants.SCREEN_WIDTH - 2 - w - Constants.GAME_OFFSET_X, 2 - Constants.GAME_OFFSET_Y, w, h)
+
+    def check_enemy_collisions(self):
+        # Return true if the player is touching any of the enemies
+        if self.spatial_index is None:
+            # Check every enemy
+            if self.enemy_pool is not None:
+                return self.enemy_pool.check_colliding(self.player)
+
+            for enemy in self.enemies:
+                if self.player.check_ninja_colliding(enemy):
+                    return True
+
+            return False
+
+        # Sort the enemies into the spatial index, now that they have all moved
+        # The number of each enemy in the index is the same as its position in the pool (or list of enemies)
+        self.spatial_index.clear()
+
+        if self.enemy_pool is not None:
+            for i in range(self.enemy_pool.count):
+                self.spatial_index.insert(self.enemy_pool.position_x[i], self.enemy_pool.position_y[i])
+
+        else:
+            for enemy in self.enemies:
+                self.spatial_index.insert(enemy.get_x(), enemy.get_y())
+
+        # Only the enemies in the cells around the player could be touching them
+        found = self.spatial_index.query(self.player.get_x(), self.player.get_y(), self.nearby_enemies)
+
+        for j in range(found):
+            i = self.nearby_enemies[j]
+
+            if self.enemy_pool is not None:
+                colliding = self.player.check_ninja_position_colliding(self.enemy_pool.position_x[i], self.enemy_pool.position_y[i])
+
+            else:
+                colliding = self.player.check_ninja_colliding(self.enemies[i])
+
+            if colliding:
+                return True
+
+        return False
+
+    def kill_player(self):
+        # Player touched an enemy, so they're dead
+        self.level_state = Level.LevelState.PLAYER_DEAD
+
+        # Trigger "jump and fall" animation before restarting level
+        self.player.set_dead()
+
+    def render_tiles(self, tile_ids, offset_x=Constants.GAME_OFFSET_X, offset_y=Constants.GAME_OFFSET_Y):
+        width_tiles = self.level_data.width_tiles
+
+        # Only the tiles which are at least partly inside the game area are drawn
+        # For a paged map, this means that only the chunks near the camera are read
+        first_x = self.camera_x // Constants.SPRITE_SIZE
+        first_y = self.camera_y // Constants.SPRITE_SIZE
+
+        last_x = min((self.camera_x + Constants.GAME_WIDTH - 1) // Constants.SPRITE_SIZE + 1, width_tiles)
+        last_y = min((self.camera_y + Constants.GAME_HEIGHT - 1) // Constants.SPRITE_SIZE + 1, self.level_data.height_tiles)
+
+        offset_x -= self.camera_x
+        offset_y -= self.camera_y
+
         # Iterate through array of tile ids and render using the correct index in the spritesheet
-        for y in range(Constants.GAME_HEIGHT_TILES):
-            for x in range(Constants.GAME_WIDTH_TILES):
+        for y in range(first_y, last_y):
+            for x in range(first_x, last_x):
 
                 # Calculate tile index
-                tile_id = tile_ids[y * Constants.GAME_WIDTH_TILES + x]
+                tile_id = tile_ids[y * width_tiles + x]
 
                 # Only render the tile if it isn't a blank tile
                 if tile_id != Constants.Sprites.BLANK_TILE:
-                    sprite(tile_id, x * Constants.SPRITE_SIZE + Constants.GAME_OFFSET_X, y * Constants.SPRITE_SIZE + Constants.GAME_OFFSET_Y)
+                    sprite(tile_id, x * Constants.SPRITE_SIZE + offset_x, y * Constants.SPRITE_SIZE + offset_y)
+
+    def update_camera(self):
+        # Keep the player in the middle of the game area, without showing anything outside the level
+        self.camera_x = Level.camera_position(self.player.get_x(), self.level_data.width, Constants.GAME_WIDTH)
+        self.camera_y = Level.camera_position(self.player.get_y(), self.level_data.height, Constants.GAME_HEIGHT)
+
+    @staticmethod
+    def camera_position(position, level_size, view_size):
+        if level_size <= view_size:
+            return 0
+
+        camera = int(position) + Constants.SPRITE_SIZE // 2 - view_size // 2
+
+        if camera < 0:
+            return 0
+
+        elif camera > level_size - view_size:
+            return level_size - view_size
+
+        return camera
+
+    def create_static_layer(self, background, layer=None):
+        # Create an off-screen buffer the size of the game area, and draw everything which doesn't change during the level into it
+        # If an existing layer is given, it is drawn into again instead
+        if layer is None:
+            layer = Buffer(Constants.GAME_WIDTH, Constants.GAME_HEIGHT)
+
+        # Draw into the layer instead of the screen
+        target(layer)
+
+        # The rest of the game uses the MASK blend mode, but we want to overwrite whatever is already in the new buffer
+        blend(COPY)
+
+        if background is not None:
+            # Copy the part of the background which is behind the game area
+            blit(background, Constants.GAME_OFFSET_X, Constants.GAME_OFFSET_Y, Constants.GAME_WIDTH, Constants.GAME_HEIGHT, 0, 0)
+        
+        else:
+            # Fill the layer with fully transparent pixels, so that only the platforms are drawn when the layer is blitted
+            pen(0, 0, 0, 0)
+            clear()
+
+        blend(MASK)
+
+        # The layer only covers the game area, so the tiles don't need to be offset
+        self.render_tiles(self.level_data.platforms, 0, 0)
+
+        if self.dirty is not None:
+            # The coins, gems and ladders are only drawn into the layer when using dirty rectangles
+            # since collected coins and gems need to be removed from the layer again (see redraw_static_tile())
+            self.render_tiles(self.level_data.extras, 0, 0)
+
+        # Go back to drawing onto the screen
+        target()
+
+        return layer
+
+    def close(self):
+        # Called when the level is being replaced by another one, so that anything it holds open (such as a paged map's file) is released
+        self.level_data.close()
+
+    def has_static_background(self):
+        return self.static_background
 
     def render_water(self):
         for i in range(Constants.GAME_WIDTH_TILES):
@@ -145,10 +589,5 @@ class Level:
         return self.level_number
 
     def coins_left(self):
-        total = 0
-
-        for i in range(Constants.GAME_WIDTH_TILES * Constants.GAME_HEIGHT_TILES):
-            if self.level_data.extras[i] == Constants.Sprites.COIN:
-                total += 1
-
-        return total
\ No newline at end of file
+        # The level data keeps track of this as coins are collected
+        return self.level_data.coins_remaining
\ No newline at end of file
@@ -0,0 +1,68 @@
+import constants as Constants
+
+class NavMap:
+    # Answers the questions the enemy AI asks every frame ("is there a platform ahead?", "is there a ladder above or below?")
+    # with a single read from a table, instead of several calls to EnemyNinja.tile_at_position()
+    #
+    # The platforms and ladders never change during a level, so the table is built once, when the level is created.
+    # It has an extra row and column of cells around every edge of the level, so that positions just outside the level
+    # don't need to be checked separately. These cells never have a platform, but the cells just above and below the level
+    # can still have a ladder below or above them (in the top or bottom row of the level).
+
+    class Flags:
+        # There is a platform in this cell
+        PLATFORM = 0x01
+
+        # There is a ladder in the cell above/below this one
+        LADDER_UP = 0x02
+        LADDER_DOWN = 0x04
+
+    def __init__(self, level_data):
+        # Size of the table, including the border
+        self.width = level_data.width_tiles + 2
+        self.height = level_data.height_tiles + 2
+
+        self.flags = bytearray(self.width * self.height)
+
+        width_tiles = level_data.width_tiles
+        height_tiles = level_data.height_tiles
+
+        # The rows of the border above and below the level are included, since they can be next to a ladder
+        for y in range(-1, height_tiles + 1):
+            for x in range(width_tiles):
+                index = y * width_tiles + x
+                flags = 0
+
+                if 0 <= y < height_tiles and level_data.platforms[index] != Constants.Sprites.BLANK_TILE:
+                    flags |= NavMap.Flags.PLATFORM
+
+                if y > 0 and level_data.extras[index - width_tiles] == Constants.Sprites.LADDER:
+                    flags |= NavMap.Flags.LADDER_UP
+
+                if y < height_tiles - 1 and level_data.extras[index + width_tiles] == Constants.Sprites.LADDER:
+                    flags |= NavMap.Flags.LADDER_DOWN
+
+                self.flags[(y + 1) * self.width + x + 1] = flags
+
+    def flags_at(self, x, y):
+        # Get the flags for the cell containing a position (in pixels)
+        column = int(x // Constants.SPRITE_SIZE) + 1
+        row = int(y // Constants.SPRITE_SIZE) + 1
+
+        # Anything further outside the level than the border is also treated as empty
+        # The row and column are checked separately, since a column past the left or right border would read a cell from the next or previous row
+        if 0 <= column < self.width and 0 <= row < self.height:
+            return self.flags[row * self.width + column]
+
+        return 0
+
+    def platform_ahead(self, position_x, position_y, current_direction):
+        # The same as EnemyNinja.platform_ahead_of(), but the point in front of the ninja is looked up directly (rather than calling flags_at())
+        # This is called for every patrolling enemy on every frame
+        x = position_x + Constants.SPRITE_SIZE // 2 + current_direction * (Constants.Enemy.PLATFORM_DETECTION_WIDTH // 2)
+
+        # The point is one tile below the ninja, so its row in the table (which starts one row above the level) is two rows further down
+        column = int(x // Constants.SPRITE_SIZE) + 1
+        row = int(position_y // Constants.SPRITE_SIZE) + 2
+
+        return 0 <= column < self.width and 0 <= row < self.height and self.flags[row * self.width + column] & NavMap.Flags.PLATFORM != 0
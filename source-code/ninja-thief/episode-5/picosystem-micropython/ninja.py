@@ -23,12 +23,26 @@ class Ninja:
         BLUE = 0
         RED = 1
 
+    # Every attribute is listed here, and all of them are created in __init__, so ninjas never grow after they are created
+    # MicroPython ignores __slots__, so on the PicoSystem this is only a list of the attributes. When the game is run on a computer
+    # (using tools/run-headless.py), Python does enforce it, so adding an attribute which isn't listed here (or in a subclass's __slots__) raises an error
+    __slots__ = ("colour", "position_x", "position_y", "remainder_x", "remainder_y", "previous_x", "previous_y", "velocity_x", "velocity_y",
+                 "facing_direction", "can_jump", "can_climb", "climbing_state", "dead")
+
     def __init__(self, colour, x, y):
         self.colour = colour
 
         self.position_x = x
         self.position_y = y
 
+        # Fractions of a pixel which the ninja has moved, but which haven't been added to the position yet (only used if FIXED_POINT is True)
+        self.remainder_x = 0
+        self.remainder_y = 0
+
+        # Position before the most recent update, used to draw the ninja between updates
+        self.previous_x = x
+        self.previous_y = y
+
         self.velocity_x = 0
         self.velocity_y = 0
 
@@ -42,26 +56,42 @@ class Ninja:
         self.dead = False
     
     def update(self, dt, level_data):
+        # Remember where the ninja was before this update
+        self.previous_x = self.position_x
+        self.previous_y = self.position_y
+
         # This is set to true later in the update stage, but only if the ninja is on a platform
         self.can_jump = False
 
-        # Apply gravity, only if ninja isn't climbing a ladder
-        if self.climbing_state == Ninja.ClimbingState.NONE:
-            self.velocity_y += Constants.Environment.GRAVITY_ACCELERATION * dt
+        if Constants.FIXED_POINT:
+            # Apply gravity and move the ninja, using only integers
+            self.update_position_fixed_point(dt)
+
+        else:
+            # Apply gravity, only if ninja isn't climbing a ladder
+            if self.climbing_state == Ninja.ClimbingState.NONE:
+                self.velocity_y += Constants.Environment.GRAVITY_ACCELERATION * dt
 
-        # Move the ninja
-        self.position_x += self.velocity_x * dt
-        self.position_y += self.velocity_y * dt
+            # Move the ninja
+            self.position_x += self.velocity_x * dt
+            self.position_y += self.velocity_y * dt
 
-        # Don't allow ninja to go off the sides
+        # Don't allow ninja to go off the sides of the level
+        # (this also throws away any fraction of a pixel left over from fixed-point movement, the same as landing on a platform does)
         if self.position_x < -Constants.Ninja.BORDER:
             self.position_x = -Constants.Ninja.BORDER
+            self.remainder_x = 0
         
-        elif self.position_x > Constants.GAME_WIDTH - Constants.Ninja.BORDER - Constants.Ninja.WIDTH:
-            self.position_x = Constants.GAME_WIDTH - Constants.Ninja.BORDER - Constants.Ninja.WIDTH
+        elif self.position_x > level_data.width - Constants.Ninja.BORDER - Constants.Ninja.WIDTH:
+            self.position_x = level_data.width - Constants.Ninja.BORDER - Constants.Ninja.WIDTH
+            self.remainder_x = 0
         
         # Detect and resolve any collisions with platforms, ladders, coins etc, only if the ninja isn't dead
         if not self.dead:
+            if Constants.SWEPT_COLLISIONS:
+                # Stop at the first platform between the old and new positions, before looking at the tiles around the new position
+                self.sweep_collisions(level_data)
+
             self.handle_collisions(level_data)
 
         # Update direction the ninja is facing (only if the ninja is moving)
@@ -70,8 +100,33 @@ class Ninja:
         
         elif self.velocity_x > 0:
             self.facing_direction = Ninja.HorizontalDirection.RIGHT
+
+    def update_position_fixed_point(self, dt):
+        # Here, dt is in milliseconds, and velocities are in fractions of a pixel per second
+        # Dividing by TIME_SCALE last means that we don't lose any precision
+
+        # Apply gravity, only if ninja isn't climbing a ladder
+        if self.climbing_state == Ninja.ClimbingState.NONE:
+            self.velocity_y += Constants.Environment.GRAVITY_ACCELERATION * dt // Constants.TIME_SCALE
+
+        # Add the distance moved onto the remainders
+        # The distances are rounded towards zero, so that moving left or up isn't any faster than moving right or down
+        # (// on its own rounds negative numbers down, which would add an extra 1/FIXED_POINT_ONE of a pixel to most leftward or upward moves)
+        distance = self.velocity_x * dt
+        self.remainder_x += distance // Constants.TIME_SCALE if distance >= 0 else -(-distance // Constants.TIME_SCALE)
+
+        distance = self.velocity_y * dt
+        self.remainder_y += distance // Constants.TIME_SCALE if distance >= 0 else -(-distance // Constants.TIME_SCALE)
+
+        # Move the ninja by the whole number of pixels in each remainder, and keep the fraction of a pixel which is left over
+        # Shifting rounds down (even for negative numbers), so the remainders are always between 0 and FIXED_POINT_ONE - 1
+        self.position_x += self.remainder_x >> Constants.FIXED_POINT_SHIFT
+        self.position_y += self.remainder_y >> Constants.FIXED_POINT_SHIFT
+
+        self.remainder_x &= Constants.FIXED_POINT_ONE - 1
+        self.remainder_y &= Constants.FIXED_POINT_ONE - 1
     
-    def render(self):
+    def render(self, interpolation=Constants.NO_INTERPOLATION, camera_x=0, camera_y=0):
         # If ninja is travelling left, flip the image horizontally (set the transform flags)
         transform_flags = 0 if self.facing_direction == Ninja.HorizontalDirection.RIGHT else HFLIP
 
@@ -91,18 +146,33 @@ class Ninja:
         #  - number of sprites down (1)
         #  - width to stretch to (SPRITE_SIZE - i.e. don't stretch)
         #  - height to stretch to (SPRITE_SIZE - i.e. don't stretch)
-        sprite(index, round(self.position_x) + Constants.GAME_OFFSET_X, round(self.position_y) + Constants.GAME_OFFSET_Y, 1, 1, Constants.SPRITE_SIZE, Constants.SPRITE_SIZE, transform_flags)
+        # Draw the ninja part of the way from its previous position to its current position
+        # An interpolation of NO_INTERPOLATION (used when FIXED_TIMESTEP is False) means the ninja is drawn exactly at its current position
+        if Constants.FIXED_POINT:
+            # Positions are already whole pixels, and interpolation is measured in 1/FIXED_POINT_ONE
+            x = self.position_x - ((self.position_x - self.previous_x) * (Constants.FIXED_POINT_ONE - interpolation) >> Constants.FIXED_POINT_SHIFT)
+            y = self.position_y - ((self.position_y - self.previous_y) * (Constants.FIXED_POINT_ONE - interpolation) >> Constants.FIXED_POINT_SHIFT)
+
+        else:
+            x = round(self.position_x - (self.position_x - self.previous_x) * (1 - interpolation))
+            y = round(self.position_y - (self.position_y - self.previous_y) * (1 - interpolation))
+
+        # The camera position is subtracted, so that levels bigger than the game area can scroll
+        sprite(index, x + Constants.GAME_OFFSET_X - camera_x, y + Constants.GAME_OFFSET_Y - camera_y, 1, 1, Constants.SPRITE_SIZE, Constants.SPRITE_SIZE, transform_flags)
         
     def check_object_colliding(self, object_x, object_y, object_size):
-        return (self.position_x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER > object_x and
+        # With FIXED_POINT, a ninja which has moved part of the way into the next pixel to the right or below (a remainder above 0)
+        # overlaps that pixel too, otherwise a ninja standing on a platform wouldn't touch it (the remainders are always 0 with floats)
+        return (self.position_x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER + (self.remainder_x > 0) > object_x and
                 self.position_x + Constants.Ninja.BORDER < object_x + object_size and
-                self.position_y + Constants.SPRITE_SIZE > object_y and
+                self.position_y + Constants.SPRITE_SIZE + (self.remainder_y > 0) > object_y and
                 self.position_y < object_y + object_size)
 
     def check_ninja_colliding(self, ninja):
-        ninja_x = ninja.get_x()
-        ninja_y = ninja.get_y()
+        return self.check_ninja_position_colliding(ninja.get_x(), ninja.get_y())
 
+    def check_ninja_position_colliding(self, ninja_x, ninja_y):
+        # Check for a collision with a ninja at the given position
         return (self.position_x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER > ninja_x + Constants.Ninja.BORDER and self.position_x + Constants.Ninja.BORDER < ninja_x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER and
                 self.position_y + Constants.SPRITE_SIZE > ninja_y and self.position_y < ninja_y + Constants.SPRITE_SIZE)
 
@@ -121,29 +191,39 @@ class Ninja:
         x = int(self.position_x // Constants.SPRITE_SIZE)
         y = int(self.position_y // Constants.SPRITE_SIZE)
 
-        # We need to check that the player is within the game area
+        # The level may be bigger than the game area, if it is a paged map
+        width_tiles = level_data.width_tiles
+        height_tiles = level_data.height_tiles
+
+        # We need to check that the player is within the level
         # If they aren't, we don't need to worry about checking for collisions
-        if x < Constants.GAME_WIDTH_TILES and y < Constants.GAME_HEIGHT_TILES and self.position_x >= -Constants.Ninja.BORDER and self.position_y >= -Constants.SPRITE_SIZE:
+        if x < width_tiles and y < height_tiles and self.position_x >= -Constants.Ninja.BORDER and self.position_y >= -Constants.SPRITE_SIZE:
 
             # It's possible the ninja is near the edge of the screen and we could end up checking tiles which don't exist (off the edge of the screen)
             # To avoid this issue, we use the ternary operator to vary the maximum x and y offsets
             # The minimum offset is handled by the trucation, since it will round up (rather than down) if the value is negative
-            for y_offset in range(1 if y == Constants.GAME_HEIGHT_TILES - 1 else 2):
+            for y_offset in range(1 if y == height_tiles - 1 else 2):
 
-                for x_offset in range(1 if x == Constants.GAME_WIDTH_TILES - 1 else 2):
+                for x_offset in range(1 if x == width_tiles - 1 else 2):
                     
                     # Calculate grid position of this tile
                     new_x = x + x_offset
                     new_y = y + y_offset
 
+                    # Find out what the tile contains, so we only call the handlers which are needed
+                    flags = level_data.tile_flags[new_y * width_tiles + new_x]
+
                     # Handle platforms
-                    self.handle_platform(level_data, new_x, new_y)
+                    if flags & Constants.TileFlags.PLATFORM:
+                        self.handle_platform(new_x, new_y, flags)
                     
                     # Handle ladders
-                    self.handle_ladder(level_data, new_x, new_y)
+                    if flags & Constants.TileFlags.LADDER:
+                        self.handle_ladder(new_x, new_y)
 
                     # Handle scoring
-                    self.handle_scoring(level_data, new_x, new_y)
+                    if flags & Constants.TileFlags.COLLECTABLE:
+                        self.handle_scoring(level_data, new_x, new_y)
 
         # If ninja can no longer climb, reset their climbing state
         if not self.can_climb:
@@ -167,126 +247,245 @@ class Ninja:
             elif self.climbing_state == Ninja.ClimbingState.DOWN:
                 self.velocity_y = climbing_speed
 
-    def handle_platform(self, level_data, x, y):
-        # Get tile's sprite index from level data
-        tile_id = level_data.platforms[y * Constants.GAME_WIDTH_TILES + x]
-
-        # Check the tile actually exists (check that it isn't blank)
-        if tile_id != Constants.Sprites.BLANK_TILE:
-
-            # Calculate the actual position of the tile from the grid position
-            tile_x = x * Constants.SPRITE_SIZE
-            tile_y = y * Constants.SPRITE_SIZE
-
-            # Check if the ninja is colliding with the tile
-            if self.check_object_colliding(tile_x, tile_y, Constants.SPRITE_SIZE):
-                
-                # Check if this platform have a ladder in front of it
-                if level_data.extras[y * Constants.GAME_WIDTH_TILES + x] == Constants.Sprites.LADDER:
-
-                    # Check that the ninja is not on a ladder
-                    if self.climbing_state == Ninja.ClimbingState.NONE:
-
-                        # Check that the ninja is falling downwards
-                        if self.velocity_y > 0:
-
-                            # Check that the ninja collided with the smaller platform hitbox
-                            if self.position_y + Constants.SPRITE_SIZE - tile_y < Constants.ONE_WAY_PLATFORM_TOLERANCE:
-                                # Set the ninja's position so that it rests on top of the platform, and reset it's vertical velocity to zero
-                                self.position_y = tile_y - Constants.SPRITE_SIZE
-                                self.velocity_y = 0
-
-                                # Allow the ninja to jump again
-                                self.can_jump = True
-                
-                else:
-                    # Resolve collision by finding the direction with the least intersection
-                    # The value of the direction variable corresponds to:
-                    # 0 - left side of tile
-                    # 1 - top side of tile
-                    # 2 - right side of tile
-                    # 3 - bottom side of tile
-                    direction = 0
-
-                    # The starting value of least_intersection is at least the maximum possible intersection
-                    # The width/height of the tile is the maximum intersection possible
-                    least_intersection = Constants.SPRITE_SIZE
-
-                    # Check each side of the tile and find the minimum intersection
-
-                    # Left side of tile
-                    intersection = self.position_x + Constants.Ninja.WIDTH + Constants.Ninja.BORDER - tile_x
-                    if intersection < least_intersection:
-                        direction = 0
-                        least_intersection = intersection
-
-                    # Top side of tile
-                    intersection = self.position_y + Constants.SPRITE_SIZE - tile_y
-                    if intersection < least_intersection:
-                        direction = 1
-                        least_intersection = intersection
-
-                    # Right side of tile
-                    intersection = tile_x + Constants.SPRITE_SIZE - self.position_x - Constants.Ninja.BORDER
-                    if intersection < least_intersection:
-                        direction = 2
-                        least_intersection = intersection
-
-                    # Bottom side of tile
-                    intersection = tile_y + Constants.SPRITE_SIZE - self.position_y
-                    if intersection < least_intersection:
-                        direction = 3
-                        least_intersection = intersection
-
-                    # Now resolve collision by moving the ninja in the direction of least intersection, by exactly the amount equal to the least intersection
-                    if direction == 0:
-                        # Hit the left side of a platform
-                        self.position_x -= least_intersection
-                        self.velocity_x = 0
-
-                    elif direction == 1:
-                        # Landed on top of a platform
-                        self.position_y -= least_intersection
+    def sweep_collisions(self, level_data):
+        # Move the ninja back to the first platform it hit while moving in a straight line from its previous position to its current position
+        # The vertical movement is checked first, then the horizontal movement. For each, every row (or column) of tiles which the ninja's edge
+        # moved into is checked in turn, starting with the one nearest the previous position, so that the first platform in the way is found.
+        # Only the tiles which the ninja was overlapping at the moment its edge reached that row (or column) are checked,
+        # so the ninja can't land on the corner of a platform which it only passed diagonally near.
+        #
+        # Only the sides of platforms which aren't covered by another solid platform are checked, since the ninja can't hit those sides
+        # (for example, the sides of the tiles inside a wall). The ninja is left touching the platform it hit, so handle_collisions() then
+        # treats it the same way as a ninja which has moved slowly onto the platform.
+        self.sweep_vertical(level_data)
+        self.sweep_horizontal(level_data)
+
+    def sweep_vertical(self, level_data):
+        if self.position_y > self.previous_y:
+            # Falling (or climbing down), so find the first platform whose top the bottom of the ninja has moved past
+            start = self.previous_y + Constants.SPRITE_SIZE
+            end = self.position_y + Constants.SPRITE_SIZE
+
+            for y in range(Ninja.last_tile(start) + 1, Ninja.last_tile(end) + 1):
+                # Columns of tiles which the ninja was over when its bottom reached the top of this row
+                x = Ninja.interpolate(self.previous_x, self.position_x, y * Constants.SPRITE_SIZE - start, end - start)
+
+                for tile_x in range(int((x + Constants.Ninja.BORDER) // Constants.SPRITE_SIZE), Ninja.last_tile(x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER) + 1):
+                    flags = Ninja.flags_at(level_data, tile_x, y)
+
+                    # One-way platforms can only be landed on from above, and only when the ninja is falling (rather than climbing down a ladder)
+                    if not (flags & Constants.TileFlags.SOLID or (flags & Constants.TileFlags.ONE_WAY and self.climbing_state == Ninja.ClimbingState.NONE and self.velocity_y > 0)):
+                        continue
+
+                    if Ninja.flags_at(level_data, tile_x, y - 1) & Constants.TileFlags.SOLID:
+                        # The top of this platform is covered
+                        continue
+
+                    # Land on top of the platform
+                    self.position_y = y * Constants.SPRITE_SIZE - Constants.SPRITE_SIZE
+                    self.remainder_y = 0
+                    self.velocity_y = 0
+
+                    self.can_jump = True
+                    self.climbing_state = Ninja.ClimbingState.NONE
+                    return
+
+        elif self.position_y < self.previous_y:
+            # Moving upwards, so find the first solid platform whose bottom the top of the ninja has moved past
+            start = self.previous_y
+            end = self.position_y
+
+            for y in range(int(start // Constants.SPRITE_SIZE) - 1, int(end // Constants.SPRITE_SIZE) - 1, -1):
+                # Columns of tiles which the ninja was under when its top reached the bottom of this row
+                x = Ninja.interpolate(self.previous_x, self.position_x, start - (y + 1) * Constants.SPRITE_SIZE, start - end)
+
+                for tile_x in range(int((x + Constants.Ninja.BORDER) // Constants.SPRITE_SIZE), Ninja.last_tile(x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER) + 1):
+                    if Ninja.flags_at(level_data, tile_x, y) & Constants.TileFlags.SOLID and not Ninja.flags_at(level_data, tile_x, y + 1) & Constants.TileFlags.SOLID:
+                        # Hit the underside of the platform
+                        self.position_y = y * Constants.SPRITE_SIZE + Constants.SPRITE_SIZE
+                        self.remainder_y = 0
                         self.velocity_y = 0
-
-                        # Allow the ninja to jump again
-                        self.can_jump = True
-
-                        # Stop the ninja from climbing
-                        self.climbing_state = Ninja.ClimbingState.NONE
-
-                    elif direction == 2:
-                        # Hit the right side of a platform
-                        self.position_x += least_intersection
+                        return
+
+    def sweep_horizontal(self, level_data):
+        # The ninja is treated as having moved in a straight line to where sweep_vertical() left it
+        if self.position_x > self.previous_x:
+            # Moving right, so find the first solid platform whose left side the right side of the ninja has moved past
+            start = self.previous_x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER
+            end = self.position_x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER
+
+            for x in range(Ninja.last_tile(start) + 1, Ninja.last_tile(end) + 1):
+                # Rows of tiles which the ninja was level with when its right side reached the left of this column
+                y = Ninja.interpolate(self.previous_y, self.position_y, x * Constants.SPRITE_SIZE - start, end - start)
+
+                for tile_y in range(int(y // Constants.SPRITE_SIZE), Ninja.last_tile(y + Constants.SPRITE_SIZE) + 1):
+                    if Ninja.flags_at(level_data, x, tile_y) & Constants.TileFlags.SOLID and not Ninja.flags_at(level_data, x - 1, tile_y) & Constants.TileFlags.SOLID:
+                        self.position_x = x * Constants.SPRITE_SIZE - Constants.SPRITE_SIZE + Constants.Ninja.BORDER
+                        self.remainder_x = 0
                         self.velocity_x = 0
+                        return
 
-                    elif direction == 3:
-                        # Hit the underside of a platform
-                        self.position_y += least_intersection
-                        self.velocity_y = 0
-
-    def handle_ladder(self, level_data, x, y):
-        # Get tile's sprite index from level data
-        tile_id = level_data.extras[y * Constants.GAME_WIDTH_TILES + x]
+        elif self.position_x < self.previous_x:
+            # Moving left, so find the first solid platform whose right side the left side of the ninja has moved past
+            start = self.previous_x + Constants.Ninja.BORDER
+            end = self.position_x + Constants.Ninja.BORDER
 
-        # Check if the tile is a ladder
-        if tile_id == Constants.Sprites.LADDER:
+            for x in range(int(start // Constants.SPRITE_SIZE) - 1, int(end // Constants.SPRITE_SIZE) - 1, -1):
+                # Rows of tiles which the ninja was level with when its left side reached the right of this column
+                y = Ninja.interpolate(self.previous_y, self.position_y, start - (x + 1) * Constants.SPRITE_SIZE, start - end)
 
-            # Calculate the actual position of the tile from the grid position
-            tile_x = x * Constants.SPRITE_SIZE
-            tile_y = y * Constants.SPRITE_SIZE
-
-            # Check if ninja is colliding with the tile
-            if self.check_object_colliding(tile_x, tile_y, Constants.SPRITE_SIZE):
-                
-                # Check that ninja is sufficiently close to ladder
-                if abs(tile_x - self.position_x) < Constants.Ninja.WIDTH / 2:
-                    self.can_climb = True
-
-                    # Check if ninja should be climbing or idling on ladder
-                    if self.climbing_state != Ninja.ClimbingState.NONE:
-                        # Lock position to ladder
-                        self.position_x = tile_x
+                for tile_y in range(int(y // Constants.SPRITE_SIZE), Ninja.last_tile(y + Constants.SPRITE_SIZE) + 1):
+                    if Ninja.flags_at(level_data, x, tile_y) & Constants.TileFlags.SOLID and not Ninja.flags_at(level_data, x + 1, tile_y) & Constants.TileFlags.SOLID:
+                        self.position_x = x * Constants.SPRITE_SIZE + Constants.SPRITE_SIZE - Constants.Ninja.BORDER
+                        self.remainder_x = 0
+                        self.velocity_x = 0
+                        return
+
+    @staticmethod
+    def interpolate(previous, current, moved, distance):
+        # Return where one coordinate was when the ninja had moved "moved" out of "distance" along the other axis (distance is never 0)
+        # With FIXED_POINT, this is rounded down to a whole pixel, so that only integers are used
+        if Constants.FIXED_POINT:
+            return previous + (current - previous) * moved // distance
+
+        return previous + (current - previous) * moved / distance
+
+    @staticmethod
+    def last_tile(edge):
+        # Return the last tile (row or column) covered by something which ends at edge (in pixels)
+        # Tiles only count as covered if the edge is past their start, so an edge exactly on a tile boundary doesn't cover the next tile
+        return int(-(-edge // Constants.SPRITE_SIZE)) - 1
+
+    @staticmethod
+    def flags_at(level_data, x, y):
+        # Return the TileFlags of a tile, treating tiles outside the level as empty
+        if 0 <= x < level_data.width_tiles and 0 <= y < level_data.height_tiles:
+            return level_data.tile_flags[y * level_data.width_tiles + x]
+
+        return 0
+
+    def handle_platform(self, x, y, flags):
+        # The caller has already checked that there is a platform at this tile (using the tile flags)
+
+        # Calculate the actual position of the tile from the grid position
+        tile_x = x * Constants.SPRITE_SIZE
+        tile_y = y * Constants.SPRITE_SIZE
+
+        # Check if the ninja is colliding with the tile
+        if self.check_object_colliding(tile_x, tile_y, Constants.SPRITE_SIZE):
+            
+            # Check if this platform have a ladder in front of it
+            if flags & Constants.TileFlags.ONE_WAY:
+
+                # Check that the ninja is not on a ladder
+                if self.climbing_state == Ninja.ClimbingState.NONE:
+
+                    # Check that the ninja is falling downwards
+                    if self.velocity_y > 0:
+
+                        # Check that the ninja collided with the smaller platform hitbox
+                        if self.position_y + Constants.SPRITE_SIZE - tile_y < Constants.ONE_WAY_PLATFORM_TOLERANCE:
+                            # Set the ninja's position so that it rests on top of the platform, and reset it's vertical velocity to zero
+                            # Any fraction of a pixel left over from fixed-point movement is thrown away too, so the ninja is exactly on the platform
+                            self.position_y = tile_y - Constants.SPRITE_SIZE
+                            self.remainder_y = 0
+                            self.velocity_y = 0
+
+                            # Allow the ninja to jump again
+                            self.can_jump = True
+            
+            else:
+                # Resolve collision by finding the direction with the least intersection
+                # The value of the direction variable corresponds to:
+                # 0 - left side of tile
+                # 1 - top side of tile
+                # 2 - right side of tile
+                # 3 - bottom side of tile
+                direction = 0
+
+                # The starting value of least_intersection is at least the maximum possible intersection
+                # The width/height of the tile is the maximum intersection possible
+                # The intersections are measured in 1/FIXED_POINT_ONE of a pixel, so that with FIXED_POINT, the fraction of a pixel
+                # left over from fixed-point movement is included (with floats, the remainders are always 0, and this makes no difference)
+                least_intersection = Constants.SPRITE_SIZE * Constants.FIXED_POINT_ONE
+
+                # Check each side of the tile and find the minimum intersection
+
+                # Left side of tile
+                intersection = (self.position_x + Constants.Ninja.WIDTH + Constants.Ninja.BORDER - tile_x) * Constants.FIXED_POINT_ONE + self.remainder_x
+                if intersection < least_intersection:
+                    direction = 0
+                    least_intersection = intersection
+
+                # Top side of tile
+                intersection = (self.position_y + Constants.SPRITE_SIZE - tile_y) * Constants.FIXED_POINT_ONE + self.remainder_y
+                if intersection < least_intersection:
+                    direction = 1
+                    least_intersection = intersection
+
+                # Right side of tile
+                intersection = (tile_x + Constants.SPRITE_SIZE - self.position_x - Constants.Ninja.BORDER) * Constants.FIXED_POINT_ONE - self.remainder_x
+                if intersection < least_intersection:
+                    direction = 2
+                    least_intersection = intersection
+
+                # Bottom side of tile
+                intersection = (tile_y + Constants.SPRITE_SIZE - self.position_y) * Constants.FIXED_POINT_ONE - self.remainder_y
+                if intersection < least_intersection:
+                    direction = 3
+                    least_intersection = intersection
+
+                # Now resolve collision by moving the ninja in the direction of least intersection, so that it is just touching that side of the tile
+                # As above, the fraction of a pixel left over from fixed-point movement is thrown away in that direction
+                if direction == 0:
+                    # Hit the left side of a platform
+                    self.position_x = tile_x - Constants.Ninja.WIDTH - Constants.Ninja.BORDER
+                    self.remainder_x = 0
+                    self.velocity_x = 0
+
+                elif direction == 1:
+                    # Landed on top of a platform
+                    self.position_y = tile_y - Constants.SPRITE_SIZE
+                    self.remainder_y = 0
+                    self.velocity_y = 0
+
+                    # Allow the ninja to jump again
+                    self.can_jump = True
+
+                    # Stop the ninja from climbing
+                    self.climbing_state = Ninja.ClimbingState.NONE
+
+                elif direction == 2:
+                    # Hit the right side of a platform
+                    self.position_x = tile_x + Constants.SPRITE_SIZE - Constants.Ninja.BORDER
+                    self.remainder_x = 0
+                    self.velocity_x = 0
+
+                elif direction == 3:
+                    # Hit the underside of a platform
+                    self.position_y = tile_y + Constants.SPRITE_SIZE
+                    self.remainder_y = 0
+                    self.velocity_y = 0
+
+    def handle_ladder(self, x, y):
+        # The caller has already checked that there is a ladder at this tile (using the tile flags)
+
+        # Calculate the actual position of the tile from the grid position
+        tile_x = x * Constants.SPRITE_SIZE
+        tile_y = y * Constants.SPRITE_SIZE
+
+        # Check if ninja is colliding with the tile
+        if self.check_object_colliding(tile_x, tile_y, Constants.SPRITE_SIZE):
+            
+            # Check that ninja is sufficiently close to ladder
+            if abs(tile_x - self.position_x) < Constants.Ninja.WIDTH // 2:
+                self.can_climb = True
+
+                # Check if ninja should be climbing or idling on ladder
+                if self.climbing_state != Ninja.ClimbingState.NONE:
+                    # Lock position to ladder (throwing away any fraction of a pixel left over from fixed-point movement)
+                    self.position_x = tile_x
+                    self.remainder_x = 0
 
     def handle_scoring(self, level_data, x, y):
         # Only implemented by PlayerNinja
@@ -5,6 +5,10 @@ from time import ticks_ms, ticks_diff
 import constants as Constants
 from player_ninja import PlayerNinja
 from level import Level
+from profiler import Profiler
+from allocation_checker import AllocationChecker
+from image_loader import load_image
+from controls import Controls, InputRecorder, InputPlayer
 
 # Perform any initialisation here, at the start of the file
 
@@ -12,58 +16,201 @@ blend(MASK)
 
 last_time = 0
 
-# Load the first level
-level = Level(0)
+# Time which has passed but hasn't been simulated yet (only used if FIXED_TIMESTEP is True)
+accumulator = 0
+
+# How far (from 0 to NO_INTERPOLATION) we are between the last two simulation steps, used to draw the ninjas at in-between positions
+interpolation = Constants.NO_INTERPOLATION
+
+# The profiler is only created if profiling is turned on
+profiler = Profiler() if Constants.PROFILING else None
+
+# The allocation checker is only created if CHECK_ALLOCATIONS is True
+allocation_checker = AllocationChecker() if Constants.CHECK_ALLOCATIONS else None
+
+# True if either of them is being used, in which case the level is updated and rendered by update_level_measured() and render_level_measured()
+# This is only checked when a level starts (see use_level()), so the game doesn't do anything extra each step when neither is being used
+measuring = profiler is not None or allocation_checker is not None
 
 # Load the spritesheet
-sprites = Buffer(Constants.SPRITESHEET_WIDTH, Constants.SPRITESHEET_HEIGHT, "assets/spritesheet.16bpp")
+sprites = load_image(Constants.SPRITESHEET_FILE, Constants.SPRITESHEET_WIDTH, Constants.SPRITESHEET_HEIGHT)
 
 # Set the current spritesheet to the one we just loaded
 spritesheet(sprites)
 
 # Load the background
-background = Buffer(Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT, "assets/background.16bpp")
+background = load_image(Constants.BACKGROUND_FILE, Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT)
+
+# Create the controls, which read the buttons (or play back recorded input) once per frame
+# These need to be created before the first level, since recording and playing back input both set the random seed
+if Constants.INPUT_MODE == Constants.InputMode.RECORD:
+    controls = InputRecorder(Constants.INPUT_LOG_FILE)
+
+elif Constants.INPUT_MODE == Constants.InputMode.REPLAY:
+    controls = InputPlayer(Constants.INPUT_LOG_FILE)
+
+else:
+    controls = Controls()
+
+# Read how many levels there are from the level pack, so that we know when to go back to the first level
+level_count = Constants.LevelData.level_count()
+
+# Load the first level
+# The spritesheet and background need to be loaded first, since the level may draw its platforms into a static layer
+level = Level(0, background, controls)
 
 # Update the game
 def update(tick):
-    global last_time, level
+    global last_time, accumulator, interpolation
 
-    # Calculate change in time (in seconds) since last frame
+    # Calculate change in time since last frame
     # The ticks_diff() function calculates the number of milliseconds between the two times measured
-    dt = ticks_diff(ticks_ms(), last_time) / 1000
+    dt = ticks_diff(ticks_ms(), last_time)
     last_time = ticks_ms()
+
+    # Read the buttons for this frame
+    # If input is being played back, the recorded dt is used instead of the one we just measured
+    dt = controls.poll(dt)
+
+    if not Constants.FIXED_POINT:
+        # Convert to seconds (fixed-point physics uses whole milliseconds instead)
+        dt /= 1000
+
+    if Constants.FIXED_TIMESTEP:
+        # Run as many fixed-size steps as are needed to catch up with the time which has passed
+        accumulator += dt
+
+        steps = 0
+
+        while accumulator >= Constants.TIMESTEP:
+            if steps == Constants.MAX_STEPS_PER_FRAME:
+                # We've fallen too far behind, so give up on the rest of the time
+                # The game will slow down slightly, rather than spending even longer catching up next frame
+                accumulator = 0
+                break
+
+            update_level(Constants.TIMESTEP)
+
+            accumulator -= Constants.TIMESTEP
+            steps += 1
+
+        # The time left over is used to draw the ninjas part of the way towards their next positions
+        if Constants.FIXED_POINT:
+            interpolation = accumulator * Constants.FIXED_POINT_ONE // Constants.TIMESTEP
+        
+        else:
+            interpolation = accumulator / Constants.TIMESTEP
     
-    # Limit dt
-    if dt > 0.05:
-        dt = 0.05
+    else:
+        # Limit dt
+        if dt > Constants.MAX_DT:
+            dt = Constants.MAX_DT
 
-    # Update the level
-    level.update(dt)
+        update_level(dt)
+
+def update_level(dt):
+    # Update the level, using the function chosen by use_level()
+    update_step(dt)
 
     if level.level_failed():
-        # Restart the same level
-        level_number = level.get_level_number()
+        # Save any recorded input, in case the PicoSystem is turned off
+        controls.flush()
 
-        level = Level(level_number)
+        if allocation_checker is not None:
+            allocation_checker.report()
+
+        # Restart the same level
+        # The level is reset rather than created again, so its data doesn't need to be loaded (or its static layer drawn) again
+        level.restart()
     
     elif level.level_complete():
+        controls.flush()
+
+        if allocation_checker is not None:
+            allocation_checker.report()
+
         # Start the next level
         level_number = level.get_level_number() + 1
-        level_number %= Constants.LEVEL_COUNT
+        level_number %= level_count
+
+        # The old level must be closed before it is replaced
+        level.close()
+
+        use_level(Level(level_number, background, controls))
+
+def use_level(new_level):
+    # Make new_level the current level, and choose the functions used to update and render it
+    # Choosing them here means that update_level() and draw() don't need to check whether the game is being measured every step
+    global level, update_step, render_step
+
+    level = new_level
+
+    if measuring:
+        update_step = update_level_measured
+        render_step = render_level_measured
+
+    else:
+        # The level's own methods are called directly, which is exactly what the game would do without the profiler and allocation checker
+        update_step = level.update
+        render_step = level.render
+
+def update_level_measured(dt):
+    # Update the level, while profiling it and/or measuring how much memory it allocates
+    if allocation_checker is not None:
+        allocation_checker.start()
 
-        level = Level(level_number)
+    if profiler is not None:
+        # Record how long each part of the update takes
+        level.update_profiled(dt, profiler)
+
+    else:
+        level.update(dt)
+
+    if allocation_checker is not None:
+        allocation_checker.stop()
+
+def render_level_measured(interpolation):
+    # Render the level, while profiling it, and finish measuring the frame
+    if allocation_checker is not None:
+        # Record how much memory this frame's updates allocated
+        allocation_checker.end_frame()
+
+    if profiler is not None:
+        # Render the level, and record how long each part of the rendering takes
+        level.render_profiled(interpolation, profiler)
+
+        # Store the times for this frame
+        profiler.end_frame()
+
+        if Constants.PROFILER_OVERLAY:
+            profiler.render_overlay()
+
+            # The overlay isn't part of the level, so tell the level to draw over it next frame (if it is using dirty rectangles)
+            level.add_dirty_rectangle(0, profiler.overlay_y, profiler.overlay_width, profiler.overlay_height)
+
+    else:
+        level.render(interpolation)
 
 # Render the game
 def draw(tick):
-    # Clear the screen
-    pen(0, 0, 0)
-    clear()
+    # If the background has been drawn into the level's static layer, the level will cover the screen for us
+    if not level.has_static_background():
+        # Clear the screen
+        pen(0, 0, 0)
+        clear()
 
-    # Draw the entire background image onto the screen at (0, 0)
-    blit(background, 0, 0, Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT, 0, 0)
+        # Draw the entire background image onto the screen at (0, 0)
+        blit(background, 0, 0, Constants.SCREEN_WIDTH, Constants.SCREEN_HEIGHT, 0, 0)
 
-    # Render the player
-    level.render()
+    # Render the level (including the player), using the function chosen by use_level()
+    render_step(interpolation)
+
+# Choose how the first level is updated and rendered
+use_level(level)
 
 # Enter the main game loop
-start()
\ No newline at end of file
+start()
+
+# start() only returns when the game is run on a computer by tools/run-headless.py (on the PicoSystem, it runs until it is turned off)
+# Close the controls, so that the end of any input being recorded is saved
+controls.close()
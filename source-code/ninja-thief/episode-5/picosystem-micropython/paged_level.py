@@ -0,0 +1,231 @@
+from array import array
+
+import constants as Constants
+
+class ChunkCache:
+    # A paged map is split into square "chunks" of tiles, which are read from the map file when they are needed
+    # Only a few chunks are kept in memory at once, in "slots". When a chunk which isn't in memory is needed,
+    # it replaces the chunk in the slot which was used least recently (this is known as an LRU cache)
+    #
+    # The map file is created by tools/pack-levels.py --map, and contains a 10 byte header:
+    #   "LM", format version, chunk size (as a power of 2), width (in tiles), height (in tiles), number of coins
+    # (the last three are 16-bit big-endian numbers), followed by every chunk, row by row.
+    # Each chunk contains the platforms, extras, entity spawns and pipes for its tiles, with one byte per tile.
+
+    HEADER_SIZE = 10
+    VERSION = 1
+
+    # The layers stored in each slot
+    # The tile flags aren't stored in the file, since they are worked out whenever a chunk is read
+    class Layer:
+        PLATFORMS = 0
+        EXTRAS = 1
+        ENTITY_SPAWNS = 2
+        PIPES = 3
+        TILE_FLAGS = 4
+
+        # Number of layers stored in the file, and in each slot
+        STORED = 4
+        COUNT = 5
+
+    # Value used for slots and chunks which aren't loaded
+    NOT_LOADED = -1
+
+    def __init__(self, path, slot_count=Constants.MAP_CACHE_CHUNKS):
+        # The file is kept open, so that chunks can be read whenever they are needed
+        self.file = open(path, "rb")
+
+        header = self.file.read(ChunkCache.HEADER_SIZE)
+
+        if header[0:2] != b"LM" or header[2] != ChunkCache.VERSION:
+            raise ValueError("Not a paged map: " + path)
+
+        # Chunks are always a power of 2 wide, so that shifts and masks can be used instead of division
+        self.chunk_shift = header[3]
+        self.chunk_mask = (1 << self.chunk_shift) - 1
+        self.chunk_tiles = 1 << (self.chunk_shift * 2)
+
+        self.width_tiles = header[4] << 8 | header[5]
+        self.height_tiles = header[6] << 8 | header[7]
+
+        self.coin_count = header[8] << 8 | header[9]
+
+        self.chunks_x = (self.width_tiles + self.chunk_mask) >> self.chunk_shift
+        self.chunks_y = (self.height_tiles + self.chunk_mask) >> self.chunk_shift
+
+        # Every slot is allocated now, and reused when a different chunk is read into it
+        self.slots = [bytearray(self.chunk_tiles * ChunkCache.Layer.COUNT) for i in range(slot_count)]
+
+        # The chunk in each slot, and the slot each chunk is in
+        self.slot_chunk = array("h", [ChunkCache.NOT_LOADED] * slot_count)
+        self.chunk_slot = array("h", [ChunkCache.NOT_LOADED] * (self.chunks_x * self.chunks_y))
+
+        # When each slot was last used, measured by counting the number of times any slot has been used
+        self.slot_last_used = array("I", [0] * slot_count)
+        self.clock = 0
+
+        # Tiles whose coin or gem has been collected, so that it can be removed again if its chunk is read back in
+        self.removed = set()
+
+        # Number of chunks read from the file, which is useful when choosing MAP_CACHE_CHUNKS
+        self.loads = 0
+
+    def reset(self):
+        # Forget every chunk and every collected coin or gem, so that chunks are read from the file again when they are next needed
+        for slot in range(len(self.slots)):
+            if self.slot_chunk[slot] != ChunkCache.NOT_LOADED:
+                self.chunk_slot[self.slot_chunk[slot]] = ChunkCache.NOT_LOADED
+
+            self.slot_chunk[slot] = ChunkCache.NOT_LOADED
+            self.slot_last_used[slot] = 0
+
+        self.clock = 0
+        self.removed.clear()
+
+    def close(self):
+        # Close the map file, once the level using it has finished
+        # The cache can't read any more chunks after this
+        self.file.close()
+
+    def get(self, layer, index):
+        # Get a tile from one of the layers, where index is y * width_tiles + x (the same as for a level in the level pack)
+        y = index // self.width_tiles
+        x = index - y * self.width_tiles
+
+        slot = self.slot_for(((y >> self.chunk_shift) * self.chunks_x) + (x >> self.chunk_shift))
+
+        return self.slots[slot][layer * self.chunk_tiles + ((y & self.chunk_mask) << self.chunk_shift) + (x & self.chunk_mask)]
+
+    def set(self, layer, index, value):
+        # Change a tile in one of the layers
+        # Changes are lost when the chunk is replaced, so remove_extra() also records the tile in self.removed
+        y = index // self.width_tiles
+        x = index - y * self.width_tiles
+
+        slot = self.slot_for(((y >> self.chunk_shift) * self.chunks_x) + (x >> self.chunk_shift))
+
+        self.slots[slot][layer * self.chunk_tiles + ((y & self.chunk_mask) << self.chunk_shift) + (x & self.chunk_mask)] = value
+
+    def slot_for(self, chunk):
+        # Get the slot containing a chunk, reading the chunk from the file if it isn't already in memory
+        slot = self.chunk_slot[chunk]
+
+        if slot == ChunkCache.NOT_LOADED:
+            slot = self.load(chunk)
+
+        # The clock wraps around before it gets too big for the array (which only briefly affects which slot is replaced next)
+        self.clock = (self.clock + 1) & 0x3fffffff
+        self.slot_last_used[slot] = self.clock
+
+        return slot
+
+    def load(self, chunk):
+        # Find the least recently used slot
+        slot = 0
+
+        for i in range(1, len(self.slots)):
+            if self.slot_last_used[i] < self.slot_last_used[slot]:
+                slot = i
+
+        # Forget about the chunk which was in the slot
+        if self.slot_chunk[slot] != ChunkCache.NOT_LOADED:
+            self.chunk_slot[self.slot_chunk[slot]] = ChunkCache.NOT_LOADED
+
+        data = self.slots[slot]
+
+        # Read the stored layers straight into the slot
+        self.file.seek(ChunkCache.HEADER_SIZE + chunk * self.chunk_tiles * ChunkCache.Layer.STORED)
+        self.file.readinto(memoryview(data)[0:self.chunk_tiles * ChunkCache.Layer.STORED])
+
+        chunk_x = (chunk % self.chunks_x) << self.chunk_shift
+        chunk_y = (chunk // self.chunks_x) << self.chunk_shift
+
+        # Put back any coins and gems which have already been collected
+        for index in self.removed:
+            y = index // self.width_tiles - chunk_y
+            x = index % self.width_tiles - chunk_x
+
+            if 0 <= x <= self.chunk_mask and 0 <= y <= self.chunk_mask:
+                data[ChunkCache.Layer.EXTRAS * self.chunk_tiles + (y << self.chunk_shift) + x] = Constants.Sprites.BLANK_TILE
+
+        # Work out the tile flags for the chunk
+        extras = ChunkCache.Layer.EXTRAS * self.chunk_tiles
+        tile_flags = ChunkCache.Layer.TILE_FLAGS * self.chunk_tiles
+
+        for i in range(self.chunk_tiles):
+            data[tile_flags + i] = Constants.LevelData.flags_for(data[i], data[extras + i])
+
+        self.slot_chunk[slot] = chunk
+        self.chunk_slot[chunk] = slot
+
+        self.loads += 1
+
+        return slot
+
+class PagedLayer:
+    # Can be used in the same way as one of LevelData's bytearrays (only reading is supported)
+    # but the tiles are fetched from the chunk cache
+
+    def __init__(self, cache, layer):
+        self.cache = cache
+        self.layer = layer
+
+    def __getitem__(self, index):
+        return self.cache.get(self.layer, index)
+
+    def __len__(self):
+        return self.cache.width_tiles * self.cache.height_tiles
+
+class PagedLevelData:
+    # Has the same attributes and methods as LevelData, so it can be used by Level and the ninjas in its place
+    # Only the chunks of the map which are in use are held in memory, so maps can be much bigger than the game area
+
+    def __init__(self, path, cache_chunks=Constants.MAP_CACHE_CHUNKS):
+        self.cache = ChunkCache(path, cache_chunks)
+
+        self.width_tiles = self.cache.width_tiles
+        self.height_tiles = self.cache.height_tiles
+
+        self.width = self.width_tiles * Constants.SPRITE_SIZE
+        self.height = self.height_tiles * Constants.SPRITE_SIZE
+
+        self.platforms = PagedLayer(self.cache, ChunkCache.Layer.PLATFORMS)
+        self.extras = PagedLayer(self.cache, ChunkCache.Layer.EXTRAS)
+        self.entity_spawns = PagedLayer(self.cache, ChunkCache.Layer.ENTITY_SPAWNS)
+        self.pipes = PagedLayer(self.cache, ChunkCache.Layer.PIPES)
+        self.tile_flags = PagedLayer(self.cache, ChunkCache.Layer.TILE_FLAGS)
+
+        # Paged levels don't have a NavMap, so the enemies look up the tiles instead
+        self.nav_map = None
+
+        # The number of coins in the whole map is stored in the file, so that every chunk doesn't need to be read to count them
+        self.coins_remaining = self.cache.coin_count
+
+        # Positions of the coins and gems which have been collected, in the order they were collected (the same as LevelData)
+        self.collected_positions = []
+
+    def build_tile_flags(self):
+        # Nothing to do, since the tile flags are worked out as each chunk is read
+        pass
+
+    def reset(self):
+        # Put back every coin and gem which has been collected, by reading the chunks from the file again
+        self.cache.reset()
+
+        self.coins_remaining = self.cache.coin_count
+        self.collected_positions.clear()
+
+    def close(self):
+        # Close the map file, since the level is being replaced
+        self.cache.close()
+
+    def remove_extra(self, index):
+        # Remove a coin or gem from the map, keeping the coin count and tile flags up to date
+        if self.extras[index] == Constants.Sprites.COIN:
+            self.coins_remaining -= 1
+
+        self.cache.removed.add(index)
+        self.collected_positions.append(index)
+
+        self.cache.set(ChunkCache.Layer.EXTRAS, index, Constants.Sprites.BLANK_TILE)
+        self.cache.set(ChunkCache.Layer.TILE_FLAGS, index, self.tile_flags[index] & ~Constants.TileFlags.COLLECTABLE)
@@ -5,9 +5,15 @@ import constants as Constants
 
 class PlayerNinja(Ninja):
 
-    def __init__(self, x, y):
+    # Only the extra attributes are listed, since the rest are already in Ninja.__slots__
+    __slots__ = ("score", "won", "celebration_jumps_remaining", "controls")
+
+    def __init__(self, x, y, controls):
         super().__init__(Ninja.Colour.BLUE, x, y)
 
+        # The buttons are read from here, which may be playing back recorded input
+        self.controls = controls
+
         self.score = 0
 
         self.won = False
@@ -31,16 +37,16 @@ class PlayerNinja(Ninja):
             
             # Note: "else if" isn't used, because otherwise the sprite will still move when both buttons are pressed
             # Instead, we add/subtract the velocity, so if both are pressed, nothing happens
-            if button(LEFT):
+            if self.controls.button(LEFT):
                 self.velocity_x -= Constants.Player.MAX_SPEED
             
-            if button(RIGHT):
+            if self.controls.button(RIGHT):
                 self.velocity_x += Constants.Player.MAX_SPEED
 
             # Handle climbing
             if self.can_climb:
-                up = button(UP)
-                down = button(DOWN)
+                up = self.controls.button(UP)
+                down = self.controls.button(DOWN)
 
                 if up != down:
                     # Only one of up and down are selected
@@ -52,7 +58,7 @@ class PlayerNinja(Ninja):
 
             # Handle jumping
             # Note that we use the pressed function, which returns true if the button was just pressed (since the last frame)
-            if pressed(A):
+            if self.controls.pressed(A):
                 if self.can_jump:
                     self.jump(Constants.Player.JUMP_SPEED)
         
@@ -62,7 +68,7 @@ class PlayerNinja(Ninja):
 
     def handle_scoring(self, level_data, x, y):
         # Calculate position of tile in array
-        array_position = y * Constants.GAME_WIDTH_TILES + x
+        array_position = y * level_data.width_tiles + x
 
         # Get tile's sprite index from level data
         tile_id = level_data.extras[array_position]
@@ -85,8 +91,8 @@ class PlayerNinja(Ninja):
                 elif tile_id == Constants.Sprites.GEM:
                     self.score += Constants.Collectable.GEM_SCORE
 
-                # Remove item from level data
-                level_data.extras[array_position] = Constants.Sprites.BLANK_TILE
+                # Remove item from level data (this also updates the number of coins left)
+                level_data.remove_extra(array_position)
 
     def get_score(self):
         return self.score
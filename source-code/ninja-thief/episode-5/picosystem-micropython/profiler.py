@@ -0,0 +1,129 @@
+from picosystem import *
+
+from array import array
+from time import ticks_us, ticks_diff
+
+import constants as Constants
+
+class Profiler:
+    # Records how long each part of updating and rendering the level takes, for the last few frames
+    # The times for each part are stored in a fixed-size "ring buffer", so once it is full, the oldest time is overwritten each frame
+    # A section's time is only recorded for frames in which it ran (for example, when FIXED_TIMESTEP is True, some frames don't update the level at all)
+
+    # We're using classes as enums
+    class Section:
+        UPDATE_PLAYER = 0
+        UPDATE_ENEMIES = 1
+        UPDATE_COLLISIONS = 2
+        RENDER_TILES = 3
+        RENDER_NINJAS = 4
+        RENDER_UI = 5
+
+        COUNT = 6
+
+    # Short names for each section, used by the overlay
+    SECTION_NAMES = ("player", "enemies", "collide", "tiles", "ninjas", "ui")
+
+    # Distance of the overlay text from the left of the screen
+    OVERLAY_X = 2
+
+    def __init__(self, samples=Constants.PROFILER_SAMPLES):
+        self.samples = samples
+
+        # Times are stored in microseconds
+        self.times = [array("I", [0] * samples) for i in range(Profiler.Section.COUNT)]
+
+        # Time spent in each section during the current frame (the level may be updated more than once per frame),
+        # and whether each section has run at all during the current frame
+        self.frame_times = array("I", [0] * Profiler.Section.COUNT)
+        self.frame_timed = bytearray(Profiler.Section.COUNT)
+
+        # Position in each ring buffer to write the next time to, and the number of times recorded so far for each section
+        self.positions = array("H", [0] * Profiler.Section.COUNT)
+        self.counts = array("H", [0] * Profiler.Section.COUNT)
+
+        self.last_time = 0
+
+        # Text drawn by render_overlay(), which is only worked out every PROFILER_OVERLAY_INTERVAL frames
+        self.overlay_lines = []
+        self.frames_until_overlay_update = 0
+
+        # The part of the screen covered by the overlay, so that the level can draw over it again next frame
+        self.overlay_y = Constants.SCREEN_HEIGHT
+        self.overlay_width = 0
+        self.overlay_height = 0
+
+    def start(self):
+        # Start timing the first section
+        self.last_time = ticks_us()
+
+    def stop(self, section):
+        # Add the time since start() (or the previous call to stop()) to the section
+        # This means that the next section starts being timed straight away
+        now = ticks_us()
+
+        self.frame_times[section] += ticks_diff(now, self.last_time)
+        self.frame_timed[section] = True
+
+        self.last_time = now
+
+    def end_frame(self):
+        # Copy this frame's times into the ring buffers, and get ready for the next frame
+        # Sections which didn't run during this frame are skipped, rather than recording a time of 0
+        for section in range(Profiler.Section.COUNT):
+            if self.frame_timed[section]:
+                self.times[section][self.positions[section]] = self.frame_times[section]
+
+                self.positions[section] = (self.positions[section] + 1) % self.samples
+
+                if self.counts[section] < self.samples:
+                    self.counts[section] += 1
+
+            self.frame_times[section] = 0
+            self.frame_timed[section] = False
+
+    def statistics(self, section):
+        # Return the minimum, mean and 99th percentile time (in microseconds) for a section, over the frames recorded
+        count = self.counts[section]
+
+        if count == 0:
+            return 0, 0, 0
+
+        times = sorted(self.times[section][:count])
+
+        return times[0], sum(times) // count, times[(count * 99) // 100]
+
+    def report(self):
+        # Print the statistics for every section
+        for section in range(Profiler.Section.COUNT):
+            minimum, mean, p99 = self.statistics(section)
+
+            print(Profiler.SECTION_NAMES[section], "min:", minimum, "mean:", mean, "p99:", p99)
+
+    def render_overlay(self):
+        # Draw "name min/mean/p99" for each section in the bottom left corner of the screen
+        if self.frames_until_overlay_update == 0:
+            self.overlay_lines = []
+
+            for section in range(Profiler.Section.COUNT):
+                minimum, mean, p99 = self.statistics(section)
+
+                self.overlay_lines.append(Profiler.SECTION_NAMES[section] + " " + str(minimum) + "/" + str(mean) + "/" + str(p99))
+
+            self.overlay_y = Constants.SCREEN_HEIGHT - 8 * len(self.overlay_lines)
+            self.overlay_width = Profiler.OVERLAY_X + max(measure(line)[0] for line in self.overlay_lines)
+            self.overlay_height = 8 * len(self.overlay_lines)
+
+            self.frames_until_overlay_update = Constants.PROFILER_OVERLAY_INTERVAL
+
+        self.frames_until_overlay_update -= 1
+
+        # Set the text colour to yellow
+        pen(15, 15, 0)
+
+        y = self.overlay_y
+
+        for line in self.overlay_lines:
+            text(line, Profiler.OVERLAY_X, y)
+
+            y += 8
@@ -0,0 +1,60 @@
+import constants as Constants
+
+class RandomStream:
+    # A small, fast random number generator, which only uses integers (so no floats are created)
+    # This is a 16-bit "xorshift" generator: each number is made from the last one using a few shifts and XORs.
+    # It produces every number from 1 to 65535 once before repeating, which is plenty for the enemies' decisions.
+    #
+    # Each level owns its own stream, so the same seed always produces the same enemy behaviour
+
+    # Mask used to keep the state within 16 bits after shifting it left
+    MASK = 0xffff
+
+    def __init__(self, seed):
+        self.seed(seed)
+
+    def seed(self, seed):
+        # The state must never be 0, since the generator would then only ever produce 0
+        self.state = seed & RandomStream.MASK or 1
+
+    def next(self):
+        # Return a number from 1 to 65535
+        x = self.state
+
+        x ^= (x << 7) & RandomStream.MASK
+        x ^= x >> 9
+        x ^= (x << 8) & RandomStream.MASK
+
+        self.state = x
+
+        return x
+
+    def fill(self, values):
+        # Fill an array with random numbers, which is faster than calling next() for each one
+        # The state is kept in a local variable while the loop runs, so it isn't looked up and stored for every number
+        x = self.state
+
+        for i in range(len(values)):
+            x ^= (x << 7) & RandomStream.MASK
+            x ^= x >> 9
+            x ^= (x << 8) & RandomStream.MASK
+
+            values[i] = x
+
+        self.state = x
+
+    def chance(self, threshold):
+        # Return True with a probability of threshold / RANDOM_RANGE
+        return self.next() < threshold
+
+    def choice(self, options):
+        # Pick one of the options
+        return options[self.next() % len(options)]
+
+    def integer(self, low, high):
+        # Return a whole number from low up to (but not including) high
+        return low + (high - low) * self.next() // Constants.RANDOM_RANGE
+
+    def uniform(self, low, high):
+        # Return a float from low up to (but not including) high
+        return low + (high - low) * self.next() / Constants.RANDOM_RANGE
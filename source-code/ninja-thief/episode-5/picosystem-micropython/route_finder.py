@@ -0,0 +1,265 @@
+from array import array
+
+import constants as Constants
+
+class RouteFinder:
+    # Works out which way enemies need to go to reach the player
+    #
+    # When the level is created, the tiles are turned into a graph: each tile a ninja can stand in (just above a platform)
+    # or climb through (a ladder) is a node, with an edge for each move a ninja can make from it:
+    #  - walking left or right onto the next tile (falling down to whichever tile it lands on, if there's no platform there,
+    #    as long as it isn't too far to fall safely)
+    #  - climbing up or down a ladder
+    # Enemies can't jump, so there are no edges for jumps.
+    #
+    # Rather than searching for a route from each enemy to the player, a single breadth-first search is done outwards from the player's tile,
+    # following the edges backwards. This gives a "flow field": the first move of the shortest route from every tile to the player.
+    # Every enemy can then look up its move with a single read, and the search only needs to be done again when the player moves to a different tile.
+    # The last few flow fields are kept, so that moving back to a recent tile doesn't need a new search.
+
+    # Moves stored in a flow field
+    class Move:
+        # This tile is a node, but there is no route to the player from it (or the player is in it)
+        NONE = 0
+
+        LEFT = 1
+        RIGHT = 2
+        UP = 3
+        DOWN = 4
+
+        # This tile isn't a node (for example, the ninja is falling through it), so the ninja should carry on as it is
+        CONTINUE = 5
+
+    # Each edge is stored as (source tile << MOVE_BITS) | move
+    MOVE_BITS = 3
+    MOVE_MASK = (1 << MOVE_BITS) - 1
+
+    def __init__(self, level_data, cache_size=Constants.Enemy.ROUTE_CACHE_SIZE):
+        self.width_tiles = level_data.width_tiles
+        self.height_tiles = level_data.height_tiles
+
+        tile_count = self.width_tiles * self.height_tiles
+
+        # Tiles which can be stood in or climbed through
+        self.nodes = bytearray(tile_count)
+
+        for i in range(tile_count):
+            self.nodes[i] = self.is_standable(level_data, i) or level_data.tile_flags[i] & Constants.TileFlags.LADDER != 0
+
+        # Find every edge, then store them backwards (grouped by the tile they lead to), since that's the direction the search follows them
+        edges = [self.edges_from(level_data, i) for i in range(tile_count)]
+
+        # The edges leading to tile i are reverse_edges[reverse_start[i]] to reverse_edges[reverse_start[i + 1] - 1]
+        self.reverse_start = array("H", [0] * (tile_count + 1))
+
+        for i in range(tile_count):
+            for destination, move in edges[i]:
+                self.reverse_start[destination + 1] += 1
+
+        for i in range(tile_count):
+            self.reverse_start[i + 1] += self.reverse_start[i]
+
+        self.reverse_edges = array("H", [0] * self.reverse_start[tile_count])
+
+        filled = array("H", self.reverse_start)
+
+        for i in range(tile_count):
+            for destination, move in edges[i]:
+                self.reverse_edges[filled[destination]] = (i << RouteFinder.MOVE_BITS) | move
+                filled[destination] += 1
+
+        # The starting point for every flow field: NONE for nodes, and CONTINUE for every other tile
+        self.empty_field = bytes(RouteFinder.Move.NONE if self.nodes[i] else RouteFinder.Move.CONTINUE for i in range(tile_count))
+
+        # Used by the search, and allocated now so that searching doesn't allocate any memory
+        # Rather than clearing the visited array before each search, each search marks tiles with a different number
+        self.queue = array("H", [0] * tile_count)
+        self.visited = array("H", [0] * tile_count)
+        self.search_number = 0
+
+        # Recently used flow fields, keyed by the player's tile, with the least recently used first in cache_order
+        self.cache = {}
+        self.cache_order = []
+        self.cache_size = cache_size
+
+        # The player's tile, and the flow field towards it
+        self.target = -1
+        self.field = None
+
+        # Number of searches done, which is useful when choosing ROUTE_CACHE_SIZE
+        self.searches = 0
+
+    @staticmethod
+    def is_platform(level_data, index):
+        return level_data.tile_flags[index] & Constants.TileFlags.PLATFORM != 0
+
+    def is_standable(self, level_data, index):
+        # A ninja can stand in a tile if it's empty and there's a platform (of either type) underneath it
+        return (not RouteFinder.is_platform(level_data, index) and index + self.width_tiles < len(self.nodes) and
+                RouteFinder.is_platform(level_data, index + self.width_tiles))
+
+    def landing_tile(self, level_data, index):
+        # Return the tile a ninja would land in if it fell from this tile
+        # If it would fall out of the level, or further than ROUTE_MAX_DROP tiles, -1 is returned instead
+        for drop in range(Constants.Enemy.ROUTE_MAX_DROP + 1):
+            if index >= len(self.nodes):
+                break
+
+            if self.is_standable(level_data, index):
+                return index
+
+            index += self.width_tiles
+
+        return -1
+
+    def edges_from(self, level_data, index):
+        # Return a list of (destination, move) for every move a ninja can make from this tile
+        edges = []
+
+        x = index % self.width_tiles
+        ladder = level_data.tile_flags[index] & Constants.TileFlags.LADDER
+
+        if self.is_standable(level_data, index):
+            # Walk left or right, as long as there isn't a platform in the way
+            for move, neighbour_x in ((RouteFinder.Move.LEFT, x - 1), (RouteFinder.Move.RIGHT, x + 1)):
+                if 0 <= neighbour_x < self.width_tiles and not RouteFinder.is_platform(level_data, index - x + neighbour_x):
+                    destination = self.landing_tile(level_data, index - x + neighbour_x)
+
+                    if destination != -1:
+                        edges.append((destination, move))
+
+        if ladder:
+            # Climb up or down, as long as the ladder carries on in that direction
+            if index >= self.width_tiles and level_data.tile_flags[index - self.width_tiles] & Constants.TileFlags.LADDER:
+                edges.append((index - self.width_tiles, RouteFinder.Move.UP))
+
+            if index + self.width_tiles < len(self.nodes) and level_data.tile_flags[index + self.width_tiles] & Constants.TileFlags.LADDER:
+                edges.append((index + self.width_tiles, RouteFinder.Move.DOWN))
+
+        return edges
+
+    def tile_at(self, x, y):
+        # Return the tile containing a position (in pixels), or -1 if it's outside the level
+        tile_x = int(x // Constants.SPRITE_SIZE)
+        tile_y = int(y // Constants.SPRITE_SIZE)
+
+        if 0 <= tile_x < self.width_tiles and 0 <= tile_y < self.height_tiles:
+            return tile_y * self.width_tiles + tile_x
+
+        return -1
+
+    def field_towards(self, x, y):
+        # Return the flow field towards the ninja at (x, y), which is normally the player
+        # The tile is found from the middle of the ninja. If the ninja isn't in a node (because it's jumping or falling),
+        # the last field is returned, so that the enemies keep heading to where the player last stood
+        tile = self.tile_at(x + Constants.SPRITE_SIZE // 2, y + Constants.SPRITE_SIZE // 2)
+
+        if tile != -1 and tile != self.target and self.nodes[tile]:
+            self.target = tile
+
+            if tile in self.cache:
+                self.field = self.cache[tile]
+
+                # Move the tile to the back of cache_order, since its field is now the most recently used
+                # (the list doesn't shrink when the tile is removed, so adding it back doesn't allocate any memory)
+                self.cache_order.remove(tile)
+                self.cache_order.append(tile)
+
+            else:
+                self.field = self.new_field(tile)
+
+        return self.field
+
+    def new_field(self, target):
+        # Get a flow field towards the target tile, reusing the least recently used one in the cache if the cache is full
+        if len(self.cache_order) == self.cache_size:
+            least_recent = self.cache_order.pop(0)
+            field = self.cache.pop(least_recent)
+
+        else:
+            field = bytearray(len(self.nodes))
+
+        self.search(target, field)
+
+        self.cache[target] = field
+        self.cache_order.append(target)
+
+        return field
+
+    def search(self, target, field):
+        # Breadth-first search outwards from the target, filling in the first move of the route from each tile that can reach it
+        field[:] = self.empty_field
+
+        self.search_number = (self.search_number + 1) & 0xffff
+
+        if self.search_number == 0:
+            # The numbers have wrapped around, so clear the visited array to make sure old marks aren't mistaken for new ones
+            for i in range(len(self.visited)):
+                self.visited[i] = 0
+
+            self.search_number = 1
+
+        queue = self.queue
+        visited = self.visited
+        reverse_start = self.reverse_start
+        reverse_edges = self.reverse_edges
+
+        queue[0] = target
+        visited[target] = self.search_number
+
+        head = 0
+        tail = 1
+
+        while head < tail:
+            tile = queue[head]
+            head += 1
+
+            for i in range(reverse_start[tile], reverse_start[tile + 1]):
+                source = reverse_edges[i] >> RouteFinder.MOVE_BITS
+
+                if visited[source] != self.search_number:
+                    visited[source] = self.search_number
+
+                    # The move along this edge is the first step of the shortest route from source
+                    field[source] = reverse_edges[i] & RouteFinder.MOVE_MASK
+
+                    queue[tail] = source
+                    tail += 1
+
+        self.searches += 1
+
+    def chase_move(self, field, position_x, position_y, climbing):
+        # Decide how an enemy at the given position should move to follow the flow field, returning one of the Moves
+        # LEFT and RIGHT mean walk that way, UP and DOWN mean climb, NONE means there's no route, and CONTINUE means carry on as before
+        x = position_x + Constants.SPRITE_SIZE // 2
+        y = position_y + Constants.SPRITE_SIZE // 2
+
+        tile = self.tile_at(x, y)
+
+        if tile == -1:
+            return RouteFinder.Move.CONTINUE
+
+        move = field[tile]
+
+        if move == RouteFinder.Move.UP or move == RouteFinder.Move.DOWN:
+            if not climbing:
+                # Line up with the ladder before starting to climb it (ninjas can only climb when they're close to the middle of the ladder)
+                ladder_x = (tile % self.width_tiles) * Constants.SPRITE_SIZE
+
+                if position_x < ladder_x - Constants.Enemy.ROUTE_TOLERANCE:
+                    return RouteFinder.Move.RIGHT
+
+                if position_x > ladder_x + Constants.Enemy.ROUTE_TOLERANCE:
+                    return RouteFinder.Move.LEFT
+
+        elif (move == RouteFinder.Move.LEFT or move == RouteFinder.Move.RIGHT) and climbing:
+            # Climb until we're level with the tile before getting off the ladder, so that we land on the platform rather than falling through it
+            tile_y = (tile // self.width_tiles) * Constants.SPRITE_SIZE
+
+            if position_y > tile_y + Constants.Enemy.ROUTE_TOLERANCE:
+                return RouteFinder.Move.UP
+
+            if position_y < tile_y - Constants.Enemy.ROUTE_TOLERANCE:
+                return RouteFinder.Move.DOWN
+
+        return move
@@ -0,0 +1,86 @@
+from array import array
+
+import constants as Constants
+
+class SpatialIndex:
+    # Sorts objects into "buckets" based on which cell of a grid they are in, where each cell is CELL_TILES x CELL_TILES tiles of the level
+    # We can then find everything near a position by only looking in the buckets around it, rather than checking every object
+    #
+    # The grid is only GRID_SIZE x GRID_SIZE cells, and it repeats across levels which are bigger than that (such as paged maps),
+    # so the index uses the same small amount of memory however big the level is. This means objects which are far apart can share a bucket,
+    # so a query can return objects which aren't actually near the position, but it never misses one which is.
+    #
+    # Objects are identified by a number (the order they were added in), so that anything can be stored: ninjas, enemies in an EnemyPool, projectiles...
+    # Each bucket is a linked list stored in arrays, so clearing and refilling the index every frame doesn't allocate any memory
+
+    # Size of each cell, in tiles
+    CELL_TILES = 4
+
+    # Number of cells across and down the grid, before it repeats
+    GRID_SIZE = 16
+
+    # Value used to mark the end of a bucket's list
+    EMPTY = -1
+
+    def __init__(self, capacity):
+        # The first object in each cell's bucket
+        self.first = array("h", [SpatialIndex.EMPTY] * (SpatialIndex.GRID_SIZE * SpatialIndex.GRID_SIZE))
+
+        # For each object, the next object in the same bucket, and the cell it is in
+        self.next = array("h", [SpatialIndex.EMPTY] * capacity)
+        self.cells = array("h", [0] * capacity)
+
+        self.count = 0
+
+    def clear(self):
+        # Only the buckets which have something in them need to be emptied
+        for i in range(self.count):
+            self.first[self.cells[i]] = SpatialIndex.EMPTY
+
+        self.count = 0
+
+    @staticmethod
+    def cell_of(position):
+        # Get the column (or row) of the grid which an x (or y) position is in
+        # Python's % always gives a positive result, so positions just off the top or left of the level are in the last column (or row),
+        # which is next to the first one, since the grid repeats
+        return int(position // (Constants.SPRITE_SIZE * SpatialIndex.CELL_TILES)) % SpatialIndex.GRID_SIZE
+
+    def insert(self, x, y):
+        # Add an object whose top left corner is at (x, y), and return its number
+        cell = SpatialIndex.cell_of(y) * SpatialIndex.GRID_SIZE + SpatialIndex.cell_of(x)
+
+        number = self.count
+
+        # Add the object to the start of the bucket's list
+        self.next[number] = self.first[cell]
+        self.first[cell] = number
+        self.cells[number] = cell
+
+        self.count += 1
+
+        return number
+
+    def query(self, x, y, results):
+        # Find every object in the cell containing (x, y) and the eight cells around it
+        # The numbers of the objects are stored in results (which must be big enough to hold all of them), and the number found is returned
+        # Any two objects which are at most CELL_TILES tiles apart (such as overlapping sprites) will always be found
+        found = 0
+
+        cell_x = SpatialIndex.cell_of(x)
+        cell_y = SpatialIndex.cell_of(y)
+
+        for row in range(cell_y - 1, cell_y + 2):
+            # The grid repeats, so the rows and columns either side of the edge of the grid wrap around to the other side
+            row = row % SpatialIndex.GRID_SIZE
+
+            for column in range(cell_x - 1, cell_x + 2):
+                number = self.first[row * SpatialIndex.GRID_SIZE + column % SpatialIndex.GRID_SIZE]
+
+                while number != SpatialIndex.EMPTY:
+                    results[found] = number
+                    found += 1
+
+                    number = self.next[number]
+
+        return found
@@ -0,0 +1,118 @@
+# Shared set-up for the tests
+#
+# The tests run the PicoSystem MicroPython version of episode 5 using the headless stand-in for the picosystem module (tools/host),
+# and load the tools (which have dashes in their names, so can't simply be imported) from the tools folder.
+#
+# Run them from this folder's parent with `python -m pytest tests`
+
+import importlib.util
+import pathlib
+import random
+import re
+import runpy
+import sys
+import types
+
+import pytest
+
+NINJA_THIEF_PATH = pathlib.Path(__file__).resolve().parent.parent
+TOOLS_PATH = NINJA_THIEF_PATH / "tools"
+GAME_PATH = NINJA_THIEF_PATH / "episode-5" / "picosystem-micropython"
+
+sys.path.insert(0, str(TOOLS_PATH / "host"))
+
+import picosystem
+
+picosystem.install_clock()
+
+# Names of the game's modules, which are removed from sys.modules whenever the game is loaded again with different constants
+GAME_MODULES = [path.stem for path in GAME_PATH.glob("*.py")]
+
+
+def make_paged_map(path, width, height, positions):
+    # Write a paged map of width x height tiles which is empty, apart from a copy of the first level at each of the given (x, y) tile positions
+    pack_levels = load_tool("pack-levels")
+
+    level = runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"][0]
+    size = pack_levels.DEFAULT_WIDTH
+
+    layers = [[pack_levels.BLANK_TILE] * (width * height) for layer in level]
+
+    for left, top in positions:
+        for layer, tiles in zip(layers, level):
+            for y in range(size):
+                layer[(top + y) * width + left:(top + y) * width + left + size] = tiles[y * size:(y + 1) * size]
+
+    path.write_bytes(pack_levels.pack_map(layers, width, height, pack_levels.DEFAULT_CHUNK_SHIFT))
+
+    return str(path)
+
+
+def load_tool(name):
+    # Load one of the scripts in the tools folder as a module, without running its main() function
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), TOOLS_PATH / (name + ".py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+@pytest.fixture
+def load_game(monkeypatch):
+    # Return a function which imports the game's modules with some of the settings in constants.py changed, for example
+    # load_game(FIXED_POINT=True, **{"Enemy.USE_POOL": True})
+    #
+    # Top-level settings are changed in the source before it is run, so that the constants which are worked out from them
+    # (such as SPEED_SCALE and TIMESTEP) change too. Settings inside a class are changed afterwards.
+    monkeypatch.chdir(GAME_PATH)
+    monkeypatch.syspath_prepend(str(GAME_PATH))
+
+    def load(**settings):
+        for name in GAME_MODULES:
+            sys.modules.pop(name, None)
+
+        source = (GAME_PATH / "constants.py").read_text()
+
+        for name, value in settings.items():
+            if "." not in name:
+                source, count = re.subn(r"^" + name + r" = .*$", name + " = " + repr(value), source, count=1, flags=re.MULTILINE)
+                assert count == 1, "No setting called " + name
+
+        constants = types.ModuleType("constants")
+        constants.__file__ = str(GAME_PATH / "constants.py")
+        exec(compile(source, constants.__file__, "exec"), constants.__dict__)
+
+        for name, value in settings.items():
+            if "." in name:
+                class_name, attribute = name.split(".")
+                assert hasattr(getattr(constants, class_name), attribute), "No setting called " + name
+
+                setattr(getattr(constants, class_name), attribute, value)
+
+        sys.modules["constants"] = constants
+
+        return constants
+
+    yield load
+
+    for name in GAME_MODULES:
+        sys.modules.pop(name, None)
+
+
+@pytest.fixture
+def run_game(load_game, monkeypatch):
+    # Return a function which runs the whole game (ninja_thief.py) for a number of frames, and returns the game's global variables
+    # The clock moves on by exactly frame_ms milliseconds each frame, and the random module is always seeded the same way,
+    # so running the game twice with the same settings and script (see ScriptedInput) gives exactly the same result
+    # If on_frame is given, it is called with the frame number after each frame has been drawn
+    def run(frames, frame_ms=20, script=(), on_frame=None, **settings):
+        load_game(**settings)
+
+        monkeypatch.setattr(picosystem, "_state", picosystem._State())
+        picosystem.configure(frames, frame_ms, picosystem.ScriptedInput.parse(script), on_frame)
+
+        random.seed(1)
+
+        return runpy.run_path(str(GAME_PATH / "ninja_thief.py"), run_name="__main__")
+
+    return run
@@ -0,0 +1,150 @@
+# With FIXED_POINT, Level.update() must not allocate any memory on the PicoSystem
+#
+# CPython can't measure this directly: it allocates whole numbers above 256 (MicroPython doesn't), and reuses freed floats and tuples
+# without allocating. Instead, every line of the game which runs during an update is checked for the things which allocate in MicroPython
+# (building tuples, lists, dicts and strings, slicing, creating functions or generators, and anything which could create a float).
+# Since the only numbers going in are whole numbers, whole number arithmetic can only produce whole numbers.
+# for loops don't allocate in MicroPython, since their iterators are kept on the stack.
+
+import dis
+import sys
+
+import pytest
+
+from conftest import GAME_PATH
+
+# Instructions which always allocate in MicroPython
+ALLOCATING = {
+    "BUILD_TUPLE", "BUILD_LIST", "BUILD_MAP", "BUILD_SET", "BUILD_CONST_KEY_MAP", "BUILD_STRING", "BUILD_SLICE",
+    "LIST_APPEND", "LIST_EXTEND", "SET_ADD", "SET_UPDATE", "MAP_ADD", "DICT_UPDATE", "DICT_MERGE",
+    "FORMAT_VALUE", "MAKE_FUNCTION", "CALL_FUNCTION_EX", "RETURN_GENERATOR",
+}
+
+# Operators which can turn whole numbers into a float
+FLOAT_OPERATORS = {"/", "/=", "**", "**="}
+
+
+def allocating_instructions(code, lines):
+    # Return a description of each instruction on the given lines of code which would allocate memory in MicroPython
+    found = []
+    line = None
+    instructions_by_line = {}
+
+    for instruction in dis.get_instructions(code):
+        if instruction.starts_line is not None:
+            line = instruction.starts_line
+
+        instructions_by_line.setdefault(line, []).append(instruction)
+
+    for line in lines:
+        for instruction in instructions_by_line.get(line, []):
+            if (instruction.opname in ALLOCATING or
+                    (instruction.opname == "BINARY_OP" and instruction.argrepr in FLOAT_OPERATORS) or
+                    (instruction.opname == "LOAD_CONST" and isinstance(instruction.argval, float))):
+                found.append(f"{code.co_filename}:{line} ({code.co_name}): {instruction.opname} {instruction.argrepr}")
+
+    return found
+
+
+def lines_run(function, *args):
+    # Call the function, and return the lines of the game which were run, as a dictionary of code objects to sets of line numbers
+    lines = {}
+    game_path = str(GAME_PATH)
+
+    def trace(frame, event, arg):
+        if not frame.f_code.co_filename.startswith(game_path):
+            return None
+
+        if event == "line":
+            lines.setdefault(frame.f_code, set()).add(frame.f_lineno)
+
+        return trace
+
+    sys.settrace(trace)
+
+    try:
+        function(*args)
+
+    finally:
+        sys.settrace(None)
+
+    return lines
+
+
+def slot_names(thing):
+    # The attributes of an object with __slots__, including those declared by its base classes
+    return [name for cls in type(thing).__mro__ for name in getattr(cls, "__slots__", ())]
+
+
+def numbers_in(level):
+    # Every number in the state of the level and its ninjas, which must all be whole numbers
+    objects = [level, level.player, level.level_data] + level.enemies
+    numbers = []
+
+    for thing in objects:
+        names = vars(thing) if hasattr(thing, "__dict__") else slot_names(thing)
+
+        for name in names:
+            value = getattr(thing, name, None)
+
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                numbers.append((type(thing).__name__ + "." + name, value))
+
+    if level.enemy_pool is not None:
+        for name in ("position_x", "position_y", "velocity_x", "velocity_y"):
+            numbers += [("EnemyPool." + name, value) for value in getattr(level.enemy_pool, name)]
+
+    return numbers
+
+
+@pytest.mark.parametrize("settings", [{}, {"Enemy.USE_POOL": True}, {"SWEPT_COLLISIONS": True}, {"USE_SPATIAL_INDEX": True},
+                                      {"Enemy.USE_NAV_MAP": True}, {"Enemy.CHASE_LEVELS": {0}}],
+                         ids=["default", "pool", "swept", "spatial-index", "nav-map", "chasing"])
+def test_fixed_point_update_does_not_allocate(load_game, settings):
+    constants = load_game(FIXED_POINT=True, **settings)
+
+    from controls import Controls
+    from level import Level
+
+    level = Level(0, None, Controls())
+
+    # Let the level settle into the state it will usually be in (with every ninja moving, and the enemies' first decisions made)
+    for step in range(100):
+        level.update(constants.TIMESTEP)
+
+    lines = lines_run(level.update, constants.TIMESTEP)
+
+    found = []
+    for code, code_lines in lines.items():
+        found += allocating_instructions(code, code_lines)
+
+    assert found == []
+
+    # Everything the update works with is still a whole number, so no floats can have been created
+    floats = [(name, value) for name, value in numbers_in(level) if isinstance(value, float)]
+    assert floats == []
+
+
+def test_float_update_is_caught(load_game):
+    # Without FIXED_POINT, the ninjas' positions are floats, so the check above would fail
+    constants = load_game()
+
+    from controls import Controls
+    from level import Level
+
+    level = Level(0, None, Controls())
+    level.update(constants.TIMESTEP)
+
+    assert any(isinstance(value, float) for name, value in numbers_in(level))
+
+
+def test_allocating_code_is_found(load_game):
+    # Creating a level builds lists and objects, which the check must notice
+    load_game(FIXED_POINT=True)
+
+    from controls import Controls
+    from level import Level
+
+    lines = lines_run(Level, 0, None, Controls())
+
+    assert any(allocating_instructions(code, code_lines) for code, code_lines in lines.items())
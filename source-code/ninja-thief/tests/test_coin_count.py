@@ -0,0 +1,41 @@
+# The number of coins left is kept up to date as coins are collected, and must always match counting the coins in the level
+
+import runpy
+
+import pytest
+
+from conftest import GAME_PATH
+
+LEVEL_COUNT = len(runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"])
+
+
+@pytest.mark.parametrize("level_number", range(LEVEL_COUNT))
+def test_coins_left_matches_counting_the_coins(load_game, level_number):
+    constants = load_game()
+
+    from controls import Controls
+    from level import Level
+
+    level = Level(level_number, None, Controls())
+    level_data = level.level_data
+    width = level_data.width_tiles
+
+    assert level.coins_left() == level_data.count_coins() > 0
+
+    # Collect every coin and gem, in order
+    collectables = [i for i, tile_id in enumerate(level_data.extras) if tile_id in (constants.Sprites.COIN, constants.Sprites.GEM)]
+
+    for index in collectables:
+        level.player.position_x = (index % width) * constants.SPRITE_SIZE
+        level.player.position_y = (index // width) * constants.SPRITE_SIZE
+        level.player.handle_scoring(level_data, index % width, index // width)
+
+        assert level_data.extras[index] == constants.Sprites.BLANK_TILE
+        assert level.coins_left() == level_data.count_coins()
+
+    assert level.coins_left() == 0
+
+    # With no coins left, the next update wins the level
+    level.update(constants.TIMESTEP)
+
+    assert level.level_state == Level.LevelState.PLAYER_WON
@@ -0,0 +1,49 @@
+# Input recorded by InputRecorder must be played back by InputPlayer exactly as it was recorded
+
+import random
+
+FRAMES = 1000
+
+
+def test_recording_plays_back_exactly(load_game, monkeypatch, tmp_path):
+    # A small buffer, so that it fills up (and is written to the file) several times during the recording
+    load_game(INPUT_LOG_BUFFER_RUNS=4)
+
+    import controls
+    from controls import InputRecorder, InputPlayer
+
+    # Random buttons, which change every few frames
+    rng = random.Random(1)
+    buttons = [rng.getrandbits(8) for i in range(FRAMES // 7 + 1)]
+
+    monkeypatch.setattr(controls, "button", lambda b: buttons[frame // 10] & controls.Controls.BITS[b] != 0)
+    monkeypatch.setattr(controls, "pressed", lambda b: buttons[frame // 7] & controls.Controls.BITS[b] != 0)
+
+    path = str(tmp_path / "input.log")
+    recorder = InputRecorder(path)
+    recorded = []
+
+    for frame in range(FRAMES):
+        dt = recorder.poll(rng.choice((16, 17, 33, 300)))
+        recorded.append((recorder.held, recorder.just_pressed, dt))
+
+    # Nothing after the last flush() is in the file until the recorder is closed
+    recorder.close()
+
+    player = InputPlayer(path)
+    assert player.random_seed == recorder.random_seed
+
+    played = []
+
+    for frame in range(FRAMES):
+        dt = player.poll(0)
+        played.append((player.held, player.just_pressed, dt))
+
+    assert played == recorded
+    assert not player.finished
+
+    # Once the recording runs out, the real buttons are used again
+    player.poll(0)
+
+    assert player.finished
+    assert player.frames == FRAMES
@@ -0,0 +1,222 @@
+# Images written by tools/convert-assets.py must load back into the same pixels using the game's image_loader.py
+
+import io
+
+import numpy
+import pytest
+from PIL import Image
+
+from conftest import load_tool
+
+convert_assets = load_tool("convert-assets")
+
+# Small bands, so that every image is converted in more than one band
+BAND_HEIGHT = 8
+
+
+@pytest.fixture
+def image_loader(load_game):
+    load_game()
+
+    import image_loader
+
+    return image_loader
+
+
+def make_image(values):
+    # Make an RGBA image from a 2D array of ARGB4444 values
+    values = numpy.asarray(values, dtype=numpy.uint32)
+    channels = [(values >> shift) & 0xf for shift in (8, 4, 0, 12)]
+
+    return Image.fromarray((numpy.stack(channels, axis=-1) * 0x11).astype(numpy.uint8), "RGBA")
+
+
+def convert(image, tmp_path, image_format):
+    path = tmp_path / ("image" + convert_assets.FORMATS[image_format])
+
+    with open(path, "wb") as f:
+        convert_assets.write_image_data(image, f, BAND_HEIGHT, image_format)
+
+    return path
+
+
+def test_indexed_image_with_few_colours_is_exact(image_loader, tmp_path):
+    # 16 colours, including transparent, in an image with an odd width (so each row of the indexed4 file is padded)
+    colors = [0x0000] + [0xf000 | i * 0x111 for i in range(15)]
+    values = numpy.array(colors)[numpy.arange(13 * 11).reshape(11, 13) % 16]
+    image = make_image(values)
+
+    for image_format in ("indexed4", "indexed8"):
+        buffer = image_loader.load_image(str(convert(image, tmp_path, image_format)), 13, 11)
+
+        assert bytes(buffer) == convert_assets.image_to_data(image), image_format
+
+
+def test_median_cut_palette_covers_rare_colours(image_loader, tmp_path):
+    # 16 different colours, each with 4 slightly different shades of blue, where the first colours are used far more than the rest
+    # Keeping the 16 most common shades would leave out most of the colours completely
+    bases = [0xf000 | r << 8 | g << 4 | b for r in (0, 5, 10, 15) for g in (0, 15) for b in (0, 12)]
+    rows = []
+
+    for number, base in enumerate(bases):
+        for shade in range(4):
+            rows += [[base + shade] * 16] * (16 - number)
+
+    image = make_image(rows)
+    h = len(rows)
+
+    buffer = image_loader.load_image(str(convert(image, tmp_path, "indexed4")), 16, h)
+
+    loaded = convert_assets.color_channels(numpy.frombuffer(bytes(buffer), dtype=">u2"))
+    original = convert_assets.color_channels(numpy.frombuffer(convert_assets.image_to_data(image), dtype=">u2"))
+
+    # On average, each pixel is drawn using a colour about one shade away from its own
+    # (keeping the 16 most common colours instead gives an average difference of more than 40)
+    assert ((loaded - original) ** 2).sum(axis=-1).mean() < 4
+
+
+def test_rgb332_colours_round_trip(image_loader, tmp_path):
+    # Every one of the 256 RGB332 colours, as the loader expands it, in an image with an odd size
+    table = image_loader.rgb332_table()
+    colors = [table[i * 2] << 8 | table[i * 2 + 1] for i in range(256)]
+    values = numpy.array(colors)[numpy.arange(17 * 19).reshape(19, 17) % 256]
+    image = make_image(values)
+
+    buffer = image_loader.load_image(str(convert(image, tmp_path, "rgb332")), 17, 19)
+
+    assert bytes(buffer) == convert_assets.image_to_data(image)
+
+
+def test_rgb332_keeps_the_top_bits_of_each_channel(image_loader, tmp_path):
+    # Any colour is loaded as a fully opaque colour, with each channel as close as RGB332 can get to it
+    rng = numpy.random.default_rng(1)
+    image = make_image(rng.integers(0, 0x10000, (13, 11)))
+
+    buffer = image_loader.load_image(str(convert(image, tmp_path, "rgb332")), 11, 13)
+
+    loaded = numpy.frombuffer(bytes(buffer), dtype=">u2").astype(numpy.int32)
+    original = numpy.frombuffer(convert_assets.image_to_data(image), dtype=">u2").astype(numpy.int32)
+
+    assert (loaded >> 12 == 0xf).all()
+
+    # Red and green keep 3 bits and blue keeps 2, and the missing bits are filled in by repeating the top ones
+    for shift, kept in ((8, 3), (4, 3), (0, 2)):
+        difference = ((loaded >> shift) & 0xf) - ((original >> shift) & 0xf)
+
+        assert (abs(difference) < 1 << (4 - kept)).all()
+
+
+# The rle and tiles containers are expanded by the loader's own expand_rle() and expand_tiles(), which write into a preallocated buffer
+
+def compress(image, compression):
+    f = io.BytesIO()
+    convert_assets.write_compressed_data(image, f, BAND_HEIGHT, compression)
+
+    return f.getvalue()
+
+
+def expand(image_loader, data, compression, w, h):
+    pixels = bytearray(w * h * 2)
+
+    if compression == "rle":
+        image_loader.expand_rle(memoryview(pixels), memoryview(data))
+    else:
+        image_loader.expand_tiles(memoryview(pixels), memoryview(data), w, h)
+
+    return bytes(pixels)
+
+
+def check_round_trip(image_loader, values, compression):
+    # Compress the image, then check that both the loader and the converter's own decoder give back exactly the same bytes
+    image = make_image(values)
+    w, h = image.size
+
+    data = compress(image, compression)
+    original = convert_assets.image_to_data(image)
+
+    assert expand(image_loader, data, compression, w, h) == original
+    assert (convert_assets.rle_decode(data) if compression == "rle" else convert_assets.tiles_decode(data)) == original
+
+    return data
+
+
+def random_image(seed, w, h, color_count):
+    # Random pixels from a few colours, so that there are runs of many different lengths
+    rng = numpy.random.default_rng(seed)
+    colors = rng.integers(0, 0x10000, color_count)
+
+    return colors[rng.integers(0, color_count, (h, w))]
+
+
+def runs(*lengths):
+    # A row made of runs of the given lengths, each a different colour from the one before
+    return numpy.concatenate([numpy.full(length, 0xf000 + number) for number, length in enumerate(lengths)])
+
+
+@pytest.mark.parametrize("compression", ["rle", "tiles"])
+@pytest.mark.parametrize("seed", range(5))
+def test_random_images_round_trip(image_loader, compression, seed):
+    check_round_trip(image_loader, random_image(seed, 40, 32, 3), compression)
+
+
+@pytest.mark.parametrize("w", [1, 127, 128, 129, 256, 257, 300])
+def test_rle_single_colour_rows(image_loader, w):
+    # Every row is one colour, so each row is stored as runs of at most RLE_MAX_CHUNK pixels
+    values = numpy.repeat(numpy.array([0x0000, 0xffff, 0xf123])[:, None], w, axis=1)
+
+    data = check_round_trip(image_loader, values, "rle")
+
+    runs_per_row = -(-w // convert_assets.RLE_MAX_CHUNK)
+    assert len(data) == 6 + 3 * 3 * runs_per_row
+
+
+def test_rle_runs_longer_than_a_chunk(image_loader):
+    row = runs(1, 2, 128, 1, 129, 256, 257, 1, 1, 3)
+
+    check_round_trip(image_loader, [row, row[::-1]], "rle")
+
+
+def test_rle_literals_longer_than_a_chunk(image_loader):
+    # No two pixels next to each other are the same, so each row is stored as literal chunks of at most RLE_MAX_CHUNK pixels
+    row = 0xf000 + numpy.arange(300)
+
+    check_round_trip(image_loader, [row, row[::-1], numpy.concatenate((row[:129], runs(41), row[:130]))], "rle")
+
+
+@pytest.mark.parametrize("w, h", [(8, 8), (1, 1), (13, 11), (16, 3), (5, 24), (41, 17)])
+def test_tiles_any_size(image_loader, w, h):
+    # Tiles on the right and bottom edges are padded when the size isn't a multiple of 8
+    data = check_round_trip(image_loader, random_image(w * h, w, h, 200), "tiles")
+
+    tiles_x = -(-w // convert_assets.TILE_SIZE)
+    tiles_y = -(-h // convert_assets.TILE_SIZE)
+    tile_count = data[6] << 8 | data[7]
+
+    assert len(data) == 8 + tile_count * convert_assets.TILE_SIZE ** 2 * 2 + tiles_x * tiles_y * 2
+
+
+def test_repeated_tiles_are_stored_once(image_loader):
+    # A checkerboard of two different tiles, 5 tiles wide and 4 high
+    tile = random_image(1, 8, 8, 4)
+    other = tile[::-1]
+    row = numpy.concatenate([tile, other, tile, other, tile], axis=1)
+    next_row = numpy.concatenate([other, tile, other, tile, other], axis=1)
+    values = numpy.concatenate([row, next_row, row, next_row])
+
+    data = check_round_trip(image_loader, values, "tiles")
+
+    assert data[6] << 8 | data[7] == 2
+
+
+@pytest.mark.parametrize("compression", ["rle", "tiles"])
+def test_compressed_files_load_into_a_buffer(image_loader, tmp_path, compression):
+    image = make_image(random_image(2, 21, 19, 4))
+    path = tmp_path / ("image.16bpp" + convert_assets.COMPRESSIONS[compression])
+    path.write_bytes(compress(image, compression))
+
+    buffer = image_loader.load_image(str(path), 21, 19)
+
+    assert bytes(buffer) == convert_assets.image_to_data(image)
+
+    with pytest.raises(ValueError):
+        image_loader.load_image(str(path), 19, 21)
@@ -0,0 +1,52 @@
+# With DIRTY_RECTANGLES, only the parts of the screen which have changed are drawn again,
+# so every frame must come out exactly the same as drawing the whole screen again each frame
+
+import sys
+
+import pytest
+
+import picosystem
+
+# Jump up to collect the coins above the player, jump onto the platform to the right and climb the ladder, where an enemy
+# kills the player, then walk left into the water after the level restarts (so the coins are put back)
+SCRIPT = ["5 A", "6", "46 RIGHT", "54 RIGHT A", "55 RIGHT", "95 UP", "155 LEFT", "185 DOWN", "225 LEFT"]
+FRAMES = 250
+
+
+def run(run_game, monkeypatch, **settings):
+    screens = []
+    events = []
+
+    def on_frame(frame):
+        if frame == 0:
+            # The game's modules have been loaded by now, so collected coins and restarts can be counted
+            level_class = sys.modules["level"].Level
+            level_data_class = sys.modules["constants"].LevelData
+
+            restart = level_class.restart
+            remove_extra = level_data_class.remove_extra
+
+            monkeypatch.setattr(level_class, "restart", lambda self: (events.append("restart"), restart(self)))
+            monkeypatch.setattr(level_data_class, "remove_extra", lambda self, i: (events.append("collect"), remove_extra(self, i)))
+
+        screens.append(picosystem.screen().pixels.copy())
+
+    run_game(FRAMES, script=SCRIPT, on_frame=on_frame, **settings)
+
+    return screens, events
+
+
+@pytest.mark.parametrize("settings", [{}, {"FIXED_TIMESTEP": True}], ids=["variable-timestep", "fixed-timestep"])
+def test_dirty_rectangles_match_full_redraws(run_game, monkeypatch, settings):
+    full_screens, full_events = run(run_game, monkeypatch, **settings)
+    dirty_screens, dirty_events = run(run_game, monkeypatch, PREBAKE_STATIC_TILES=True, DIRTY_RECTANGLES=True, **settings)
+
+    # The script must have collected some coins before the level restarted, and carried on after it
+    assert dirty_events == full_events
+    assert "collect" in full_events and "restart" in full_events
+    assert full_events.index("collect") < full_events.index("restart")
+
+    assert len(dirty_screens) == len(full_screens) == FRAMES
+
+    for frame in range(FRAMES):
+        assert (dirty_screens[frame] == full_screens[frame]).all(), frame
@@ -0,0 +1,61 @@
+# The EnemyPool must move the enemies in exactly the same way as separate EnemyNinja objects
+
+import random
+
+import pytest
+
+# Buttons held by the player, each for STEPS_PER_INPUT steps, so that the enemies have someone to chase (and to catch)
+INPUTS = ("RIGHT", "RIGHT A", "LEFT", "UP", "LEFT A", "", "DOWN", "RIGHT")
+STEPS_PER_INPUT = 40
+
+STEPS = 2000
+
+
+def enemy_states(level):
+    pool = level.enemy_pool
+
+    if pool is not None:
+        return [(pool.position_x[i], pool.position_y[i], pool.velocity_x[i], pool.velocity_y[i], pool.climbing_state[i]) for i in range(pool.count)]
+
+    return [(enemy.position_x, enemy.position_y, enemy.velocity_x, enemy.velocity_y, enemy.climbing_state) for enemy in level.enemies]
+
+
+def run_level(load_game, level_number, use_pool, **settings):
+    # Play the level, and return the state of every enemy after each step
+    constants = load_game(**settings, **{"Enemy.USE_POOL": use_pool})
+
+    import picosystem
+    from controls import Controls
+    from level import Level
+
+    controls = Controls()
+
+    random.seed(level_number)
+    level = Level(level_number, None, controls)
+
+    states = []
+
+    for step in range(STEPS):
+        controls.held = 0
+
+        for name in INPUTS[(step // STEPS_PER_INPUT) % len(INPUTS)].split():
+            controls.held |= Controls.BITS[picosystem.BUTTON_NAMES[name]]
+
+        level.update(constants.TIMESTEP)
+
+        if level.level_failed():
+            level.restart()
+
+        states.append(enemy_states(level))
+
+    return states
+
+
+@pytest.mark.parametrize("level_number", [0, 1, 2])
+@pytest.mark.parametrize("settings", [{}, {"FIXED_POINT": True}, {"Enemy.CHASE_LEVELS": {0, 1, 2}}], ids=["float", "fixed-point", "chasing"])
+def test_pool_matches_enemy_ninjas(load_game, level_number, settings):
+    objects = run_level(load_game, level_number, False, **settings)
+    pool = run_level(load_game, level_number, True, **settings)
+
+    for step in range(STEPS):
+        assert pool[step] == objects[step], "Enemies differ after step " + str(step)
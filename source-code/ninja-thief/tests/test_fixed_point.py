@@ -0,0 +1,78 @@
+# With FIXED_POINT, the player must move the same way as with floats, to within a pixel
+# (speeds are rounded to 1/FIXED_POINT_ONE of a pixel per update, so it can't be exactly the same)
+
+import pytest
+
+# Jump on the spot, jump up onto the platform to the right, climb the ladder, walk off the platform and fall into the water
+SCRIPT = [""] * 5 + ["A"] + [""] * 40 + ["RIGHT"] * 8 + ["RIGHT A"] + ["RIGHT"] * 40 + ["UP"] * 60 + ["LEFT"] * 30 + ["DOWN"] * 40 + ["LEFT"] * 100
+
+
+def run(load_game, **settings):
+    constants = load_game(**settings)
+
+    import picosystem
+    from controls import Controls
+    from level import Level
+
+    controls = Controls()
+    level = Level(0, None, controls)
+
+    # The enemies are left out, because which way they go at a ladder depends on exactly which pixel they are at
+    level.enemies = []
+
+    one = constants.FIXED_POINT_ONE if constants.FIXED_POINT else 1
+    path = []
+    previous = 0
+
+    for line in SCRIPT:
+        held = 0
+        for name in line.split():
+            held |= Controls.BITS[getattr(picosystem, name)]
+
+        controls.held = held
+        controls.just_pressed = held & ~previous
+        previous = held
+
+        level.update(constants.TIMESTEP)
+
+        player = level.player
+        path.append((player.position_x + player.remainder_x / one, player.position_y + player.remainder_y / one))
+
+    return path, player.get_score(), level.level_state
+
+
+def test_fixed_point_follows_the_float_path(load_game):
+    float_path, float_score, float_state = run(load_game)
+    fixed_path, fixed_score, fixed_state = run(load_game, FIXED_POINT=True)
+
+    # The script must actually have collected some coins, for the scores to mean anything
+    assert fixed_score == float_score > 0
+    assert fixed_state == float_state
+
+    for step in range(len(SCRIPT)):
+        assert abs(fixed_path[step][0] - float_path[step][0]) <= 1, step
+        assert abs(fixed_path[step][1] - float_path[step][1]) <= 1, step
+
+
+@pytest.mark.parametrize("settings", [{}, {"FIXED_POINT": True}], ids=["float", "fixed-point"])
+def test_standing_player_can_always_jump(load_game, settings):
+    constants = load_game(**settings)
+
+    from controls import Controls
+    from level import Level
+
+    level = Level(0, None, Controls())
+    level.enemies = []
+
+    # Let the player land at its spawn position first
+    for step in range(10):
+        level.update(constants.TIMESTEP)
+
+    position = (level.player.position_x, level.player.position_y)
+
+    # Standing still on a platform, the player must stay on top of it and be able to jump after every update
+    for step in range(50):
+        level.update(constants.TIMESTEP)
+
+        assert level.player.can_jump, step
+        assert (level.player.position_x, level.player.position_y) == position, step
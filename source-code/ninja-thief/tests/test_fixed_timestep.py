@@ -0,0 +1,69 @@
+# With FIXED_TIMESTEP, the game must behave exactly the same whatever the frame rate is,
+# the same as updating the level in steps of TIMESTEP directly, and draw the ninjas part of the way between steps
+
+import random
+
+import pytest
+
+SETTINGS = [{}, {"FIXED_POINT": True}]
+SETTINGS_IDS = ["float", "fixed-point"]
+
+# Length of each run, in milliseconds (a whole number of steps, and of frames at every frame rate tested)
+RUN_MS = 1200
+
+
+def snapshot(level):
+    ninjas = [level.player] + level.enemies
+
+    return [(ninja.position_x, ninja.position_y, ninja.velocity_x, ninja.velocity_y) for ninja in ninjas], level.player.get_score()
+
+
+@pytest.mark.parametrize("settings", SETTINGS, ids=SETTINGS_IDS)
+def test_frame_rate_does_not_change_the_game(run_game, load_game, settings):
+    results = []
+
+    for frame_ms in (10, 20, 40):
+        game = run_game(RUN_MS // frame_ms, frame_ms, FIXED_TIMESTEP=True, **settings)
+        level = game["level"]
+
+        assert level.level_state == level.LevelState.PLAYING
+        results.append(snapshot(level))
+
+    # Update a level directly, in the same number of steps
+    constants = load_game(FIXED_TIMESTEP=True, **settings)
+
+    from controls import Controls
+    from level import Level
+
+    random.seed(1)
+    level = Level(0, None, Controls())
+
+    # Each step is 20 milliseconds
+    for step in range(RUN_MS // 20):
+        level.update(constants.TIMESTEP)
+
+    assert results == [snapshot(level)] * 3
+
+
+@pytest.mark.parametrize("settings", SETTINGS, ids=SETTINGS_IDS)
+def test_ninjas_are_drawn_between_steps(run_game, monkeypatch, settings):
+    # 10ms frames are half a step, so after an odd number of frames the game is half way to the next step
+    game = run_game(RUN_MS // 10 + 1, 10, FIXED_TIMESTEP=True, **settings)
+    constants = game["Constants"]
+
+    half = constants.FIXED_POINT_ONE // 2 if constants.FIXED_POINT else 0.5
+    assert game["interpolation"] == half
+
+    import ninja
+
+    drawn = []
+    monkeypatch.setattr(ninja, "sprite", lambda index, x, y, *args: drawn.append((x, y)))
+
+    player = game["level"].player
+    player.previous_x, player.previous_y = 10, 20
+    player.position_x, player.position_y = 14, 30
+
+    player.render(half)
+    player.render(constants.NO_INTERPOLATION)
+
+    assert drawn == [(12 + constants.GAME_OFFSET_X, 25 + constants.GAME_OFFSET_Y), (14 + constants.GAME_OFFSET_X, 30 + constants.GAME_OFFSET_Y)]
@@ -0,0 +1,73 @@
+# With CACHE_HUD_TEXT, the level number and score are drawn into buffers and copied onto the screen,
+# which must look exactly the same as drawing the text straight onto the screen each frame
+
+import numpy
+import pytest
+
+import picosystem
+
+from test_dirty_rectangles import FRAMES, SCRIPT
+
+
+def distinct_text(message, x, y):
+    # The headless text() draws every character as the same solid block, so a score of 2 would look the same as a score of 7
+    # Instead, the height of each block depends on the character, so that drawing out-of-date text shows up
+    for i, character in enumerate(message):
+        if character != " ":
+            picosystem.frect(x + i * picosystem.GLYPH_ADVANCE, y, picosystem.GLYPH_WIDTH, 1 + ord(character) % picosystem.GLYPH_HEIGHT)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    # The game modules are loaded by each test, after text() has been replaced, so they use the replacement
+    monkeypatch.setattr(picosystem, "_state", picosystem._State())
+    monkeypatch.setattr(picosystem, "text", distinct_text)
+
+
+def patterned_screen():
+    # Fill the screen with a different colour in each pixel, so that any pixel the text buffers shouldn't cover shows up
+    pixels = picosystem.screen().pixels
+    pixels[:, :] = numpy.arange(pixels.size, dtype=numpy.uint16).reshape(pixels.shape) | 0xf000
+
+
+@pytest.mark.parametrize("level_number", [0, 9, 99])
+def test_hud_matches_drawing_the_text(load_game, level_number):
+    constants = load_game(CACHE_HUD_TEXT=True)
+
+    from hud import Hud
+
+    hud = Hud(level_number)
+
+    # The score goes up (getting longer), and goes back to 0 when the level restarts
+    for score in (0, 5, 7, 10, 250, 99999, 0):
+        patterned_screen()
+        hud.render(score)
+        cached = picosystem.screen().pixels.copy()
+
+        # Draw the text the way Level.render_ui() does without CACHE_HUD_TEXT
+        patterned_screen()
+        picosystem.pen(15, 15, 15)
+        picosystem.text("Level: " + str(level_number + 1), 2, 2)
+
+        score_string = "Score: " + str(score)
+        w, h = picosystem.measure(score_string)
+        picosystem.text(score_string, constants.SCREEN_WIDTH - 2 - w, 2)
+
+        assert (cached == picosystem.screen().pixels).all(), score
+
+
+@pytest.mark.parametrize("settings", [{}, {"PREBAKE_STATIC_TILES": True, "DIRTY_RECTANGLES": True}], ids=["full-redraw", "dirty-rectangles"])
+def test_cached_hud_matches_drawing_the_text_every_frame(run_game, settings):
+    def capture(screens):
+        return lambda frame: screens.append(picosystem.screen().pixels.copy())
+
+    text_screens = []
+    run_game(FRAMES, script=SCRIPT, on_frame=capture(text_screens), **settings)
+
+    cached_screens = []
+    game = run_game(FRAMES, script=SCRIPT, on_frame=capture(cached_screens), CACHE_HUD_TEXT=True, **settings)
+
+    assert game["level"].hud is not None
+
+    for frame in range(FRAMES):
+        assert (cached_screens[frame] == text_screens[frame]).all(), frame
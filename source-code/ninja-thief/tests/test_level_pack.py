@@ -0,0 +1,53 @@
+# The number of levels comes from the level pack's header, rather than a constant which has to be kept up to date,
+# and the tools refuse to write anything which doesn't fit in a header
+
+import runpy
+
+import pytest
+
+from conftest import GAME_PATH, load_tool
+
+pack_levels = load_tool("pack-levels")
+
+
+def test_level_count_matches_the_levels_file(load_game):
+    constants = load_game()
+    levels = runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"]
+
+    assert constants.LevelData.level_count() == len(levels)
+
+    with pytest.raises(IndexError):
+        constants.LevelData.load(len(levels))
+
+
+def test_level_count_of_a_new_pack(load_game, tmp_path):
+    constants = load_game()
+    levels = runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"]
+
+    path = tmp_path / "levels.bin"
+    path.write_bytes(pack_levels.pack_levels(levels[:2], constants.GAME_WIDTH_TILES, constants.GAME_HEIGHT_TILES))
+
+    assert constants.LevelData.level_count(str(path)) == 2
+
+
+@pytest.mark.parametrize("width, height", [(0, 15), (15, 0), (0x10000, 1), (1, 0x10000)])
+def test_map_size_must_fit_in_the_header(width, height):
+    level = [[pack_levels.BLANK_TILE] * (width * height)] * pack_levels.LAYER_COUNT
+
+    with pytest.raises(ValueError):
+        pack_levels.pack_map(level, width, height, pack_levels.DEFAULT_CHUNK_SHIFT)
+
+
+def test_map_coin_count_must_fit_in_the_header():
+    width = 0x10000 // 256
+    extras = [pack_levels.COIN_TILE] * (width * 256)
+    blank = [pack_levels.BLANK_TILE] * (width * 256)
+
+    with pytest.raises(ValueError):
+        pack_levels.pack_map([blank, extras, blank, blank], width, 256, pack_levels.DEFAULT_CHUNK_SHIFT)
+
+    # One fewer coin fits
+    extras[0] = pack_levels.BLANK_TILE
+    data = pack_levels.pack_map([blank, extras, blank, blank], width, 256, pack_levels.DEFAULT_CHUNK_SHIFT)
+
+    assert data[8:10] == bytes((0xff, 0xff))
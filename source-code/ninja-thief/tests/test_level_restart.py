@@ -0,0 +1,38 @@
+# Level.restart() resets the level data rather than loading it again, so it must put back every coin and gem the player collected
+
+def test_restart_puts_back_collected_coins_and_gems(load_game):
+    constants = load_game()
+
+    from controls import Controls
+    from level import Level
+
+    level = Level(0, None, Controls())
+    level_data = level.level_data
+    width = level_data.width_tiles
+
+    # The level exactly as it was loaded
+    original = constants.LevelData.load(0)
+    original.build_tile_flags()
+
+    coin = bytes(level_data.extras).index(constants.Sprites.COIN)
+    gem = bytes(level_data.extras).index(constants.Sprites.GEM)
+
+    # Move the player onto the coin and then the gem, so that it collects them
+    for index in (coin, gem):
+        level.player.position_x = (index % width) * constants.SPRITE_SIZE
+        level.player.position_y = (index // width) * constants.SPRITE_SIZE
+        level.player.handle_scoring(level_data, index % width, index // width)
+
+        assert level_data.extras[index] == constants.Sprites.BLANK_TILE
+        assert level_data.tile_flags[index] & constants.TileFlags.COLLECTABLE == 0
+
+    assert level.coins_left() == original.coins_remaining - 1
+
+    level.restart()
+
+    # The same level data is reused, and is back to how it was loaded
+    assert level.level_data is level_data
+    assert level_data.extras == original.extras
+    assert level_data.tile_flags == original.tile_flags
+    assert level.coins_left() == original.coins_remaining
+    assert level_data.collected_positions == []
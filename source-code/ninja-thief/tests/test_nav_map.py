@@ -0,0 +1,61 @@
+# The NavMap must give the same answers as the tile lookups it replaces, everywhere an enemy could be,
+# including the border of cells just outside the level
+
+import runpy
+
+import pytest
+
+from conftest import GAME_PATH
+
+LEVEL_COUNT = len(runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"])
+
+# Positions within each tile to check: the top left corner, the middle and the bottom right pixel
+OFFSETS = [0, 4, 7]
+
+
+def edge_level(constants):
+    # A level with ladders in front of platforms in its top and bottom rows and its left and right columns
+    width = constants.GAME_WIDTH_TILES
+    height = constants.GAME_HEIGHT_TILES
+    layers = [bytearray([constants.Sprites.BLANK_TILE] * (width * height)) for i in range(4)]
+
+    for x, y in ((0, 0), (width - 1, 0), (3, 0), (0, height - 1), (width - 1, height - 1), (5, height - 1), (0, 6), (width - 1, 7)):
+        layers[0][y * width + x] = 0
+        layers[1][y * width + x] = constants.Sprites.LADDER
+
+    return constants.LevelData(*layers)
+
+
+@pytest.mark.parametrize("level_number", list(range(LEVEL_COUNT)) + ["edges"])
+def test_nav_map_matches_tile_lookups(load_game, level_number):
+    constants = load_game()
+
+    from enemy_ninja import EnemyNinja
+    from nav_map import NavMap
+    from ninja import Ninja
+
+    level_data = edge_level(constants) if level_number == "edges" else constants.LevelData.load(level_number)
+    nav_map = NavMap(level_data)
+    size = constants.SPRITE_SIZE
+
+    # Every tile of the level, the border around it, and one more tile beyond the border
+    for tile_y in range(-2, level_data.height_tiles + 2):
+        for tile_x in range(-2, level_data.width_tiles + 2):
+            for offset_y in OFFSETS:
+                for offset_x in OFFSETS:
+                    x = tile_x * size + offset_x
+                    y = tile_y * size + offset_y
+                    flags = nav_map.flags_at(x, y)
+                    where = (level_number, x, y)
+
+                    platform = EnemyNinja.tile_at_position(level_data, level_data.platforms, x, y) != constants.Sprites.BLANK_TILE
+                    assert (flags & NavMap.Flags.PLATFORM != 0) == platform, where
+
+                    ladder_up = EnemyNinja.ladder_above_or_below_of(level_data, x, y, Ninja.VerticalDirection.UP)
+                    assert (flags & NavMap.Flags.LADDER_UP != 0) == ladder_up, where
+
+                    ladder_down = EnemyNinja.ladder_above_or_below_of(level_data, x, y, Ninja.VerticalDirection.DOWN)
+                    assert (flags & NavMap.Flags.LADDER_DOWN != 0) == ladder_down, where
+
+                    for direction in (-1, 1):
+                        assert nav_map.platform_ahead(x, y, direction) == EnemyNinja.platform_ahead_of(level_data, x, y, direction), where
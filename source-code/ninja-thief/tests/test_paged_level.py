@@ -0,0 +1,154 @@
+# A PagedLevelData must only keep MAP_CACHE_CHUNKS chunks in memory, and must remember which coins and gems have been collected
+# when their chunks are read from the file again
+
+import pytest
+
+from conftest import make_paged_map
+
+# 8 x 8 chunks of 8 x 8 tiles, with copies of the first level in the top left corner and near the bottom right corner
+MAP_SIZE = 64
+CACHE_CHUNKS = 4
+
+
+@pytest.fixture
+def paged(load_game, tmp_path):
+    path = make_paged_map(tmp_path / "level.map", MAP_SIZE, MAP_SIZE, [(0, 0), (40, 40)])
+    constants = load_game(MAP_CACHE_CHUNKS=CACHE_CHUNKS)
+
+    from paged_level import PagedLevelData
+
+    level_data = PagedLevelData(path)
+    yield constants, level_data
+
+    level_data.close()
+
+
+def read_everything(level_data):
+    # Read a tile from every chunk of the map, which replaces every chunk in the cache
+    for y in range(0, MAP_SIZE, 8):
+        for x in range(0, MAP_SIZE, 8):
+            level_data.tile_flags[y * MAP_SIZE + x]
+
+
+def loaded_chunks(cache):
+    from paged_level import ChunkCache
+
+    return [chunk for chunk in range(len(cache.chunk_slot)) if cache.chunk_slot[chunk] != ChunkCache.NOT_LOADED]
+
+
+def chunk_of(index):
+    return (index // MAP_SIZE >> 3) * (MAP_SIZE >> 3) + (index % MAP_SIZE >> 3)
+
+
+def first_extra(level_data, tile_id):
+    # Index of the first tile in the map with the given coin or gem
+    return next(index for index in range(len(level_data.extras)) if level_data.extras[index] == tile_id)
+
+
+def test_cache_keeps_at_most_map_cache_chunks(paged):
+    constants, level_data = paged
+    cache = level_data.cache
+
+    assert len(cache.slots) == CACHE_CHUNKS
+
+    read_everything(level_data)
+
+    # Every chunk was read, but only the last few are still in memory
+    assert cache.loads == cache.chunks_x * cache.chunks_y
+    assert len(loaded_chunks(cache)) == CACHE_CHUNKS
+
+    for chunk in loaded_chunks(cache):
+        assert cache.slot_chunk[cache.chunk_slot[chunk]] == chunk
+
+    # Every tile matches the level the map was made from, wherever it was read from
+    level = constants.LevelData.load(0)
+
+    for y in range(constants.GAME_HEIGHT_TILES):
+        for x in range(constants.GAME_WIDTH_TILES):
+            assert level_data.platforms[y * MAP_SIZE + x] == level.platforms[y * constants.GAME_WIDTH_TILES + x]
+            assert level_data.extras[(40 + y) * MAP_SIZE + 40 + x] == level.extras[y * constants.GAME_WIDTH_TILES + x]
+
+    assert len(loaded_chunks(cache)) == CACHE_CHUNKS
+
+
+def test_least_recently_used_chunk_is_replaced(paged):
+    constants, level_data = paged
+    cache = level_data.cache
+
+    # The first tile of each of the first CACHE_CHUNKS chunks along the top of the map
+    first_tiles = [chunk * 8 for chunk in range(CACHE_CHUNKS)]
+
+    for index in first_tiles:
+        level_data.platforms[index]
+
+    # Use the first chunk again, so that the second one is now the least recently used
+    level_data.platforms[first_tiles[0]]
+
+    level_data.platforms[CACHE_CHUNKS * 8]
+
+    assert loaded_chunks(cache) == [0, 2, 3, CACHE_CHUNKS]
+
+
+def test_collected_extras_stay_removed_when_read_again(paged):
+    constants, level_data = paged
+    cache = level_data.cache
+
+    coin = first_extra(level_data, constants.Sprites.COIN)
+    gem = first_extra(level_data, constants.Sprites.GEM)
+    coins = level_data.coins_remaining
+
+    level_data.remove_extra(coin)
+    level_data.remove_extra(gem)
+
+    assert level_data.coins_remaining == coins - 1
+
+    # Fill the cache with other chunks, so that the chunks with the collected coin and gem have to be read from the file again
+    read_everything(level_data)
+
+    assert chunk_of(coin) not in loaded_chunks(cache)
+    assert chunk_of(gem) not in loaded_chunks(cache)
+    loads = cache.loads
+
+    for index in (coin, gem):
+        assert level_data.extras[index] == constants.Sprites.BLANK_TILE
+        assert level_data.tile_flags[index] & constants.TileFlags.COLLECTABLE == 0
+
+    assert cache.loads > loads
+
+
+def test_reset_puts_back_collected_extras(paged):
+    constants, level_data = paged
+
+    coin = first_extra(level_data, constants.Sprites.COIN)
+    gem = first_extra(level_data, constants.Sprites.GEM)
+    coins = level_data.coins_remaining
+
+    level_data.remove_extra(coin)
+    level_data.remove_extra(gem)
+    read_everything(level_data)
+
+    level_data.reset()
+
+    assert level_data.extras[coin] == constants.Sprites.COIN
+    assert level_data.extras[gem] == constants.Sprites.GEM
+
+    for index in (coin, gem):
+        assert level_data.tile_flags[index] & constants.TileFlags.COLLECTABLE != 0
+
+    assert level_data.coins_remaining == coins
+    assert level_data.collected_positions == []
+
+
+def test_closing_a_level_closes_its_map_file(load_game, tmp_path):
+    path = make_paged_map(tmp_path / "level.map", MAP_SIZE, MAP_SIZE, [(0, 0)])
+    load_game(PAGED_LEVELS={0: path})
+
+    from controls import Controls
+    from level import Level
+
+    level = Level(0, None, Controls())
+    file = level.level_data.cache.file
+
+    level.close()
+
+    assert file.closed
@@ -0,0 +1,144 @@
+# The headless picosystem stand-in (tools/host/picosystem.py) must draw the same pixels as the PicoSystem would
+
+import numpy
+import pytest
+
+import picosystem
+
+RED = 0xff00
+GREEN = 0xf0f0
+BLUE = 0xf00f
+TRANSPARENT = 0x0000
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    # Every test starts with a blank screen, a black pen and COPY blending
+    monkeypatch.setattr(picosystem, "_state", picosystem._State())
+
+
+def filled_buffer(w, h, colour):
+    buffer = picosystem.Buffer(w, h)
+    buffer.pixels[:, :] = colour
+
+    return buffer
+
+
+def test_buffer_uses_big_endian_argb4444(tmp_path):
+    path = tmp_path / "image.16bpp"
+    path.write_bytes(bytes([0xf1, 0x23, 0x0a, 0xbc]))
+
+    buffer = picosystem.Buffer(2, 1, str(path))
+
+    assert buffer.pixels.tolist() == [[0xf123, 0x0abc]]
+    assert bytes(buffer) == bytes([0xf1, 0x23, 0x0a, 0xbc])
+
+
+def test_pen_and_clear():
+    picosystem.pen(15, 0, 0)
+    picosystem.clear()
+
+    assert (picosystem.screen().pixels == RED).all()
+
+
+def test_frect_is_clipped_to_the_screen():
+    picosystem.pen(0, 15, 0)
+    picosystem.frect(115, -2, 10, 4)
+
+    pixels = picosystem.screen().pixels
+
+    assert (pixels[0:2, 115:120] == GREEN).all()
+    assert numpy.count_nonzero(pixels) == 10
+
+
+def test_blit_copies_part_of_a_buffer():
+    source = picosystem.Buffer(4, 4)
+    source.pixels[:, :] = numpy.arange(16, dtype=numpy.uint16).reshape(4, 4) | 0xf000
+
+    picosystem.blit(source, 1, 1, 2, 2, 10, 20)
+
+    pixels = picosystem.screen().pixels
+
+    assert pixels[20:22, 10:12].tolist() == [[0xf005, 0xf006], [0xf009, 0xf00a]]
+    assert numpy.count_nonzero(pixels) == 4
+
+
+def test_blit_flips_and_is_clipped():
+    source = picosystem.Buffer(3, 1)
+    source.pixels[0, :] = (RED, GREEN, BLUE)
+
+    picosystem.blit(source, 0, 0, 3, 1, 0, 0, flags=picosystem.HFLIP)
+    picosystem.blit(source, 0, 0, 3, 1, -1, 5)
+
+    pixels = picosystem.screen().pixels
+
+    assert pixels[0, 0:3].tolist() == [BLUE, GREEN, RED]
+    assert pixels[5, 0:3].tolist() == [GREEN, BLUE, 0]
+
+
+def test_mask_blending_skips_transparent_pixels():
+    picosystem.pen(0, 0, 15)
+    picosystem.clear()
+
+    source = picosystem.Buffer(2, 1)
+    source.pixels[0, :] = (RED, TRANSPARENT)
+
+    picosystem.blend(picosystem.MASK)
+    picosystem.blit(source, 0, 0, 2, 1, 0, 0)
+
+    assert picosystem.screen().pixels[0, 0:2].tolist() == [RED, BLUE]
+
+
+def test_sprite_reads_the_right_tile_from_the_spritesheet():
+    # A spritesheet 2 sprites wide and 2 high, with a different colour in each sprite
+    sheet = picosystem.Buffer(16, 16)
+    sheet.pixels[0:8, 8:16] = RED
+    sheet.pixels[8:16, 0:8] = GREEN
+
+    picosystem.spritesheet(sheet)
+    picosystem.sprite(1, 0, 0)
+    picosystem.sprite(2, 50, 60)
+
+    pixels = picosystem.screen().pixels
+
+    assert (pixels[0:8, 0:8] == RED).all()
+    assert (pixels[60:68, 50:58] == GREEN).all()
+    assert numpy.count_nonzero(pixels) == 2 * 8 * 8
+
+
+def test_target_draws_into_a_buffer():
+    buffer = picosystem.Buffer(8, 8)
+
+    picosystem.target(buffer)
+    picosystem.pen(15, 0, 0)
+    picosystem.frect(0, 0, 20, 20)
+    picosystem.target()
+
+    assert (buffer.pixels == RED).all()
+    assert numpy.count_nonzero(picosystem.screen().pixels) == 0
+
+
+def test_text_draws_a_block_for_each_character():
+    picosystem.pen(15, 15, 15)
+    picosystem.text("A B", 10, 10)
+
+    pixels = picosystem.screen().pixels
+    advance = picosystem.GLYPH_ADVANCE
+
+    assert (pixels[10:10 + picosystem.GLYPH_HEIGHT, 10:10 + picosystem.GLYPH_WIDTH] == 0xffff).all()
+    assert (pixels[10:10 + picosystem.GLYPH_HEIGHT, 10 + advance:10 + 2 * advance] == 0).all()
+    assert (pixels[10:10 + picosystem.GLYPH_HEIGHT, 10 + 2 * advance:10 + 2 * advance + picosystem.GLYPH_WIDTH] == 0xffff).all()
+    assert numpy.count_nonzero(pixels) == 2 * picosystem.GLYPH_WIDTH * picosystem.GLYPH_HEIGHT
+
+    assert picosystem.measure("A B") == (3 * advance, picosystem.GLYPH_HEIGHT)
+
+
+def test_scripted_input_holds_buttons_until_the_next_line():
+    script = picosystem.ScriptedInput.parse(["0 RIGHT", "# comment", "2 right a", "3"])
+
+    masks = [script.poll(frame) for frame in range(5)]
+
+    right = 1 << picosystem.RIGHT
+    a = 1 << picosystem.A
+
+    assert masks == [right, right, right | a, 0, 0]
@@ -0,0 +1,110 @@
+# The RandomStream must give the same numbers every time for the same seed (so each level's enemies always behave the same way),
+# and fill() must give exactly the numbers that calling next() would
+
+import random
+
+from array import array
+
+import pytest
+
+SEEDS = [1, 2, 0x1234, 0xffff]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_same_seed_gives_same_numbers(load_game, seed):
+    load_game()
+
+    from random_stream import RandomStream
+
+    first = RandomStream(seed)
+    second = RandomStream(seed)
+
+    numbers = [first.next() for i in range(1000)]
+    assert numbers == [second.next() for i in range(1000)]
+
+    # Seeding again starts the same numbers again
+    first.seed(seed)
+    assert [first.next() for i in range(1000)] == numbers
+
+    # A different seed gives different numbers
+    assert [RandomStream(seed + 1).next() for i in range(1000)] != numbers
+
+
+def test_seed_is_never_zero(load_game):
+    load_game()
+
+    from random_stream import RandomStream
+
+    # Only the bottom 16 bits of the seed are used, and a state of 0 would only ever produce 0, so it is changed to 1
+    assert RandomStream(0).state == 1
+    assert RandomStream(0x10000).state == 1
+    assert RandomStream(0x12345).state == 0x2345
+
+    assert RandomStream(0).next() == RandomStream(1).next() != 0
+
+
+def test_every_number_comes_up_once_before_repeating(load_game):
+    load_game()
+
+    from random_stream import RandomStream
+
+    stream = RandomStream(1)
+    numbers = [stream.next() for i in range(0xffff)]
+
+    assert sorted(numbers) == list(range(1, 0x10000))
+    assert stream.next() == numbers[0]
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_fill_matches_next(load_game, seed):
+    load_game()
+
+    from random_stream import RandomStream
+
+    filled = RandomStream(seed)
+    called = RandomStream(seed)
+
+    # Fill the same array several times, the way the level does each update
+    values = array("H", [0] * 7)
+
+    for i in range(50):
+        filled.fill(values)
+
+        assert list(values) == [called.next() for j in range(len(values))]
+        assert filled.state == called.state
+
+
+def test_ranges(load_game):
+    constants = load_game()
+
+    from random_stream import RandomStream
+
+    stream = RandomStream(1)
+
+    for i in range(0xffff):
+        assert 3 <= stream.integer(3, 9) < 9
+        assert 3 <= stream.uniform(3, 9) < 9
+        assert stream.choice((4, 5, 6)) in (4, 5, 6)
+
+    assert not any(stream.chance(0) for i in range(1000))
+    assert all(stream.chance(constants.RANDOM_RANGE) for i in range(1000))
+
+
+def test_level_enemies_behave_the_same_for_the_same_seed(load_game):
+    constants = load_game()
+
+    from controls import Controls
+    from level import Level
+
+    def run(seed):
+        # Each level seeds its stream from the random module when it is created
+        random.seed(seed)
+        level = Level(0, None, Controls())
+
+        for step in range(200):
+            level.update(constants.TIMESTEP)
+
+        return [(enemy.position_x, enemy.position_y, enemy.current_direction) for enemy in level.enemies]
+
+    assert run(1) == run(1)
+    assert run(1) != run(2)
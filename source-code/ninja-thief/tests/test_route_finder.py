@@ -0,0 +1,109 @@
+# The RouteFinder's flow fields must send enemies along a shortest route to the player,
+# and its cache must keep the flow fields which were used most recently
+
+import runpy
+from collections import deque
+
+import pytest
+
+from conftest import GAME_PATH
+
+LEVEL_COUNT = len(runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"])
+
+
+def distances_to(route_finder, level_data, target):
+    # Length of the shortest route from every node to the target, found with a separate search over the same moves
+    edges = [route_finder.edges_from(level_data, i) for i in range(len(route_finder.nodes))]
+    distance = {target: 0}
+    queue = deque([target])
+
+    while queue:
+        tile = queue.popleft()
+
+        for source in range(len(edges)):
+            if source not in distance and any(destination == tile for destination, move in edges[source]):
+                distance[source] = distance[tile] + 1
+                queue.append(source)
+
+    return edges, distance
+
+
+def junctions(route_finder, level_data):
+    # Tiles where a ninja can both walk along a platform and climb a ladder
+    from route_finder import RouteFinder
+
+    found = []
+
+    for i in range(len(route_finder.nodes)):
+        moves = {move for destination, move in route_finder.edges_from(level_data, i)}
+
+        if moves & {RouteFinder.Move.LEFT, RouteFinder.Move.RIGHT} and moves & {RouteFinder.Move.UP, RouteFinder.Move.DOWN}:
+            found.append(i)
+
+    return found
+
+
+@pytest.mark.parametrize("level_number", range(LEVEL_COUNT))
+def test_chaser_at_a_junction_takes_the_next_step_of_a_shortest_route(load_game, level_number):
+    constants = load_game()
+
+    from route_finder import RouteFinder
+
+    level_data = constants.LevelData.load(level_number)
+    level_data.build_tile_flags()
+    route_finder = RouteFinder(level_data)
+    size = constants.SPRITE_SIZE
+    width = route_finder.width_tiles
+
+    tiles = junctions(route_finder, level_data)
+    assert tiles
+
+    # Chase the player to a few different tiles
+    targets = [i for i in range(len(route_finder.nodes)) if route_finder.nodes[i]][::7]
+
+    for target in targets:
+        field = route_finder.field_towards((target % width) * size, (target // width) * size)
+        edges, distance = distances_to(route_finder, level_data, target)
+
+        for tile in tiles:
+            # An enemy standing exactly in the junction, so that it doesn't need to line up with the ladder first
+            move = route_finder.chase_move(field, (tile % width) * size, (tile // width) * size, False)
+
+            if tile == target or tile not in distance:
+                assert move == RouteFinder.Move.NONE
+
+            else:
+                # The move must lead to a tile one step closer to the player
+                assert move == field[tile]
+                assert any(distance.get(destination) == distance[tile] - 1 for destination, edge_move in edges[tile] if edge_move == move)
+
+
+def test_cache_keeps_the_most_recently_used_fields(load_game):
+    constants = load_game()
+
+    from route_finder import RouteFinder
+
+    level_data = constants.LevelData.load(0)
+    level_data.build_tile_flags()
+    route_finder = RouteFinder(level_data, cache_size=2)
+    size = constants.SPRITE_SIZE
+    width = route_finder.width_tiles
+
+    first, second, third = [i for i in range(len(route_finder.nodes)) if route_finder.nodes[i]][:3]
+
+    def move_player_to(tile):
+        return route_finder.field_towards((tile % width) * size, (tile // width) * size)
+
+    first_field = move_player_to(first)
+    move_player_to(second)
+
+    # Going back to the first tile reuses its field, which makes the second tile's field the least recently used
+    assert move_player_to(first) is first_field
+    assert route_finder.searches == 2
+
+    move_player_to(third)
+
+    assert set(route_finder.cache) == {first, third}
+
+    assert move_player_to(first) is first_field
+    assert route_finder.searches == 3
@@ -0,0 +1,65 @@
+# The SpatialIndex must find every object near a position, using the same amount of memory however big the level is
+
+import random
+
+from conftest import make_paged_map
+
+# A paged map with more tiles than fit in a 16-bit signed number
+MAP_SIZE = 200
+
+
+def test_query_finds_every_nearby_object(load_game):
+    load_game()
+
+    from spatial_index import SpatialIndex
+
+    rng = random.Random(1)
+    size = MAP_SIZE * 8
+
+    # Objects spread across a big map (and a little past its top and left edges)
+    positions = [(rng.randrange(-8, size), rng.randrange(-8, size)) for i in range(300)]
+
+    index = SpatialIndex(len(positions))
+
+    for x, y in positions:
+        index.insert(x, y)
+
+    reach = SpatialIndex.CELL_TILES * 8
+    results = [0] * len(positions)
+
+    for x, y in positions[:100] + [(rng.randrange(size), rng.randrange(size)) for i in range(100)]:
+        found = results[:index.query(x, y, results)]
+
+        assert len(found) == len(set(found))
+
+        nearby = {i for i, (other_x, other_y) in enumerate(positions) if abs(other_x - x) <= reach and abs(other_y - y) <= reach}
+        assert nearby <= set(found)
+
+
+def test_enemy_collisions_on_a_big_paged_map(load_game, tmp_path):
+    # Copies of the first level in the top left and bottom right corners of the map
+    path = make_paged_map(tmp_path / "big.map", MAP_SIZE, MAP_SIZE, [(0, 0), (MAP_SIZE - 15, MAP_SIZE - 15)])
+
+    constants = load_game(USE_SPATIAL_INDEX=True, PAGED_LEVELS={0: path})
+
+    from controls import Controls
+    from level import Level
+
+    level = Level(0, None, Controls())
+
+    assert level.level_data.width_tiles * level.level_data.height_tiles > 32767
+
+    for step in range(50):
+        level.update(constants.TIMESTEP)
+
+    # Put the player on top of an enemy in the far corner of the map, and then somewhere with no enemies nearby
+    enemy = max(level.enemies, key=lambda enemy: enemy.get_x() + enemy.get_y())
+    assert enemy.get_x() > (MAP_SIZE - 15) * 8
+
+    level.player.position_x = enemy.get_x()
+    level.player.position_y = enemy.get_y()
+    assert level.check_enemy_collisions()
+
+    level.player.position_x = MAP_SIZE * 4
+    level.player.position_y = MAP_SIZE * 4
+    assert not level.check_enemy_collisions()
@@ -0,0 +1,67 @@
+# The spawn positions remembered for each level must be the same as searching the level's spawn data,
+# whether the level has just been created, created again, or restarted
+
+import runpy
+
+import pytest
+
+from conftest import GAME_PATH
+
+LEVEL_COUNT = len(runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"])
+
+
+def search_spawns(constants, level_number):
+    # Find the spawn positions in the level data directly, the way the level used to every time it was created
+    level_data = constants.LevelData.load(level_number)
+    player = None
+    enemies = []
+
+    for i, spawn_id in enumerate(level_data.entity_spawns):
+        position = ((i % level_data.width_tiles) * constants.SPRITE_SIZE, (i // level_data.width_tiles) * constants.SPRITE_SIZE)
+
+        if spawn_id == constants.Sprites.PLAYER_IDLE:
+            player = position
+
+        elif spawn_id == constants.Sprites.PLAYER_IDLE + constants.Sprites.RED_OFFSET:
+            enemies.append(position)
+
+    return player, enemies
+
+
+def ninja_positions(level):
+    return (level.player.position_x, level.player.position_y), [(enemy.position_x, enemy.position_y) for enemy in level.enemies]
+
+
+@pytest.mark.parametrize("level_number", range(LEVEL_COUNT))
+def test_spawn_tables_match_the_spawn_data(load_game, level_number):
+    constants = load_game()
+
+    from controls import Controls
+    from level import Level
+
+    expected = search_spawns(constants, level_number)
+    assert expected[0] is not None and len(expected[1]) > 0
+
+    # The first time the level is created, its spawn data is searched
+    level = Level(level_number, None, Controls())
+    assert ninja_positions(level) == expected
+
+    spawns = Level.spawn_tables[level_number]
+    assert (spawns[0], spawns[1]) == expected[0]
+    assert list(spawns[2]) == expected[1]
+
+    # Move everyone away from their spawn positions, then restart
+    for step in range(50):
+        level.update(constants.TIMESTEP)
+
+    assert ninja_positions(level) != expected
+
+    level.restart()
+    assert ninja_positions(level) == expected
+
+    # Creating another level in between mustn't change what is remembered for this one
+    Level((level_number + 1) % LEVEL_COUNT, None, Controls())
+
+    level = Level(level_number, None, Controls())
+    assert ninja_positions(level) == expected
+    assert Level.spawn_tables[level_number] is spawns
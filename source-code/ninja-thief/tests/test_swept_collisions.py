@@ -0,0 +1,132 @@
+# With SWEPT_COLLISIONS, a ninja moving a long way in one update must stop at the first platform in its way,
+# but only if its path actually crosses that platform
+# Snapping onto a platform (with or without sweeping) must also throw away any fraction of a pixel left from fixed-point movement,
+# and fixed-point movement must be the same speed in every direction
+
+import pytest
+
+SETTINGS = [{}, {"FIXED_POINT": True}]
+SETTINGS_IDS = ["float", "fixed-point"]
+
+
+def make_level(constants, platforms):
+    # A level with nothing in it apart from single platform tiles at the given (x, y) tile positions
+    size = constants.GAME_WIDTH_TILES * constants.GAME_HEIGHT_TILES
+    layers = [bytearray([constants.Sprites.BLANK_TILE] * size) for i in range(4)]
+
+    for x, y in platforms:
+        layers[0][y * constants.GAME_WIDTH_TILES + x] = 0
+
+    level_data = constants.LevelData(*layers)
+    level_data.build_tile_flags()
+
+    return level_data
+
+
+def make_ninja(constants, x, y, velocity_x, velocity_y):
+    from ninja import Ninja
+
+    ninja = Ninja(Ninja.Colour.RED, x, y)
+    ninja.velocity_x = velocity_x * constants.SPEED_SCALE
+    ninja.velocity_y = velocity_y * constants.SPEED_SCALE
+
+    return ninja
+
+
+def fall(constants, ninja, level_data):
+    # Update the ninja with the largest dt allowed until it lands, or falls out of the level
+    for step in range(20):
+        ninja.update(constants.MAX_DT, level_data)
+
+        if ninja.velocity_y == 0 or ninja.position_y > level_data.height:
+            return
+
+
+@pytest.mark.parametrize("settings", SETTINGS, ids=SETTINGS_IDS)
+def test_fast_ninja_lands_on_a_one_tile_platform(load_game, settings):
+    size = 8
+
+    for swept in (False, True):
+        constants = load_game(SWEPT_COLLISIONS=swept, **settings)
+        level_data = make_level(constants, [(7, 10)])
+
+        # Falling at 300 pixels per second moves the ninja more than two tiles in each update
+        ninja = make_ninja(constants, 7 * size, 2 * size, 0, 300)
+        fall(constants, ninja, level_data)
+
+        if swept:
+            assert ninja.position_y == 9 * size
+            assert ninja.velocity_y == 0
+            assert ninja.remainder_y == 0
+
+        else:
+            # Without swept collisions, the ninja passes straight through the platform
+            assert ninja.position_y > 10 * size
+
+
+@pytest.mark.parametrize("settings", SETTINGS, ids=SETTINGS_IDS)
+def test_fast_ninja_misses_a_platform_its_path_does_not_cross(load_game, settings):
+    size = 8
+
+    constants = load_game(SWEPT_COLLISIONS=True, **settings)
+    level_data = make_level(constants, [(9, 7)])
+
+    # Moving down and to the right, the ninja's bottom passes the top of row 7 while it is still in columns 6 and 7,
+    # and by the time it reaches column 9 it is already below the platform
+    ninja = make_ninja(constants, 6 * size, 5 * size, 200, 300)
+    ninja.update(constants.MAX_DT, level_data)
+
+    assert ninja.velocity_y != 0
+    assert ninja.velocity_x != 0
+    assert ninja.position_y > 8 * size
+
+
+def test_landing_without_sweeping_clears_the_remainder(load_game):
+    size = 8
+
+    constants = load_game(FIXED_POINT=True)
+    level_data = make_level(constants, [(7, 10), (8, 10), (9, 9)])
+
+    # Falling slowly onto a platform, which is resolved by handle_platform() rather than the sweep
+    ninja = make_ninja(constants, 7 * size, 7 * size, 0, 10)
+
+    while ninja.velocity_y != 0 and ninja.position_y < level_data.height:
+        ninja.update(constants.TIMESTEP, level_data)
+
+    assert ninja.position_y == 9 * size
+    assert ninja.velocity_y == 0
+    assert ninja.remainder_y == 0
+
+    # Walking along the platform into the side of another one
+    ninja = make_ninja(constants, 7 * size, 9 * size, 37, 0)
+
+    for step in range(40):
+        ninja.update(constants.TIMESTEP, level_data)
+
+    assert ninja.velocity_x == 0
+    assert ninja.remainder_x == 0
+
+
+def test_fixed_point_moves_are_the_same_speed_in_both_directions(load_game):
+    constants = load_game(FIXED_POINT=True)
+
+    from ninja import Ninja
+
+    def distance_moved(velocity_x, velocity_y):
+        ninja = make_ninja(constants, 100, 100, velocity_x, velocity_y)
+
+        # Gravity isn't applied while climbing
+        ninja.climbing_state = Ninja.ClimbingState.IDLE
+
+        for step in range(50):
+            ninja.update_position_fixed_point(17)
+
+        return ((ninja.position_x - 100) * constants.FIXED_POINT_ONE + ninja.remainder_x,
+                (ninja.position_y - 100) * constants.FIXED_POINT_ONE + ninja.remainder_y)
+
+    # 37 pixels per second for 17 milliseconds isn't a whole number of fixed-point units
+    right, down = distance_moved(37, 37)
+    left, up = distance_moved(-37, -37)
+
+    assert right > 0
+    assert (left, up) == (-right, -down)
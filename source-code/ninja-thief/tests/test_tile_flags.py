@@ -0,0 +1,49 @@
+# The tile flags must say the same thing about every tile as looking at its platform and extra sprites directly
+
+import runpy
+
+import pytest
+
+from conftest import GAME_PATH
+
+LEVEL_COUNT = len(runpy.run_path(str(GAME_PATH / "assets" / "levels.py"))["LEVELS"])
+
+
+def expected_flags(constants, platform, extra):
+    # What the sprites mean to a ninja, worked out from the sprite IDs the way the collision code used to
+    sprites = constants.Sprites
+    flags = constants.TileFlags
+    result = 0
+
+    if platform != sprites.BLANK_TILE:
+        result |= flags.ONE_WAY if extra == sprites.LADDER else flags.SOLID
+
+    if extra == sprites.LADDER:
+        result |= flags.LADDER
+
+    if extra == sprites.COIN or extra == sprites.GEM:
+        result |= flags.COLLECTABLE
+
+    return result
+
+
+@pytest.mark.parametrize("level_number", range(LEVEL_COUNT))
+def test_tile_flags_match_the_sprites(load_game, level_number):
+    constants = load_game()
+
+    level_data = constants.LevelData.load(level_number)
+    level_data.build_tile_flags()
+
+    for i in range(len(level_data.platforms)):
+        assert level_data.tile_flags[i] == expected_flags(constants, level_data.platforms[i], level_data.extras[i]), i
+
+    # PLATFORM is either kind of platform
+    assert all(bool(level_data.tile_flags[i] & constants.TileFlags.PLATFORM) == (level_data.platforms[i] != constants.Sprites.BLANK_TILE)
+               for i in range(len(level_data.platforms)))
+
+    # Collecting a coin or gem must keep the flags in step with the sprites
+    for i in range(len(level_data.extras)):
+        if level_data.extras[i] in (constants.Sprites.COIN, constants.Sprites.GEM):
+            level_data.remove_extra(i)
+
+            assert level_data.tile_flags[i] == expected_flags(constants, level_data.platforms[i], level_data.extras[i]), i
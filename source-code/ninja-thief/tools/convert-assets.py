@@ -0,0 +1,600 @@
+#!/bin/env python3
+# Convert images into formats which can be loaded on the PicoSystem, for every episode at once
+#
+# Run with `./convert-assets.py ..` to convert every image in every episode's picosystem-micropython/assets folder,
+# or pass any mixture of image files, folders (which are searched recursively) and manifests (see below).
+#
+# A manifest is a text file ending in .txt, with one image path per line (relative to the manifest's folder). Lines starting with # are ignored.
+#
+# Each image is written next to the original, with the suffix changed to match the output format (see FORMATS below).
+# The default format is ARGB4444, which is what Buffer() expects. The other formats are smaller, and are expanded by image_loader.py when they are loaded.
+# ARGB4444 images can also be compressed (see COMPRESSIONS below), which is best for images with large areas of flat colour or repeated tiles.
+# Images are converted in parallel, and any image which hasn't changed since the last run is skipped:
+# a hash of each image's contents is stored in a cache file (.convert-assets-cache.json in the current folder, by default).
+
+from PIL import Image
+import numpy
+import argparse
+import concurrent.futures
+import hashlib
+import json
+import os
+import pathlib
+import time
+
+# Change this whenever the output format changes, so that cached results from older versions aren't reused
+CONVERTER_VERSION = 4
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".bmp"}
+
+# Output formats, and the suffix used for each one. Every format is stored row by row, starting from the top left pixel:
+#   argb4444: 2 bytes per pixel, big-endian AAAA RRRR GGGG BBBB (the same as the PicoSystem's own buffers)
+#   rgb332:   1 byte per pixel, RRR GGG BB, with no transparency (for opaque backgrounds, at half the size of argb4444)
+# There is no 16-bit RGB format without transparency: it would be the same size as argb4444, and the PicoSystem only keeps 4 bits
+# of each channel anyway, so it would only lose the transparency and take longer to load
+#   indexed4: a 16 colour palette (2 bytes per colour, ARGB4444), then 2 pixels per byte (left pixel in the high 4 bits)
+#             Each row is padded to a whole number of bytes, so images with an odd width have an unused pixel at the end of each row
+#   indexed8: a 256 colour palette (2 bytes per colour, ARGB4444), then 1 byte per pixel
+# The palettes are always full size (unused colours are 0), so that the loader doesn't need to know how many colours are used
+# If an image uses more colours than the palette can hold, the palette is chosen using median cut (see make_palette())
+FORMATS = {
+    "argb4444": ".16bpp",
+    "rgb332": ".rgb332",
+    "indexed4": ".i4",
+    "indexed8": ".i8",
+}
+
+PALETTE_SIZES = {
+    "indexed4": 16,
+    "indexed8": 256,
+}
+
+DEFAULT_FORMAT = "argb4444"
+
+# Compressed containers for ARGB4444 images, and the suffix added for each one. Numbers in the headers are 16-bit big-endian:
+#   rle:   "RL", width, height, then each row is stored as a series of chunks, where each chunk starts with a byte N:
+#            N < 128:  the next N + 1 pixels are stored one after another
+#            N >= 128: the next pixel is repeated N - 127 times
+#          Chunks never continue from one row to the next.
+#   tiles: "TL", width, height, number of tiles, then each unique 8x8 tile (64 pixels, row by row),
+#          then the number of the tile used at each position, row by row.
+#          If the width or height isn't a multiple of 8, the tiles on the right and bottom edges are padded with transparent pixels,
+#          which aren't copied when the image is loaded.
+COMPRESSIONS = {
+    "rle": ".rle",
+    "tiles": ".tiles",
+}
+
+# Longest chunk which can be stored by the rle compression
+RLE_MAX_CHUNK = 128
+
+TILE_SIZE = 8
+
+# Only the PicoSystem MicroPython versions use these files
+DEFAULT_FOLDER_FILTER = "picosystem-micropython"
+
+# Number of colours which are matched to the nearest palette colour at a time (see nearest_palette_indices())
+NEAREST_COLOR_CHUNK = 1024
+
+# Number of rows of pixels converted at a time
+# Large images are converted in bands of this height, so only one band (rather than the whole image) is held in NumPy arrays at once
+DEFAULT_BAND_HEIGHT = 64
+
+
+def image_to_data(image):
+    """Convert a PIL image to 16-bit ARGB4444 bytes."""
+    return argb4444_values(image).flatten().byteswap().tobytes()
+
+
+def argb4444_values(image):
+    """Convert a PIL image to a 2D NumPy array of ARGB4444 colours."""
+    # NumPy is much faster at doing this. NumPy code provided by:
+    # Keith (https://www.blogger.com/profile/02555547344016007163)
+    pb = numpy.array(image.convert('RGBA')).astype('uint16')
+
+    r = pb[:, :, 0] // 16
+    g = pb[:, :, 1] // 16
+    b = pb[:, :, 2] // 16
+    a = pb[:, :, 3] // 16
+
+    # AAAA RRRR GGGG BBBB
+    return (a << 12) | (r << 8) | (g << 4) | b
+
+
+def image_to_rgb332(image):
+    """Convert a PIL image to 8-bit RGB332 bytes. Transparency is ignored."""
+    pb = numpy.array(image.convert('RGB'))
+
+    r = pb[:, :, 0] >> 5
+    g = pb[:, :, 1] >> 5
+    b = pb[:, :, 2] >> 6
+
+    # RRR GGG BB
+    color = (r << 5) | (g << 2) | b
+    return color.astype('uint8').tobytes()
+
+
+def make_palette(image, band_height, palette_size):
+    """Choose up to palette_size ARGB4444 colours for an image, returning them as a sorted NumPy array.
+
+    If the image uses more colours than will fit, the palette is chosen using median cut (see median_cut()),
+    and each pixel is drawn using the nearest colour in the palette.
+    """
+    w, h = image.size
+    counts = {}
+
+    # Count how many times each colour is used, one band at a time
+    for top in range(0, h, band_height):
+        colors, band_counts = numpy.unique(argb4444_values(image.crop((0, top, w, min(top + band_height, h)))), return_counts=True)
+
+        for color, count in zip(colors.tolist(), band_counts.tolist()):
+            counts[color] = counts.get(color, 0) + count
+
+    if len(counts) <= palette_size:
+        # Every colour fits, so the image will be stored exactly
+        return numpy.array(sorted(counts), dtype='uint16')
+
+    colors = numpy.array(list(counts), dtype='uint16')
+    return numpy.array(sorted(median_cut(colors, numpy.array(list(counts.values())), palette_size)), dtype='uint16')
+
+
+def median_cut(colors, counts, palette_size):
+    """Reduce a list of ARGB4444 colours (each used counts times) to palette_size colours, returning them as a list.
+
+    The colours start off in one box. The box with the widest range of any channel (multiplied by the number of pixels using it,
+    so that rare colours don't take up much of the palette) is split in two at the middle pixel, until there are palette_size boxes.
+    Each box then becomes the average of the colours in it, weighted by how often they are used.
+    """
+    channels = color_channels(colors)
+
+    def split_priority(box):
+        # Return how much splitting the box would help, and which channel to split it on
+        # Alpha is checked first, so that transparent pixels are split off early if every channel is as wide
+        box_channels = channels[box]
+        ranges = box_channels.max(axis=0) - box_channels.min(axis=0)
+        channel = int(ranges.argmax())
+
+        return int(ranges[channel]) * int(counts[box].sum()), channel
+
+    everything = numpy.arange(len(colors))
+    boxes = [(everything, *split_priority(everything))]
+
+    while len(boxes) < palette_size:
+        # Split the box with the highest priority (the first one, if several are the same)
+        chosen = max(range(len(boxes)), key=lambda i: boxes[i][1])
+        box, priority, channel = boxes[chosen]
+
+        if priority == 0:
+            # Every box is a single colour
+            break
+
+        values = channels[box, channel]
+        order = numpy.argsort(values, kind='stable')
+        used = numpy.cumsum(counts[box][order])
+        median = values[order][numpy.searchsorted(used, used[-1] / 2)]
+
+        # Colours with the same value always go in the same half, and each half must have at least one colour
+        lower = values <= median
+
+        if lower.all():
+            lower = values < median
+
+        boxes[chosen:chosen + 1] = [(half, *split_priority(half)) for half in (box[lower], box[~lower])]
+
+    palette = []
+
+    for box, _, _ in boxes:
+        average = numpy.rint(numpy.average(channels[box], axis=0, weights=counts[box])).astype('int32')
+        palette.append(int(average[0] << 12 | average[1] << 8 | average[2] << 4 | average[3]))
+
+    return palette
+
+
+def palette_to_data(palette, palette_size):
+    """Convert a palette to bytes, padding it with unused (0) colours up to palette_size."""
+    padded = numpy.zeros(palette_size, dtype='uint16')
+    padded[:len(palette)] = palette
+
+    return padded.byteswap().tobytes()
+
+
+def color_channels(colors):
+    """Split ARGB4444 colours into an array of (alpha, red, green, blue) values, each from 0 to 15."""
+    return numpy.stack([(colors.astype('int32') >> shift) & 0xf for shift in (12, 8, 4, 0)], axis=-1)
+
+
+def nearest_palette_indices(values, palette):
+    """Return the index of the palette colour closest to each ARGB4444 value in a 2D NumPy array."""
+    # Colours which are in the palette can be found directly (the palette is sorted)
+    indices = numpy.searchsorted(palette, values).clip(0, len(palette) - 1)
+    missing = palette[indices] != values
+
+    if missing.any():
+        # Find the closest palette colour for everything else, comparing each channel separately
+        # Each different colour only needs to be looked up once, and they are looked up NEAREST_COLOR_CHUNK at a time,
+        # so the table of distances never holds more than NEAREST_COLOR_CHUNK x palette size values, however big the band is
+        colors, positions = numpy.unique(values[missing], return_inverse=True)
+        nearest = numpy.empty(len(colors), dtype=indices.dtype)
+
+        palette_channels = color_channels(palette)
+
+        for start in range(0, len(colors), NEAREST_COLOR_CHUNK):
+            chunk = color_channels(colors[start:start + NEAREST_COLOR_CHUNK])
+
+            distances = ((chunk[:, None, :] - palette_channels[None, :, :]) ** 2).sum(axis=-1)
+            nearest[start:start + NEAREST_COLOR_CHUNK] = distances.argmin(axis=1)
+
+        indices[missing] = nearest[positions.reshape(-1)]
+
+    return indices
+
+
+def image_to_indexed(image, palette, bits):
+    """Convert a PIL image to 4-bit or 8-bit palette indices."""
+    indices = nearest_palette_indices(argb4444_values(image), palette).astype('uint8')
+
+    if bits == 4:
+        # Pad each row to an even number of pixels, then pack pairs of pixels into each byte
+        if indices.shape[1] % 2:
+            indices = numpy.pad(indices, ((0, 0), (0, 1)))
+
+        indices = (indices[:, 0::2] << 4) | indices[:, 1::2]
+
+    return indices.tobytes()
+
+
+def encode(image, image_format, palette=None):
+    """Convert a PIL image to bytes in the given format."""
+    if image_format == "argb4444":
+        return image_to_data(image)
+
+    elif image_format == "rgb332":
+        return image_to_rgb332(image)
+
+    elif image_format == "indexed4":
+        return image_to_indexed(image, palette, 4)
+
+    elif image_format == "indexed8":
+        return image_to_indexed(image, palette, 8)
+
+    raise ValueError(f"unknown format: {image_format}")
+
+
+def write_image_data(image, f, band_height, image_format=DEFAULT_FORMAT):
+    """Convert a PIL image band by band, writing each band to the file f as soon as it has been converted.
+
+    The bytes written are identical to converting the whole image at once, but peak memory use is proportional to the band size, rather than the image size.
+    """
+    w, h = image.size
+    size = 0
+
+    palette = None
+
+    if image_format in PALETTE_SIZES:
+        # The palette is worked out from the whole image first, and written before the pixels
+        palette = make_palette(image, band_height, PALETTE_SIZES[image_format])
+
+        data = palette_to_data(palette, PALETTE_SIZES[image_format])
+        f.write(data)
+
+        size += len(data)
+
+    for top in range(0, h, band_height):
+        data = encode(image.crop((0, top, w, min(top + band_height, h))), image_format, palette)
+        f.write(data)
+
+        size += len(data)
+
+    return size
+
+
+def rle_encode_row(row):
+    """Run-length encode one row of ARGB4444 colours (a 1D NumPy array)."""
+    data = row.astype('>u2').tobytes()
+    out = bytearray()
+
+    def add_literals(start, end):
+        while start < end:
+            count = min(end - start, RLE_MAX_CHUNK)
+
+            out.append(count - 1)
+            out.extend(data[start * 2:(start + count) * 2])
+
+            start += count
+
+    # Find where each run of identical colours starts
+    bounds = numpy.concatenate(([0], numpy.flatnonzero(row[1:] != row[:-1]) + 1, [len(row)])).tolist()
+
+    # Single pixels are collected together into literal chunks
+    literal_start = 0
+
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if end - start == 1:
+            continue
+
+        add_literals(literal_start, start)
+
+        while start < end:
+            count = min(end - start, RLE_MAX_CHUNK)
+
+            out.append(0x80 | (count - 1))
+            out.extend(data[start * 2:start * 2 + 2])
+
+            start += count
+
+        literal_start = end
+
+    add_literals(literal_start, len(row))
+
+    return bytes(out)
+
+
+def rle_decode(data):
+    """Expand an rle container back into ARGB4444 bytes (used to check the encoder)."""
+    w = (data[2] << 8) | data[3]
+    h = (data[4] << 8) | data[5]
+
+    out = bytearray()
+    position = 6
+
+    while len(out) < w * h * 2:
+        count = (data[position] & 0x7f) + 1
+
+        if data[position] & 0x80:
+            out.extend(data[position + 1:position + 3] * count)
+            position += 3
+
+        else:
+            out.extend(data[position + 1:position + 1 + count * 2])
+            position += 1 + count * 2
+
+    return bytes(out)
+
+
+def tiles_decode(data):
+    """Expand a tiles container back into ARGB4444 bytes (used to check the encoder)."""
+    w = (data[2] << 8) | data[3]
+    h = (data[4] << 8) | data[5]
+    count = (data[6] << 8) | data[7]
+
+    tiles_x = -(-w // TILE_SIZE)
+    tiles_y = -(-h // TILE_SIZE)
+
+    tiles = numpy.frombuffer(data, dtype='>u2', count=count * TILE_SIZE * TILE_SIZE, offset=8).reshape(count, TILE_SIZE, TILE_SIZE)
+    tile_map = numpy.frombuffer(data, dtype='>u2', offset=8 + count * TILE_SIZE * TILE_SIZE * 2).reshape(tiles_y, tiles_x)
+
+    # Put the tiles back in their positions, then join them together into rows (removing any padding)
+    padded = tiles[tile_map].transpose(0, 2, 1, 3).reshape(tiles_y * TILE_SIZE, tiles_x * TILE_SIZE)
+    return padded[:h, :w].astype('>u2').tobytes()
+
+
+def size_header(magic, w, h):
+    return magic + bytes((w >> 8, w & 0xff, h >> 8, h & 0xff))
+
+
+def write_compressed_data(image, f, band_height, compression):
+    """Convert a PIL image to ARGB4444 band by band, writing it to the file f in a compressed container."""
+    w, h = image.size
+
+    if compression == "rle":
+        f.write(size_header(b"RL", w, h))
+        size = 6
+
+        for top in range(0, h, band_height):
+            for row in argb4444_values(image.crop((0, top, w, min(top + band_height, h)))):
+                data = rle_encode_row(row)
+                f.write(data)
+
+                size += len(data)
+
+        return size
+
+    elif compression == "tiles":
+        # Each row of tiles is padded on the right to a whole number of tiles
+        padded_width = -(-w // TILE_SIZE) * TILE_SIZE
+
+        # Each band must contain whole rows of tiles
+        band_height = max(band_height // TILE_SIZE, 1) * TILE_SIZE
+
+        # Unique tiles, in the order they were first found, and the number of each one
+        tiles = {}
+        tile_map = []
+
+        for top in range(0, h, band_height):
+            values = argb4444_values(image.crop((0, top, w, min(top + band_height, h))))
+
+            # The last band is also padded at the bottom to a whole number of tiles (with transparent pixels)
+            rows = values.shape[0]
+            values = numpy.pad(values, ((0, -(-rows // TILE_SIZE) * TILE_SIZE - rows), (0, padded_width - w)))
+
+            for y in range(0, rows, TILE_SIZE):
+                for x in range(0, w, TILE_SIZE):
+                    tile = values[y:y + TILE_SIZE, x:x + TILE_SIZE].astype('>u2').tobytes()
+                    tile_map.append(tiles.setdefault(tile, len(tiles)))
+
+        if len(tiles) > 0xffff:
+            raise ValueError("too many unique tiles")
+
+        data = size_header(b"TL", w, h) + bytes((len(tiles) >> 8, len(tiles) & 0xff)) + b"".join(tiles) + numpy.array(tile_map, dtype='>u2').tobytes()
+        f.write(data)
+
+        return len(data)
+
+    raise ValueError(f"unknown compression: {compression}")
+
+
+def output_path(image_path, image_format=DEFAULT_FORMAT, compression=None):
+    suffix = FORMATS[image_format]
+
+    if compression is not None:
+        suffix += COMPRESSIONS[compression]
+
+    return image_path.with_suffix(suffix)
+
+
+def find_images(sources, folder_filter):
+    """Return the paths of every image in the given files, folders and manifests."""
+    images = []
+
+    for source in sources:
+        if source.is_dir():
+            for root, folders, files in os.walk(source):
+                # Only look inside folders whose path contains folder_filter (if one is given)
+                if folder_filter and folder_filter not in root:
+                    continue
+
+                for name in sorted(files):
+                    path = pathlib.Path(root) / name
+
+                    if path.suffix.lower() in IMAGE_SUFFIXES:
+                        images.append(path)
+
+        elif source.suffix.lower() == ".txt":
+            with open(source) as f:
+                for line in f:
+                    line = line.strip()
+
+                    if line and not line.startswith("#"):
+                        images.append(source.parent / line)
+
+        else:
+            images.append(source)
+
+    # Remove duplicates, keeping the original order
+    return list(dict.fromkeys(path.resolve() for path in images))
+
+
+def hash_file(path, image_format=DEFAULT_FORMAT, compression=None):
+    digest = hashlib.sha256()
+    digest.update(str(CONVERTER_VERSION).encode())
+    digest.update(image_format.encode())
+    digest.update(str(compression).encode())
+
+    with open(path, "rb") as f:
+        digest.update(f.read())
+
+    return digest.hexdigest()
+
+
+def convert(image_path, band_height, image_format=DEFAULT_FORMAT, compression=None, verify=False):
+    """Convert a single image. This runs in a worker process."""
+    start = time.perf_counter()
+
+    img = Image.open(image_path)
+    w, h = img.size
+
+    # A band height of 0 means the whole image is converted at once
+    if band_height <= 0:
+        band_height = max(h, 1)
+
+    path = output_path(image_path, image_format, compression)
+
+    with open(path, "wb") as f:
+        if compression is None:
+            size = write_image_data(img, f, band_height, image_format)
+
+        else:
+            size = write_compressed_data(img, f, band_height, compression)
+
+    if verify and compression is not None:
+        # Check that the compressed file expands back to exactly the same pixels
+        with open(path, "rb") as f:
+            data = f.read()
+
+        decoded = rle_decode(data) if compression == "rle" else tiles_decode(data)
+
+        if decoded != image_to_data(img):
+            raise ValueError(f"{path.name} doesn't match the original image when it is decompressed")
+
+    return w, h, size, time.perf_counter() - start
+
+
+def display_path(path):
+    # Paths are printed relative to the current folder, to keep the output short
+    return os.path.relpath(path)
+
+
+def cache_key(cache_path, image_path):
+    # Images are stored in the cache relative to the cache file, so the cache still works if the repository is moved
+    return pathlib.Path(os.path.relpath(image_path, cache_path.resolve().parent)).as_posix()
+
+
+def load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(path, cache):
+    with open(path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert images to formats which can be loaded on the PicoSystem.")
+    parser.add_argument("sources", nargs="+", type=pathlib.Path, help="images, folders or manifests to convert")
+    parser.add_argument("--cache", type=pathlib.Path, default=pathlib.Path(".convert-assets-cache.json"), help="file used to remember which images have been converted")
+    parser.add_argument("--force", action="store_true", help="convert every image, even if it hasn't changed")
+    parser.add_argument("--jobs", type=int, default=None, help="number of images to convert at the same time (default: one per CPU)")
+    parser.add_argument("--band-height", type=int, default=DEFAULT_BAND_HEIGHT, help="rows of pixels to convert at a time, to limit memory use (default: %(default)s, use 0 to convert whole images at once)")
+    parser.add_argument("--format", choices=FORMATS, default=DEFAULT_FORMAT, help="output format (default: %(default)s). The indexed formats use the image's own colours if they fit in the palette, otherwise a median cut palette")
+    parser.add_argument("--compress", choices=COMPRESSIONS, help="store argb4444 images in a compressed container")
+    parser.add_argument("--verify", action="store_true", help="decompress each compressed image after writing it, and check that it matches the original")
+    parser.add_argument("--folder-filter", default=DEFAULT_FOLDER_FILTER, help="only search folders whose path contains this (default: %(default)s, use '' to search everything)")
+    args = parser.parse_args()
+
+    if args.compress is not None and args.format != "argb4444":
+        parser.error("--compress can only be used with --format argb4444")
+
+    start = time.perf_counter()
+
+    images = find_images(args.sources, args.folder_filter)
+    cache = {} if args.force else load_cache(args.cache)
+
+    # Work out which images have changed since they were last converted
+    hashes = {}
+    to_convert = []
+
+    for image_path in images:
+        key = cache_key(args.cache, image_path)
+        hashes[key] = hash_file(image_path, args.format, args.compress)
+
+        if cache.get(key) == hashes[key] and output_path(image_path, args.format, args.compress).exists():
+            print(f"Unchanged: {display_path(image_path)}")
+
+        else:
+            to_convert.append(image_path)
+
+    failed = 0
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {executor.submit(convert, image_path, args.band_height, args.format, args.compress, args.verify): image_path for image_path in to_convert}
+
+        for future in concurrent.futures.as_completed(futures):
+            image_path = futures[future]
+
+            try:
+                w, h, size, elapsed = future.result()
+
+            except Exception as error:
+                print(f"Failed: {display_path(image_path)} ({error})")
+                failed += 1
+                continue
+
+            print(f"Converted: {display_path(image_path)} ({w}x{h}, {size} bytes) to {output_path(image_path, args.format, args.compress).name} in {elapsed * 1000:.1f}ms")
+
+            key = cache_key(args.cache, image_path)
+            cache[key] = hashes[key]
+
+    save_cache(args.cache, cache)
+
+    print(f"{len(to_convert) - failed} converted, {len(images) - len(to_convert)} unchanged, {failed} failed, in {time.perf_counter() - start:.2f}s")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
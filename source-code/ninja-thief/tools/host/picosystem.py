@@ -0,0 +1,361 @@
+# A headless, pure-Python stand-in for the PicoSystem MicroPython module
+#
+# This lets the MicroPython versions of the game run on a normal computer (for example on CI machines), with no display.
+# All drawing is done into NumPy arrays, so the results can be inspected (or just thrown away when benchmarking).
+#
+# Only the parts of the API which the tutorials use are implemented.
+# Pixels are stored in the same 16 bit ARGB4444 format that convert-image.py produces, so .16bpp files can be loaded directly.
+
+import gc
+import sys
+import time
+import tracemalloc
+
+import numpy
+
+# Buttons
+UP = 0
+DOWN = 1
+LEFT = 2
+RIGHT = 3
+A = 4
+B = 5
+X = 6
+Y = 7
+
+BUTTON_NAMES = {"UP": UP, "DOWN": DOWN, "LEFT": LEFT, "RIGHT": RIGHT, "A": A, "B": B, "X": X, "Y": Y}
+
+# Sprite and blit transform flags
+HFLIP = 0x01
+VFLIP = 0x02
+
+# Blend modes
+COPY = 0
+ALPHA = 1
+MASK = 2
+
+# Size of each sprite on the spritesheet
+SPRITE_SIZE = 8
+
+# Size of the (fake) font used by text() and measure()
+GLYPH_WIDTH = 5
+GLYPH_HEIGHT = 7
+GLYPH_ADVANCE = 6
+
+
+class Buffer(bytearray):
+    # The pixel data is held in the bytearray itself, in the same byte order as a .16bpp file
+    # This means that code which writes into a Buffer through memoryview() works the same way as it does on the device
+
+    def __init__(self, w, h, path=None):
+        super().__init__(w * h * 2)
+
+        self.w = w
+        self.h = h
+
+        if path is not None:
+            with open(path, "rb") as f:
+                data = f.read(w * h * 2)
+
+            self[:len(data)] = data
+
+        # Big-endian ARGB4444 view of the bytes above (no copy is made)
+        self.pixels = numpy.frombuffer(self, dtype=">u2").reshape(h, w)
+
+
+class ScriptedInput:
+    # Feeds button presses from a list of (frame, buttons) pairs
+    # The buttons given for a frame are held down until the next entry in the script
+
+    def __init__(self, script=()):
+        self.script = sorted(script)
+        self.position = 0
+        self.mask = 0
+
+    def poll(self, frame):
+        while self.position < len(self.script) and self.script[self.position][0] <= frame:
+            self.mask = self.script[self.position][1]
+            self.position += 1
+
+        return self.mask
+
+    @staticmethod
+    def parse(lines):
+        # Each non-empty line is "<frame> [BUTTON ...]", for example "120 RIGHT A"
+        script = []
+
+        for line in lines:
+            line = line.split("#")[0].split()
+
+            if line:
+                mask = 0
+                for name in line[1:]:
+                    mask |= 1 << BUTTON_NAMES[name.upper()]
+
+                script.append((int(line[0]), mask))
+
+        return ScriptedInput(script)
+
+
+class _State:
+    def __init__(self):
+        self.screen = Buffer(120, 120)
+        self.target = self.screen
+        self.clip = (0, 0, 120, 120)
+        self.spritesheet = None
+        self.pen = 0xf000
+        self.blend = COPY
+
+        self.input = ScriptedInput()
+        self.buttons = 0
+        self.last_buttons = 0
+
+        # Number of frames that start() runs for (None means forever)
+        self.frames = None
+
+        # If set, ticks_ms() advances by exactly this many milliseconds each frame, rather than following the real clock
+        self.fixed_clock_ms = None
+        self.clock_us = 0
+
+        # If set, this is called with the frame number after each frame has been drawn (the tests use it to look at every frame)
+        self.on_frame = None
+
+        self.frame = 0
+        self.elapsed = 0
+
+
+_state = _State()
+
+
+def configure(frames=None, fixed_clock_ms=None, input_source=None, on_frame=None):
+    # Set up the headless run (called before the game module is executed)
+    _state.frames = frames
+    _state.fixed_clock_ms = fixed_clock_ms
+    _state.on_frame = on_frame
+
+    if input_source is not None:
+        _state.input = input_source
+
+
+def stats():
+    # Return the number of frames run by start(), and the wall-clock time they took (in seconds)
+    return _state.frame, _state.elapsed
+
+
+def screen():
+    return _state.screen
+
+
+# Clock functions, matching the MicroPython time module (install_clock() adds them to the time module)
+
+def ticks_us():
+    if _state.fixed_clock_ms is not None:
+        return _state.clock_us
+
+    return time.perf_counter_ns() // 1000
+
+
+def ticks_ms():
+    return ticks_us() // 1000
+
+
+def ticks_diff(a, b):
+    return a - b
+
+
+def install_clock():
+    time.ticks_ms = ticks_ms
+    time.ticks_us = ticks_us
+    time.ticks_diff = ticks_diff
+
+
+def mem_alloc():
+    # Number of bytes currently allocated, measured by tracemalloc (which install_gc() starts)
+    # This is only a rough guide to what gc.mem_alloc() would report on the PicoSystem, so it can't be used to pass or fail a run:
+    #  - Python frees most objects as soon as they are no longer used, so this only goes up when memory is still held
+    #    after the code being measured has finished (for example, a list which has grown)
+    #  - Python allocates whole numbers above 256 (MicroPython doesn't, up to about a billion), so even the FIXED_POINT update
+    #    appears to allocate whenever a ninja's position or velocity is stored
+    #  - Python often reuses freed floats and tuples without allocating, so some allocations which MicroPython makes aren't seen
+    # tests/test_allocations.py checks the FIXED_POINT update in a different way, by looking at the code which runs
+    return tracemalloc.get_traced_memory()[0]
+
+
+def install_gc():
+    # Add mem_alloc() to the gc module, as MicroPython has it
+    tracemalloc.start()
+
+    gc.mem_alloc = mem_alloc
+
+
+def install_builtins():
+    # On the PicoSystem, the picosystem functions can be used without importing them (some of the earlier episodes rely on this)
+    import builtins
+
+    for name, value in list(globals().items()):
+        if not name.startswith("_") and name not in ("gc", "sys", "time", "tracemalloc", "numpy"):
+            setattr(builtins, name, value)
+
+
+# Drawing state
+
+def pen(r=0, g=0, b=0, a=15):
+    _state.pen = (a << 12) | (r << 8) | (g << 4) | b
+
+
+def blend(mode):
+    _state.blend = mode
+
+
+def target(buffer=None):
+    _state.target = _state.screen if buffer is None else buffer
+    _state.clip = (0, 0, _state.target.w, _state.target.h)
+
+
+def clip(x=None, y=None, w=None, h=None):
+    if x is None:
+        _state.clip = (0, 0, _state.target.w, _state.target.h)
+    else:
+        _state.clip = (x, y, w, h)
+
+
+def spritesheet(buffer):
+    _state.spritesheet = buffer
+
+
+# Drawing functions
+
+def _clipped(x, y, w, h):
+    # Intersect a rectangle with the clip rectangle and the target buffer
+    cx, cy, cw, ch = _state.clip
+
+    x0 = max(x, cx, 0)
+    y0 = max(y, cy, 0)
+    x1 = min(x + w, cx + cw, _state.target.w)
+    y1 = min(y + h, cy + ch, _state.target.h)
+
+    return x0, y0, x1, y1
+
+
+def _blend_into(dst, src):
+    if _state.blend == COPY:
+        dst[...] = src
+
+    elif _state.blend == MASK:
+        visible = (src >> 12) != 0
+        dst[visible] = src[visible]
+
+    else:
+        # Alpha blend each channel, using the source alpha
+        a = (src >> 12).astype(numpy.uint32)
+        out = numpy.full(dst.shape, 0xf000, dtype=numpy.uint32)
+
+        for shift in (8, 4, 0):
+            s = (src >> shift) & 0xf
+            d = (dst >> shift) & 0xf
+            out |= ((s * a + d * (15 - a)) // 15) << shift
+
+        dst[...] = out.astype(numpy.uint16)
+
+
+def clear():
+    x0, y0, x1, y1 = _clipped(0, 0, _state.target.w, _state.target.h)
+    _state.target.pixels[y0:y1, x0:x1] = _state.pen
+
+
+def frect(x, y, w, h):
+    x0, y0, x1, y1 = _clipped(x, y, w, h)
+
+    if x1 > x0 and y1 > y0:
+        region = _state.target.pixels[y0:y1, x0:x1]
+        _blend_into(region, numpy.full(region.shape, _state.pen, dtype=numpy.uint16))
+
+
+def pixel(x, y):
+    frect(x, y, 1, 1)
+
+
+def blit(source, sx, sy, w, h, dx, dy, dw=None, dh=None, flags=0):
+    dw = w if dw is None else dw
+    dh = h if dh is None else dh
+
+    image = source.pixels[sy:sy + h, sx:sx + w]
+
+    if flags & HFLIP:
+        image = image[:, ::-1]
+    if flags & VFLIP:
+        image = image[::-1, :]
+
+    if (dw, dh) != (w, h):
+        # Nearest-neighbour scaling
+        image = image[(numpy.arange(dh) * h) // dh][:, (numpy.arange(dw) * w) // dw]
+
+    x0, y0, x1, y1 = _clipped(dx, dy, dw, dh)
+
+    if x1 > x0 and y1 > y0:
+        _blend_into(_state.target.pixels[y0:y1, x0:x1], image[y0 - dy:y1 - dy, x0 - dx:x1 - dx])
+
+
+def sprite(i, x, y, cx=1, cy=1, dw=None, dh=None, flags=0):
+    sheet = _state.spritesheet
+    columns = sheet.w // SPRITE_SIZE
+
+    sx = (i % columns) * SPRITE_SIZE
+    sy = (i // columns) * SPRITE_SIZE
+
+    w = cx * SPRITE_SIZE
+    h = cy * SPRITE_SIZE
+
+    blit(sheet, sx, sy, w, h, x, y, w if dw is None else dw, h if dh is None else dh, flags)
+
+
+def measure(message):
+    return len(message) * GLYPH_ADVANCE, GLYPH_HEIGHT
+
+
+def text(message, x, y):
+    # Glyphs are drawn as solid blocks, which is enough to give the same pixel fill cost as real text
+    for i, character in enumerate(message):
+        if character != " ":
+            frect(x + i * GLYPH_ADVANCE, y, GLYPH_WIDTH, GLYPH_HEIGHT)
+
+
+# Input
+
+def button(b):
+    return bool(_state.buttons & (1 << b))
+
+
+def pressed(b):
+    return bool(_state.buttons & ~_state.last_buttons & (1 << b))
+
+
+# Main loop
+
+def start():
+    # Find the update() and draw() functions of the game, in the module which called start()
+    game = sys._getframe(1).f_globals
+
+    update = game["update"]
+    draw = game["draw"]
+
+    start_time = time.perf_counter()
+
+    tick = 0
+    while _state.frames is None or tick < _state.frames:
+        _state.last_buttons = _state.buttons
+        _state.buttons = _state.input.poll(tick)
+
+        if _state.fixed_clock_ms is not None:
+            _state.clock_us += _state.fixed_clock_ms * 1000
+
+        update(tick)
+        draw(tick)
+
+        if _state.on_frame is not None:
+            _state.on_frame(tick)
+
+        tick += 1
+        _state.frame = tick
+
+    _state.elapsed = time.perf_counter() - start_time
@@ -0,0 +1,144 @@
+#!/bin/env python3
+# Pack the level data for the PicoSystem MicroPython version of the game into a binary file
+#
+# Run with `./pack-levels.py ../episode-5/picosystem-micropython/assets/levels.py` to create levels.bin in the same folder.
+#
+# The levels are read from the LEVELS list in the given Python file. Each level is a tuple of four lists of tile IDs:
+# platforms, extras (coins, gems and ladders), entity spawns and pipes.
+#
+# levels.bin contains a 6 byte header, followed by every level, one after another:
+#   "LV", format version, number of levels, level width (in tiles), level height (in tiles)
+# Each level is stored as the four lists in the order above, with one byte per tile (so every level is the same size).
+# This means the game can seek straight to the level it needs, without reading the others.
+#
+# With --map N, level N (counting from 0) is instead written to its own "paged map" file, which can be any size up to 65535x65535 tiles
+# (set with --width and --height). The map is split into square chunks, so the game only needs to read the chunks near the player.
+# The file contains a 10 byte header, followed by every chunk, row by row:
+#   "LM", format version, chunk size (as a power of 2), width (in tiles), height (in tiles), number of coins
+# (the last three are 16-bit big-endian numbers). Each chunk contains the four lists of tiles for its part of the map, one after another.
+# Tiles in chunks which go past the edge of the map are stored as empty tiles (0xff).
+
+import argparse
+import pathlib
+import runpy
+
+PACK_MAGIC = b"LV"
+PACK_VERSION = 1
+
+# Number of lists of tiles stored for each level
+LAYER_COUNT = 4
+
+DEFAULT_WIDTH = 15
+DEFAULT_HEIGHT = 15
+
+MAP_MAGIC = b"LM"
+MAP_VERSION = 1
+
+# Chunks are 8x8 tiles by default
+DEFAULT_CHUNK_SHIFT = 3
+
+# The width, height and number of coins of a paged map are stored as 16-bit numbers
+MAX_MAP_NUMBER = 0xffff
+
+# Tile IDs from the game's constants.py
+BLANK_TILE = 0xff
+COIN_TILE = 19
+
+
+def pack_levels(levels, width, height):
+    """Return the bytes of a level pack containing the given levels."""
+    if len(levels) > 255:
+        raise ValueError("too many levels")
+
+    data = bytearray(PACK_MAGIC)
+    data.extend((PACK_VERSION, len(levels), width, height))
+
+    for number, level in enumerate(levels):
+        check_level(level, number, width, height)
+
+        for layer in level:
+            # bytearray() checks that every tile ID fits in a byte
+            data.extend(bytearray(layer))
+
+    return bytes(data)
+
+
+def check_level(level, number, width, height):
+    if len(level) != LAYER_COUNT:
+        raise ValueError(f"level {number + 1} should have {LAYER_COUNT} lists of tiles, not {len(level)}")
+
+    for layer in level:
+        if len(layer) != width * height:
+            raise ValueError(f"level {number + 1} has a list of {len(layer)} tiles, but should have {width * height}")
+
+
+def pack_map(level, width, height, chunk_shift):
+    """Return the bytes of a paged map containing a single level."""
+    chunk_size = 1 << chunk_shift
+
+    chunks_x = (width + chunk_size - 1) // chunk_size
+    chunks_y = (height + chunk_size - 1) // chunk_size
+
+    for name, number in (("width", width), ("height", height)):
+        if not 1 <= number <= MAX_MAP_NUMBER:
+            raise ValueError(f"map {name} must be between 1 and {MAX_MAP_NUMBER} tiles, not {number}")
+
+    coins = sum(1 for tile_id in level[1] if tile_id == COIN_TILE)
+
+    if coins > MAX_MAP_NUMBER:
+        raise ValueError(f"map has {coins} coins, but can have at most {MAX_MAP_NUMBER}")
+
+    data = bytearray(MAP_MAGIC)
+    data.extend((MAP_VERSION, chunk_shift))
+
+    for number in (width, height, coins):
+        data.extend(number.to_bytes(2, "big"))
+
+    for chunk_y in range(chunks_y):
+        for chunk_x in range(chunks_x):
+            for layer in level:
+                for y in range(chunk_y * chunk_size, (chunk_y + 1) * chunk_size):
+                    for x in range(chunk_x * chunk_size, (chunk_x + 1) * chunk_size):
+                        data.append(layer[y * width + x] if x < width and y < height else BLANK_TILE)
+
+    return bytes(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack level data into a binary file for the PicoSystem.")
+    parser.add_argument("source", type=pathlib.Path, help="Python file containing a LEVELS list")
+    parser.add_argument("--output", type=pathlib.Path, help="file to write (default: levels.bin, or level<N>.map with --map, next to the source)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="level width in tiles (default: %(default)s)")
+    parser.add_argument("--height", type=int, default=DEFAULT_HEIGHT, help="level height in tiles (default: %(default)s)")
+    parser.add_argument("--map", type=int, metavar="N", help="write level N (counting from 0) to a paged map instead of packing every level")
+    parser.add_argument("--chunk-shift", type=int, default=DEFAULT_CHUNK_SHIFT, help="chunk size of a paged map, as a power of 2 (default: %(default)s, which is 8x8 tiles)")
+    args = parser.parse_args()
+
+    levels = runpy.run_path(str(args.source))["LEVELS"]
+
+    if args.map is not None:
+        level = levels[args.map]
+        check_level(level, args.map, args.width, args.height)
+
+        output = args.output if args.output is not None else args.source.with_name(f"level{args.map + 1}.map")
+
+        data = pack_map(level, args.width, args.height, args.chunk_shift)
+
+        with open(output, "wb") as f:
+            f.write(data)
+
+        print(f"Packed level {args.map + 1} ({args.width}x{args.height} tiles) into paged map {output} ({len(data)} bytes)")
+        return
+
+    output = args.output if args.output is not None else args.source.with_name("levels.bin")
+
+    data = pack_levels(levels, args.width, args.height)
+
+    with open(output, "wb") as f:
+        f.write(data)
+
+    print(f"Packed {len(levels)} levels ({args.width}x{args.height} tiles) into {output} ({len(data)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
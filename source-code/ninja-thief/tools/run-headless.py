@@ -0,0 +1,76 @@
+#!/bin/env python3
+# Run one of the PicoSystem MicroPython versions of the game on this computer, with no display
+#
+# Run with `./run-headless.py ../episode-5/picosystem-micropython --frames 10000 --fixed-clock 25`
+#
+# This uses the stand-in picosystem module in the host folder, so the game runs as fast as the CPU allows.
+# Button presses can be scripted using --input, with a file containing lines such as "120 RIGHT A" (see host/picosystem.py).
+# A session recorded on the PicoSystem can also be played back, by copying its input.log into the game's folder and setting INPUT_MODE to InputMode.REPLAY.
+
+import argparse
+import os
+import pathlib
+import runpy
+import sys
+
+HOST_PATH = pathlib.Path(__file__).resolve().parent / "host"
+
+parser = argparse.ArgumentParser(description="Run a PicoSystem MicroPython game headlessly.")
+parser.add_argument("game", type=pathlib.Path, help="folder containing the game (and its assets folder)")
+parser.add_argument("--main", default="ninja_thief.py", help="file which calls start() (default: ninja_thief.py)")
+parser.add_argument("--frames", type=int, default=1000, help="number of frames to run for")
+parser.add_argument("--fixed-clock", type=int, metavar="MS", help="advance the clock by exactly MS milliseconds each frame")
+parser.add_argument("--input", type=pathlib.Path, help="file containing scripted button presses")
+parser.add_argument("--check-allocations", action="store_true",
+                    help="turn on the game's CHECK_ALLOCATIONS, and report how many frames' level updates allocated memory "
+                         "(this is only a rough guide on a computer, see host/picosystem.py: the exact check needs a PicoSystem, "
+                         "and tests/test_allocations.py checks the FIXED_POINT update)")
+args = parser.parse_args()
+
+sys.path.insert(0, str(HOST_PATH))
+
+import picosystem
+
+input_source = None
+if args.input is not None:
+    with open(args.input) as f:
+        input_source = picosystem.ScriptedInput.parse(f)
+
+picosystem.configure(args.frames, args.fixed_clock, input_source)
+picosystem.install_clock()
+picosystem.install_builtins()
+
+if args.check_allocations:
+    picosystem.install_gc()
+
+# The game loads its assets using relative paths, and imports its other modules from its own folder
+game_path = args.game.resolve()
+os.chdir(game_path)
+sys.path.insert(0, str(game_path))
+
+if args.check_allocations:
+    # The game reads its settings from constants.py, which is shared by all of its modules once it has been imported
+    import constants
+    constants.CHECK_ALLOCATIONS = True
+
+game = runpy.run_path(str(game_path / args.main), run_name="__main__")
+
+# If the game was playing back recorded input (see INPUT_MODE in its constants.py), report whether the recording ran out
+# (the game closes its controls itself once start() returns, which saves the end of any input it was recording)
+controls = game.get("controls")
+if getattr(controls, "finished", False):
+    print(f"Input log finished after {controls.frames} frames")
+
+frames, elapsed = picosystem.stats()
+
+# If no frames were run (or the game finished straight away), no time will have been measured
+if frames > 0 and elapsed > 0:
+    print(f"Ran {frames} frames in {elapsed:.2f}s ({frames / elapsed:.0f} frames per second)")
+else:
+    print(f"Ran {frames} frames")
+
+# Report how many frames allocated memory
+# This doesn't fail the run, since CPython allocates memory in different places to MicroPython (see mem_alloc() in host/picosystem.py)
+allocation_checker = game.get("allocation_checker")
+if args.check_allocations and allocation_checker is not None:
+    allocation_checker.report()